@@ -4,7 +4,7 @@ from django.utils.translation import gettext_lazy as _
 from import_export.admin import ExportActionMixin
 from nested_admin import nested
 
-from account.models import CustomUser, UserOnboarding
+from account.models import AddressbookOperation, CustomUser, UserOnboarding
 from payment_checkout.models import CheckoutUserSubscription
 from subscription.models import SubscriptionFeedback, UserSubscription
 
@@ -53,3 +53,11 @@ class UserAdmin(ExportActionMixin, DjangoUserAdmin, nested.NestedModelAdmin):
     ordering = ()
     inlines = (UserSubscriptionInline, SubscriptionFeedbackInline, UserOnboardingInline,)
     show_full_result_count = False
+
+
+@admin.register(AddressbookOperation)
+class AddressbookOperationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'email', 'action', 'group_id', 'attempts', 'date_created', 'date_processed')
+    list_filter = ('action', 'date_processed')
+    search_fields = ['email']
+    readonly_fields = ('date_created',)
@@ -7,3 +7,4 @@ class AccountConfig(AppConfig):
 
     def ready(self) -> None:
         import account.schema
+        import account.signals
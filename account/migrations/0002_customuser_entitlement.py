@@ -0,0 +1,36 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:21
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_entitlements(apps, schema_editor):
+    CustomUser = apps.get_model("account", "CustomUser")
+    UserSubscription = apps.get_model("subscription", "UserSubscription")
+    latest = UserSubscription.objects.filter(user=OuterRef("pk")).order_by("-expires")
+    CustomUser.objects.update(
+        entitlement_expires=Subquery(latest.values("expires")[:1]),
+        entitlement_status=Subquery(latest.values("status")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('subscription', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='entitlement_expires',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Latest subscription expiration'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='entitlement_status',
+            field=models.CharField(blank=True, editable=False, null=True, verbose_name='Latest subscription status'),
+        ),
+        migrations.RunPython(backfill_entitlements, migrations.RunPython.noop),
+    ]
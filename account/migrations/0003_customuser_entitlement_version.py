@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_customuser_entitlement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='entitlement_updated',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Entitlement updated'),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='entitlement_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Entitlement version'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0003_customuser_entitlement_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AddressbookSubscriber',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254, unique=True, verbose_name='Email')),
+                ('subscriber_id', models.CharField(max_length=30, verbose_name='Subscriber id')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AddressbookOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('action', models.CharField(choices=[('upsert', 'Create or update and add to group'), ('unassign', 'Remove from group')], max_length=20, verbose_name='Action')),
+                ('group_id', models.CharField(max_length=30, verbose_name='Group id')),
+                ('fields', models.JSONField(blank=True, default=dict, verbose_name='Fields')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Last error')),
+                ('date_created', models.DateTimeField(auto_now_add=True, verbose_name='Datetime created')),
+                ('date_processed', models.DateTimeField(blank=True, null=True, verbose_name='Datetime processed')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('date_processed__isnull', True)), fields=['id'], name='addressbook-operation--pending')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.4 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0004_addressbook'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='addressbookoperation',
+            index=models.Index(condition=models.Q(('date_processed__isnull', True)), fields=['email', 'id'], name='addressbook-op--pending-email'),
+        ),
+    ]
@@ -61,6 +61,9 @@ class UserManager(BaseUserManager):
         return self._create_user(email, password, **extra_fields)
 
 
+ENTITLEMENT_FIELDS = ("entitlement_expires", "entitlement_status", "entitlement_version", "entitlement_updated")
+
+
 class CustomUser(AbstractUser):
     username = None
     email = models.EmailField(_("Email address"), unique=True, validators=[validate_lowercase])
@@ -96,6 +99,12 @@ class CustomUser(AbstractUser):
     ab_test_48 = models.CharField(default=None, verbose_name="AB test 48", null=True, blank=True)
     ab_test_51 = models.CharField(default=None, verbose_name="AB test 51", null=True, blank=True)
 
+    # Entitlement cache: the latest expiring UserSubscription, kept up to date by `subscription.signals`
+    entitlement_expires = models.DateTimeField(_("Latest subscription expiration"), null=True, blank=True, editable=False)
+    entitlement_status = models.CharField(_("Latest subscription status"), null=True, blank=True, editable=False)
+    entitlement_version = models.PositiveIntegerField(_("Entitlement version"), default=0, editable=False)
+    entitlement_updated = models.DateTimeField(_("Entitlement updated"), null=True, blank=True, editable=False, db_index=True)
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
     # paddle_customer = one-to-one with PaddleCustomer
@@ -116,6 +125,16 @@ class CustomUser(AbstractUser):
 
     objects = UserManager()  # type: ignore
 
+    def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
+        """Saves of an existing user without `update_fields` leave out the entitlement fields, which only
+        `subscription.entitlements.refresh_entitlement` writes, so that an instance loaded before a subscription
+        change does not write back its outdated entitlement."""
+        if update_fields is None and not force_insert and not self._state.adding and self.pk is not None:
+            deferred = self.get_deferred_fields()
+            update_fields = [field.attname for field in self._meta.concrete_fields
+                             if not field.primary_key and field.attname not in deferred and field.name not in ENTITLEMENT_FIELDS]
+        super().save(force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields)
+
     def set_register_token(self):
         '''Creates and sets `token` on instance, and saves the instance. Returns the token.'''
         token = secrets.token_urlsafe()
@@ -138,3 +157,39 @@ class UserOnboarding(models.Model):
     first_text = models.BooleanField(_("First text generation?"), default=False)
     first_image = models.BooleanField(_("First image generation?"), default=False)
     first_video = models.BooleanField(_("First video generation?"), default=False)
+
+
+class AddressbookActions(models.TextChoices):
+    UPSERT = 'upsert', 'Create or update and add to group'
+    UNASSIGN = 'unassign', 'Remove from group'
+
+
+class AddressbookOperation(models.Model):
+    """MailerLite addressbook change queued by the funnel and payment flows, sent in batches by `tasks.sync_addressbook`."""
+    email = models.EmailField(_("Email"))
+    action = models.CharField(_("Action"), max_length=20, choices=AddressbookActions.choices)
+    group_id = models.CharField(_("Group id"), max_length=30)
+    fields = models.JSONField(_("Fields"), default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    error = models.TextField(_("Last error"), default="", blank=True)
+    date_created = models.DateTimeField(_("Datetime created"), auto_now_add=True)
+    date_processed = models.DateTimeField(_("Datetime processed"), null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(date_processed__isnull=True), name="addressbook-operation--pending"),
+            models.Index(fields=["email", "id"], condition=models.Q(date_processed__isnull=True),
+                         name="addressbook-op--pending-email"),
+        ]
+
+    def __str__(self):
+        return f"AddressbookOperation[{self.pk}] {self.action} {self.email}"
+
+
+class AddressbookSubscriber(models.Model):
+    """MailerLite subscriber id of an email, so group removals do not have to look it up."""
+    email = models.EmailField(_("Email"), unique=True)
+    subscriber_id = models.CharField(_("Subscriber id"), max_length=30)
+
+    def __str__(self):
+        return f"AddressbookSubscriber[{self.pk}] {self.email}"
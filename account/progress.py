@@ -0,0 +1,94 @@
+"""Progress counts of a user from the academy and AI services, for the streak endpoint.
+
+Both services are fetched concurrently in a shared thread pool and the caller waits at most
+`settings.PROGRESS_COUNTS_DEADLINE` seconds for both. Responses are cached per user and service for
+`settings.PROGRESS_COUNTS_TTL` seconds, and concurrent requests of one user in a worker share one fetch.
+A service that fails or misses the deadline is replaced by its last cached response (kept for
+`settings.PROGRESS_COUNTS_STALE_TTL` seconds), or by empty counts. A fetch that misses the deadline still
+fills the cache when it completes.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import caches
+
+from account.utils import fetch_progress_counts_from_microservices
+
+MAX_WORKERS = 16
+
+
+def get_services() -> dict[str, str]:
+    return {"academy": settings.ACADEMY_SERVICE_URL, "ai": settings.AI_SERVICE_URL}
+
+
+def progress_cache_key(service: str, user_id) -> str:
+    return f"progress-counts:{service}:{user_id}"
+
+
+_executor: ThreadPoolExecutor | None = None
+_inflight: dict[str, Future] = {}
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="progress-counts")
+    return _executor
+
+
+def _fetch(key: str, service: str, url: str, auth_token) -> dict:
+    try:
+        data = fetch_progress_counts_from_microservices(url, auth_token, timeout=settings.PROGRESS_COUNTS_DEADLINE,
+                                                       vendor=service)
+        caches[settings.PROGRESS_COUNTS_CACHE].set(key, {"data": data, "fetched_at": time.time()},
+                                                   timeout=settings.PROGRESS_COUNTS_STALE_TTL)
+        return data
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def _submit(key: str, service: str, url: str, auth_token) -> Future:
+    """Start a fetch, or join the one already running for the same user and service."""
+    executor = get_executor()
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = _inflight[key] = executor.submit(_fetch, key, service, url, auth_token)
+    return future
+
+
+def get_progress_counts(user_id, auth_token) -> dict[str, dict]:
+    """Return {service: counts} of the user. Never raises, a missing service has empty counts."""
+    cache = caches[settings.PROGRESS_COUNTS_CACHE]
+    services = get_services()
+    keys = {service: progress_cache_key(service, user_id) for service in services}
+    cached = cache.get_many(list(keys.values()))
+    result: dict[str, dict] = {}
+    futures: dict[str, Future] = {}
+    for service, url in services.items():
+        entry = cached.get(keys[service])
+        if entry and time.time() - entry["fetched_at"] <= settings.PROGRESS_COUNTS_TTL:
+            result[service] = entry["data"]
+        else:
+            futures[service] = _submit(keys[service], service, url, auth_token)
+
+    wait(futures.values(), timeout=settings.PROGRESS_COUNTS_DEADLINE)
+    for service, future in futures.items():
+        done = future.done()  # read once, the fetch may finish in between
+        exc = future.exception() if done else None
+        if done and exc is None:
+            result[service] = future.result()
+            continue
+        reason = f"failed due to exception {exc}" if done else "missed the deadline"
+        entry = cached.get(keys[service])
+        logging.warning("Progress counts: %s fetch of user %s %s, using %s", service, user_id, reason,
+                        "cached counts" if entry else "empty counts")
+        result[service] = entry["data"] if entry else {}
+    return result
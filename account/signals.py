@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from account.models import CustomUser
+from custom.custom_backend import invalidate_auth_user
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def user_changed(sender, instance: CustomUser, **kwargs):
+    invalidate_auth_user(instance.pk)
@@ -6,8 +6,9 @@ from django.contrib.auth.models import AnonymousUser
 from django.shortcuts import get_object_or_404
 from rest_framework.request import Request
 
-from account.models import GatewayChoices
+from account.models import CustomUser, GatewayChoices
 from custom.custom_exceptions import BadRequest
+from shared.http_client import get_session
 
 
 def select_payment_system(email: str, country_code: str):
@@ -24,6 +25,14 @@ def select_payment_system(email: str, country_code: str):
     return GatewayChoices.CHECKOUT
 
 
+def get_fresh_user(request: Request) -> CustomUser:
+    """The authenticated user, read again from the database if it came from the auth user cache
+    (AUTH_USER_CACHE_TTL), which actions that save the whole user must not write back."""
+    if getattr(request.user, "from_auth_cache", False):
+        return CustomUser.objects.get(pk=request.user.pk)
+    return request.user  # type: ignore
+
+
 def get_user_or_404(request: Request, queryset):
     user = request.user
     if isinstance(user, AnonymousUser):
@@ -31,17 +40,19 @@ def get_user_or_404(request: Request, queryset):
             user = get_object_or_404(queryset, email__iexact=email)
         else:
             raise BadRequest("email is required.")
+    else:
+        user = get_fresh_user(request)
     return user
 
 
-def fetch_progress_counts_from_microservices(url, auth_token, timeout=30):
+def fetch_progress_counts_from_microservices(url, auth_token, timeout=30, vendor="microservices"):
     url = url + "/external/progress/counts/"
     headers = {}
     if auth_token:
         headers["Authorization"] = f"Bearer {auth_token}"
     
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = get_session(vendor).get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
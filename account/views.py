@@ -2,7 +2,6 @@ import json
 import random
 import string
 from typing import Any
-from django.conf import settings
 from django.contrib.auth.hashers import make_password
 from django.db.models import Q
 from django.db.transaction import atomic
@@ -32,14 +31,19 @@ from account.serializers import (UserAddNameSerializer, UserBasicSerializer,
                                  UserVerifyCodeResponseSerializer,
                                  UserVideoCreditSerializer,
                                  )
-from account.utils import get_user_or_404, select_payment_system, fetch_progress_counts_from_microservices
+from account.progress import get_progress_counts
+from account.utils import (get_fresh_user, get_user_or_404,
+                           select_payment_system)
 from custom.custom_exceptions import BadRequest
 from custom.custom_permissions import IsSelf
+from custom.custom_throttles import ActionRateThrottle
+from custom.custom_viewsets import ReplicaReadMixin
 # from interview_prep.models import UserInterviewPrep
 # from jlab.models import Project, ProjectTask
 # from progress_v2.models import CourseProgress, LearningPathProgress
 from shared.emailer import (add_to_addressbook, send_password_code,
                             send_welcome, update_addressbook)
+from subscription.entitlements import add_entitlement_claims
 from subscription.gateway import PaymentGateway
 from user_goal.models import UserDailyGoal
 from web_analytics.event_manager import EventManager
@@ -70,7 +74,7 @@ class UnregisteredUserViewSet(viewsets.GenericViewSet):
             return UserAddNameSerializer
         return None
 
-    @action(methods=['post'], detail=True)
+    @action(methods=['post'], detail=True, throttle_classes=[ActionRateThrottle])
     def register(self, request, *args, **kwargs):
         """
             Set password for a new user, send events and welcome email.
@@ -81,7 +85,6 @@ class UnregisteredUserViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
 
-        # TODO (DEV-109): add request rate limiting to this endpoint
         device_id = serializer.validated_data.get("device_id", None)
         if device_id is not None:
             if device_id != user.device_id:
@@ -94,6 +97,7 @@ class UnregisteredUserViewSet(viewsets.GenericViewSet):
         user = serializer.save(password=password, token_set_time=None, payment_email=email)
         data = serializer.data
         refresh = RefreshToken.for_user(user)
+        add_entitlement_claims(refresh, user)
         data['refresh'] = str(refresh)
         data['access'] = str(refresh.access_token)  # type: ignore
 
@@ -187,12 +191,13 @@ class UnregisteredUserViewSet(viewsets.GenericViewSet):
     
 
 
-class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.DestroyModelMixin):
+class UserViewSet(ReplicaReadMixin, viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.DestroyModelMixin):
     """
         Viewset for different operations on registered users.
     """
     queryset = CustomUser.objects.exclude(password='')
     permission_classes = [IsSelf]
+    replica_actions = ('profile', 'streak')
 
     def get_serializer_class(self):
         if self.action == 'set_password':
@@ -235,7 +240,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
             Update password for a logged-in user if submitted old password is correct.
             Returns user email.
         """
-        user = request.user
+        user = get_fresh_user(request)
         ser = self.get_serializer(user, data=request.data)
         ser.is_valid(raise_exception=True)
         password = ser.validated_data['password']
@@ -244,13 +249,12 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
         return Response(ser.data)
 
     @extend_schema(responses={204: None})
-    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny], throttle_classes=[ActionRateThrottle])
     def set_password(self, request: Request):
         """
             Update user password if submitted PR code is correct.
             `email` is a required field only for unathenticated users.
         """
-        # TODO (DEV-109): add request rate limiting to this endpoint
         user = get_user_or_404(request, self.get_queryset())
         request.data.pop("email", None)  # type: ignore
         ser = self.get_serializer(user, data=request.data)
@@ -261,13 +265,12 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(responses={204: None})
-    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny], throttle_classes=[ActionRateThrottle])
     def reset_password(self, request: Request):
         """
             Generates and sets password reset code. Sends an email with the code.
             `email` is a required field only for unathenticated users.
         """
-        # TODO (DEV-109): add request rate limiting to this endpoint
         ser = self.get_serializer(data=request.data)
         ser.is_valid(raise_exception=True)
         user = get_user_or_404(request, self.get_queryset())
@@ -280,14 +283,13 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(responses={200: UserVerifyCodeResponseSerializer})
-    @action(detail=False, methods=['post'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['post'], permission_classes=[AllowAny], throttle_classes=[ActionRateThrottle])
     def verify_code(self, request: Request, pk=None):
         """
             Verify that the password reset (PR) code is equal to the user's PR code.
             Returns 400 if user does not have any code.
             `email` is a required field only for unathenticated users.
         """
-        # TODO (DEV-109): add request rate limiting to this endpoint
         user = get_user_or_404(request, self.get_queryset())
         ser = self.get_serializer(data=request.data)
         ser.is_valid(raise_exception=True)
@@ -319,8 +321,9 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
             if date.date() in dates:
                 streak[day] = True
         
-        academy_progress_data = fetch_progress_counts_from_microservices(settings.ACADEMY_SERVICE_URL, auth_token=request.auth)
-        ai_progress_data = fetch_progress_counts_from_microservices(settings.AI_SERVICE_URL, auth_token=request.auth)
+        progress_data = get_progress_counts(user.pk, auth_token=request.auth)
+        academy_progress_data = progress_data["academy"]
+        ai_progress_data = progress_data["ai"]
         response_data = {
             "courses_completed": academy_progress_data.get("elements", 0),
             "learning_paths": academy_progress_data.get("modules", 0),
@@ -353,7 +356,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
         if user.video_credit_due <= timezone.now():
             user.video_credit_due = timezone.now() + timezone.timedelta(days=30)
             user.video_credit = 10
-            user.save()
+            user.save(update_fields=["video_credit_due", "video_credit"])
         ser = self.get_serializer(user)
         return Response(ser.data)
     
@@ -368,7 +371,7 @@ class UserViewSet(viewsets.GenericViewSet, mixins.UpdateModelMixin, mixins.Destr
             video_credit = request.data.get('video_credit', None)
             if video_credit is not None:
                 user.video_credit = video_credit
-                user.save()
+                user.save(update_fields=["video_credit"])
                 return Response({'message': 'Video credit updated successfully.'}, status=status.HTTP_200_OK)
             return Response({'error': 'No video credit provided.'}, status=status.HTTP_400_BAD_REQUEST)
 
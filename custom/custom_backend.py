@@ -6,6 +6,8 @@ import logging
 
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db import router
 from rest_framework.authentication import (BaseAuthentication,
                                            BasicAuthentication)
 from rest_framework.request import Request
@@ -18,22 +20,42 @@ from rest_framework_simplejwt.authentication import (AuthenticationFailed,
 from account.models import CustomUser
 
 
+# Fields loaded on demand instead of with every authenticated request
+AUTH_USER_DEFERRED_FIELDS = ("password", "funnel_info")
+AUTH_USER_FIELDS = tuple(f.attname for f in CustomUser._meta.concrete_fields if f.attname not in AUTH_USER_DEFERRED_FIELDS)
+# Changes with the cached fields, so entries written by an older deploy are not read
+AUTH_USER_CACHE_VERSION = hashlib.md5(",".join(AUTH_USER_FIELDS).encode()).hexdigest()[:8]
+
+
+def auth_user_cache_key(user_id) -> str:
+    return f"auth-user:{AUTH_USER_CACHE_VERSION}:{user_id}"
+
+
+def invalidate_auth_user(user_id):
+    """Drop the cached user, called on user save and on queryset updates of users."""
+    if settings.AUTH_USER_CACHE_TTL:
+        caches[settings.AUTH_USER_CACHE].delete(auth_user_cache_key(user_id))
+
+
 class PrefetchedJWTAuthentication(JWTAuthentication):
     def get_user(self, validated_token: Token) -> AuthUser:
         """
-        Copied method from JWTAuthentication adjusted to prefech user subscriptions
+        Copied method from JWTAuthentication adjusted to read the user from a short-lived cache
+        (`settings.AUTH_USER_CACHE_TTL`). Only `AUTH_USER_FIELDS` are loaded, deferred fields are fetched on access.
         """
         try:
             user_id = validated_token[api_settings.USER_ID_CLAIM]  # type: ignore
         except KeyError:
             raise InvalidToken(_("Token contained no recognizable user identification"))
 
-        try:
-            # ! This is the line that was adjusted with prefetch_related and filter
-            user = self.user_model.objects.prefetch_related("subscriptions")\
-                .get(**{api_settings.USER_ID_FIELD: user_id})  # type: ignore
-        except self.user_model.DoesNotExist:
-            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user, revoke_hash = self.get_cached_user(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.defer("funnel_info").get(**{api_settings.USER_ID_FIELD: user_id})  # type: ignore
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            revoke_hash = get_md5_hash_password(user.password) if api_settings.CHECK_REVOKE_TOKEN else None
+            self.cache_user(user_id, user, revoke_hash)
 
         if not user.is_active:
             raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
@@ -41,13 +63,29 @@ class PrefetchedJWTAuthentication(JWTAuthentication):
         if api_settings.CHECK_REVOKE_TOKEN:
             if validated_token.get(
                 api_settings.REVOKE_TOKEN_CLAIM  # type: ignore
-            ) != get_md5_hash_password(user.password):
+            ) != revoke_hash:
                 raise AuthenticationFailed(
                     _("The user's password has been changed."), code="password_changed"
                 )
 
         return user
 
+    def get_cached_user(self, user_id) -> tuple[CustomUser | None, str | None]:
+        if not settings.AUTH_USER_CACHE_TTL:
+            return None, None
+        cached = caches[settings.AUTH_USER_CACHE].get(auth_user_cache_key(user_id))
+        if cached is None:
+            return None, None
+        values, revoke_hash = cached
+        user = self.user_model.from_db(router.db_for_read(self.user_model), AUTH_USER_FIELDS, values)
+        user.from_auth_cache = True  # see account.utils.get_fresh_user
+        return user, revoke_hash
+
+    def cache_user(self, user_id, user: CustomUser, revoke_hash: str | None):
+        if settings.AUTH_USER_CACHE_TTL:
+            values = [getattr(user, field) for field in AUTH_USER_FIELDS]
+            caches[settings.AUTH_USER_CACHE].set(auth_user_cache_key(user_id), (values, revoke_hash), settings.AUTH_USER_CACHE_TTL)
+
 
 class PaddleHeaderAuthentication(BasicAuthentication):
     def authenticate(self, request: Request):
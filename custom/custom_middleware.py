@@ -1,5 +1,18 @@
 # from django.conf import settings
 # from growthbook import GrowthBook
+from custom.db_router import mark_sticky, set_replica_reads
+
+
+def replica_stickiness_middleware(get_response):
+    """Marks clients that wrote for primary reads (see custom.db_router) and ends replica reads with the request."""
+    def middleware(request):
+        try:
+            response = get_response(request)
+        finally:
+            set_replica_reads(False)
+        mark_sticky(request, response)
+        return response
+    return middleware
 
 
 # def growthbook_middleware(get_response):
@@ -1,10 +1,14 @@
+import hmac
 from typing import TYPE_CHECKING
 
+from django.conf import settings
+
 from django.contrib.auth.models import AnonymousUser
-from django.utils import timezone
 from rest_framework import permissions
 from rest_framework.request import Request
 
+from subscription.entitlements import has_unexpired_subscription
+
 if TYPE_CHECKING:
     from custom.custom_viewsets import CustomGenericViewSet
 
@@ -17,8 +21,7 @@ class HasUnexpiredSubscription(permissions.BasePermission):
         user = request.user
         if not user or isinstance(user, AnonymousUser):
             return False
-        subs = user.subscriptions   # User subscriptions are prefetched in the custom authentication backend
-        return bool(subs.filter(expires__gte=timezone.now()).exists())
+        return has_unexpired_subscription(user)  # entitlement is cached on the user row, no query
         # if not view.subscription_classes:
         #     return True
         # allowed_types = [c.subscription_type for c in view.subscription_classes]
@@ -33,3 +36,12 @@ class IsSelf(permissions.IsAuthenticated):
 
     def has_object_permission(self, request, view, obj):
         return request.user == obj
+
+
+class HasInternalSecret(permissions.BasePermission):
+    """Permission is given to other JobEscape services sending `settings.INTERNAL_API_SECRET` in the `X-Internal-Secret` header."""
+    message = 'Invalid internal secret.'
+
+    def has_permission(self, request: Request, view):
+        secret = request.headers.get("X-Internal-Secret", "")
+        return bool(settings.INTERNAL_API_SECRET) and hmac.compare_digest(secret.encode(), settings.INTERNAL_API_SECRET.encode())
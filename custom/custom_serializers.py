@@ -2,7 +2,13 @@ from typing import Any, Dict
 
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.models import CustomUser
+from subscription.entitlements import add_entitlement_claims
 from subscription.models import (
     UserSubscription,
 )
@@ -28,7 +34,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 })
         else:
             token['subscriptions'] = []
-            
+        add_entitlement_claims(token, user)
         return token
 
     def validate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
@@ -39,3 +45,16 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['user_device_id'] = self.user.device_id
         data['device_id'] = attrs.get("device_id", None)
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refreshed access tokens get the current entitlement claims instead of the ones copied from the refresh token."""
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
+        data = super().validate(attrs)
+        access = AccessToken(data['access'])
+        user = CustomUser.objects.filter(**{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}).first()
+        if user is not None:
+            add_entitlement_claims(access, user)
+            data['access'] = str(access)
+        return data
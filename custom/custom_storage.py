@@ -15,4 +15,19 @@ class MediaStorage(S3Boto3Storage):
 
     def __init__(self, *args, **kwargs):
         kwargs['custom_domain'] = settings.AWS_CLOUDFRONT_DOMAIN
-        super(MediaStorage, self).__init__(*args, **kwargs)
\ No newline at end of file
+        super(MediaStorage, self).__init__(*args, **kwargs)
+
+class ArchiveStorage(S3Boto3Storage):
+    """uploads to 'mybucket/archive/', private (not served through cloudfront)"""
+    location = settings.ARCHIVEFILES_LOCATION
+    default_acl = 'private'
+
+class BlogSnapshotStorage(S3Boto3Storage):
+    """uploads to 'mybucket/blog/', serves from 'cloudfront.net/blog/' (see seo_blog.snapshots)"""
+    location = settings.BLOGFILES_LOCATION
+    file_overwrite = True
+
+    def __init__(self, *args, **kwargs):
+        kwargs['custom_domain'] = settings.AWS_CLOUDFRONT_DOMAIN
+        kwargs['object_parameters'] = {'CacheControl': f'public, max-age={settings.BLOG_SNAPSHOTS_MAX_AGE}'}
+        super(BlogSnapshotStorage, self).__init__(*args, **kwargs)
@@ -0,0 +1,32 @@
+from rest_framework.request import Request
+from rest_framework.throttling import BaseThrottle
+
+from shared.rate_limit import check_rate_limit
+
+
+class ActionRateThrottle(BaseThrottle):
+    """Applies the `settings.RATE_LIMITS` of the view action, keyed by client IP (see `NUM_PROXIES` of `REST_FRAMEWORK`), email and user.
+    The email is the one of the authenticated user or the `email` field of the request body. The user is the
+    authenticated user or, on detail routes of unregistered users, the looked up user id."""
+
+    def __init__(self) -> None:
+        self.wait_seconds: float | None = None
+
+    def get_keys(self, request: Request, view) -> dict[str, str | None]:
+        keys = {"ip": self.get_ident(request)}
+        user = request.user
+        if user and user.is_authenticated:
+            keys["user"] = str(user.pk)
+            keys["email"] = user.email
+        else:
+            keys["user"] = view.kwargs.get(view.lookup_url_kwarg or view.lookup_field)
+            email = request.data.get("email") if hasattr(request.data, "get") else None
+            keys["email"] = email if isinstance(email, str) else None
+        return keys
+
+    def allow_request(self, request: Request, view) -> bool:
+        self.wait_seconds = check_rate_limit(view.action, self.get_keys(request, view))
+        return self.wait_seconds is None
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
@@ -1,7 +1,14 @@
+import hashlib
+import json
 from typing import List
 
+from django.conf import settings
+from django.utils.cache import (parse_etags, patch_cache_control,
+                                patch_vary_headers)
 from drf_spectacular.utils import extend_schema, inline_serializer
-from rest_framework import mixins, serializers
+from rest_framework import mixins, serializers, status
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
@@ -9,6 +16,9 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from account.models import CustomUser
+from custom.custom_backend import invalidate_auth_user
+from custom.db_router import is_sticky, set_replica_reads
+from shared.cache import TieredCache
 from subscription.models import SubscriptionType
 from web_analytics.event_manager import EventManager
 # from web_analytics.tasks import bindDeviceToUser
@@ -29,6 +39,62 @@ class CustomGenericViewSet(GenericViewSet):
         # return [p() for p in [IsAuthenticated, HasUnexpiredSubscription]]
 
 
+class ReplicaReadMixin:
+    """Safe requests of `replica_actions` (all actions if `None`) read from the read replica once authenticated and permitted,
+    unless the client wrote recently. See custom.db_router."""
+    replica_actions: tuple[str, ...] | None = None
+
+    def initial(self, request: Request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        set_replica_reads(
+            request.method in SAFE_METHODS
+            and (self.replica_actions is None or self.action in self.replica_actions)
+            and not is_sticky(request)
+        )
+
+    def finalize_response(self, request: Request, response, *args, **kwargs):
+        set_replica_reads(False)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    """List and retrieve responses are served from `response_cache` (invalidated by the signals of its models) and
+    carry a strong ETag of their content. A request whose `If-None-Match` matches gets a 304 without a body.
+    Misses are loaded from the primary database, also in `ReplicaReadMixin` viewsets."""
+    response_cache: TieredCache
+
+    def list(self, request: Request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request: Request, **kwargs) -> str:
+        # Image urls are built from the request host, the rendered body depends on the negotiated format
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field, "")
+        return f"{self.action}:{lookup}:{request.accepted_renderer.format}:{request.build_absolute_uri('/')}"
+
+    def get_cached_response(self, handler, request: Request, *args, **kwargs) -> Response:
+        def load():
+            # Cached content is read from the primary: the namespace is invalidated when the primary commits, and a
+            # lagging replica would cache the content from before the edit under the new version
+            set_replica_reads(False)
+            content = json.dumps(handler(request, *args, **kwargs).data, cls=JSONEncoder)
+            etag = hashlib.md5(f"{request.accepted_renderer.format}:{content}".encode()).hexdigest()
+            return json.loads(content), f'"{etag}"'
+
+        data, etag = self.response_cache.get(self.get_response_cache_key(request, **kwargs), load)
+        if_none_match = [tag.removeprefix("W/") for tag in parse_etags(request.headers.get("If-None-Match", ""))]
+        if etag in if_none_match or "*" in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.CONTENT_CACHE_MAX_AGE, must_revalidate=True)
+        patch_vary_headers(response, ["Accept"])
+        return response
+
+
 class CustomReadOnlyModelViewSet(mixins.RetrieveModelMixin,
                                  mixins.ListModelMixin,
                                  CustomGenericViewSet):
@@ -62,5 +128,6 @@ class CustomTokenObtainPairView(TokenObtainPairView):
                 create_bind_device_task(device_id, data['id'])
                 
                 CustomUser.objects.filter(id=data['id']).update(device_id=device_id)
+                invalidate_auth_user(data['id'])
         EventManager().sendEvent("pr_webapp_user_signined", data['id'], topic="app")
         return Response(serializer.validated_data)
@@ -0,0 +1,231 @@
+"""PostgreSQL backend with an in-process connection pool (ENGINE "custom.db_pool").
+
+Django opens a connection per request and closes it when the request finishes. This backend takes the connection
+from a pool of the worker process instead and returns it on close, so a request does not pay the connection setup
+(TCP, TLS and authentication) to the database. The pool is configured by the "POOL" key of the database settings:
+
+- MAX_SIZE: open connections of the process, a checkout waits for a returned connection above it
+- TIMEOUT: seconds a checkout waits before failing with `OperationalError`
+- MAX_IDLE: seconds an unused connection is kept open
+- MAX_LIFETIME: seconds after which a returned connection is closed instead of reused
+- HEALTH_CHECK_AFTER: seconds of idling after which a connection is checked with `SELECT 1` before reuse
+
+Returned connections are rolled back if a transaction is still open and set back to autocommit. Broken connections
+and connections closed inside an atomic block are discarded.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+import psycopg2
+from django.db.backends.postgresql.base import \
+    DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+DEFAULT_POOL = {"MAX_SIZE": 8, "TIMEOUT": 10, "MAX_IDLE": 300, "MAX_LIFETIME": 3600, "HEALTH_CHECK_AFTER": 30}
+WAIT_SAMPLES = 1000  # latest checkout wait times kept per pool for percentiles
+LOG_INTERVAL = 60  # min seconds between stats log lines of a pool
+
+
+class PoolStats:
+    """In-process counters of a pool, updated under the pool lock."""
+    __slots__ = ("checkouts", "created", "discarded", "waits", "timeouts", "wait_seconds", "wait_times", "logged_at")
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.created = 0
+        self.discarded = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.wait_times: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self.logged_at = time.monotonic()
+
+    def percentile(self, p: float) -> float | None:
+        if not self.wait_times:
+            return None
+        ordered = sorted(self.wait_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections. Idle connections are reused most recently returned first,
+    so the ones left idle longest are reaped by `MAX_IDLE`."""
+
+    def __init__(self, alias: str, options: dict) -> None:
+        self.alias = alias
+        self.max_size = options["MAX_SIZE"]
+        self.timeout = options["TIMEOUT"]
+        self.max_idle = options["MAX_IDLE"]
+        self.max_lifetime = options["MAX_LIFETIME"]
+        self.health_check_after = options["HEALTH_CHECK_AFTER"]
+        self.pid = os.getpid()
+        self.size = 0  # open connections, idle and checked out
+        self.stats = PoolStats()
+        self._idle: deque[tuple] = deque()  # (connection, returned at)
+        self._created_at: dict[int, float] = {}
+        self._cond = threading.Condition()
+
+    def acquire(self, connect: Callable):
+        """Return an idle connection, or a new one from `connect()` while the pool is below `MAX_SIZE`."""
+        start = time.monotonic()
+        waited = False
+        while True:
+            stale = []
+            connection = None
+            with self._cond:
+                while True:
+                    stale += self._reap(time.monotonic())
+                    if self._idle:
+                        connection, returned_at = self._idle.pop()
+                        break
+                    if self.size < self.max_size:
+                        self.size += 1
+                        break
+                    remaining = self.timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        self.stats.timeouts += 1
+                        self._close_all(stale)
+                        raise psycopg2.OperationalError(
+                            f"Connection pool of database '{self.alias}' exhausted: {self.max_size} connections in use for {self.timeout}s"
+                        )
+                    self.stats.waits += not waited
+                    waited = True
+                    self._cond.wait(remaining)
+            self._close_all(stale)
+
+            if connection is None:
+                try:
+                    connection = connect()
+                except Exception:
+                    self._discard(None)
+                    raise
+                with self._cond:
+                    self._created_at[id(connection)] = time.monotonic()
+                    self.stats.created += 1
+            elif time.monotonic() - returned_at >= self.health_check_after and not self._is_usable(connection):
+                self._discard(connection)
+                continue
+            self._checked_out(time.monotonic() - start)
+            return connection
+
+    def release(self, connection, discard: bool = False):
+        """Return a connection closed by Django. Broken or expired connections, and `discard`, close it instead."""
+        now = time.monotonic()
+        if discard or connection.closed or now - self._created_at.get(id(connection), now) > self.max_lifetime:
+            self._discard(connection)
+            return
+        try:
+            if connection.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            connection.autocommit = True
+        except psycopg2.Error:
+            self._discard(connection)
+            return
+        with self._cond:
+            self._idle.append((connection, now))
+            self._cond.notify()
+
+    def _reap(self, now: float) -> list:
+        """Pop the connections idle longer than `MAX_IDLE`, called under the lock."""
+        stale = []
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            connection, _ = self._idle.popleft()
+            stale.append(connection)
+            self._created_at.pop(id(connection), None)
+            self.size -= 1
+            self.stats.discarded += 1
+        return stale
+
+    @staticmethod
+    def _close_all(connections: list):
+        for connection in connections:
+            try:
+                connection.close()
+            except psycopg2.Error:
+                pass
+
+    def _discard(self, connection):
+        if connection is not None:
+            self._close_all([connection])
+        with self._cond:
+            if connection is not None:
+                self._created_at.pop(id(connection), None)
+                self.stats.discarded += 1
+            self.size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _is_usable(connection) -> bool:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checked_out(self, wait: float):
+        with self._cond:
+            stats = self.stats
+            stats.checkouts += 1
+            stats.wait_seconds += wait
+            stats.wait_times.append(wait)
+            now = time.monotonic()
+            if now - stats.logged_at >= LOG_INTERVAL:
+                stats.logged_at = now
+                logging.info("DB pool: alias=%s checkouts=%d created=%d discarded=%d size=%d idle=%d waits=%d timeouts=%d "
+                             "wait_p50=%.2fms wait_p99=%.2fms", self.alias, stats.checkouts, stats.created, stats.discarded,
+                             self.size, len(self._idle), stats.waits, stats.timeouts,
+                             stats.percentile(0.5) * 1000, stats.percentile(0.99) * 1000)
+
+
+_pools: dict[str, ConnectionPool] = {}
+_lock = threading.Lock()
+
+
+def get_pool(alias: str, settings_dict: dict) -> ConnectionPool:
+    """Return the pool of the database alias in this process. A forked process starts with new pools,
+    the inherited connections belong to the parent."""
+    pool = _pools.get(alias)
+    if pool is None or pool.pid != os.getpid():
+        with _lock:
+            pool = _pools.get(alias)
+            if pool is None or pool.pid != os.getpid():
+                pool = _pools[alias] = ConnectionPool(alias, {**DEFAULT_POOL, **settings_dict.get("POOL", {})})
+    return pool
+
+
+def pool_stats() -> list[dict]:
+    """Checkout, connection and wait time counters per database alias since the process started."""
+    return [
+        {
+            "alias": alias,
+            "size": pool.size,
+            "idle": len(pool._idle),
+            "checkouts": pool.stats.checkouts,
+            "created": pool.stats.created,
+            "discarded": pool.stats.discarded,
+            "waits": pool.stats.waits,
+            "timeouts": pool.stats.timeouts,
+            "wait_avg_ms": pool.stats.wait_seconds / pool.stats.checkouts * 1000 if pool.stats.checkouts else None,
+            "wait_p99_ms": pool.stats.percentile(0.99) * 1000 if pool.stats.wait_times else None,
+        }
+        for alias, pool in list(_pools.items())
+    ]
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = get_pool(self.alias, self.settings_dict).acquire(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        # Set by the parent on new connections only
+        self.isolation_level = IsolationLevel(self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED))
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                get_pool(self.alias, self.settings_dict).release(self.connection, discard=self.in_atomic_block)
@@ -0,0 +1,69 @@
+"""Routing of safe reads to the read replica (database alias "replica", see DATABASE_REPLICA_HOST).
+
+Only views with `ReplicaReadMixin` read from the replica, during GET/HEAD/OPTIONS requests of their replica actions.
+Everything else (writes, transactions, payment flows, the charge engine, tasks and commands) uses the primary. A client
+that wrote in the last `settings.REPLICA_STICKY_SECONDS` seconds reads from the primary too, so it sees its own writes
+despite replication lag. Every successful unsafe request sets the `read_primary_until` cookie and the
+`X-Read-Primary-Until` response header. Clients that do not send cookies can echo the header back.
+"""
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = "replica"
+STICKY_COOKIE = "read_primary_until"
+STICKY_HEADER = "X-Read-Primary-Until"
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+def replica_enabled() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def is_sticky(request: HttpRequest) -> bool:
+    """`True` if the client wrote recently and must read from the primary."""
+    for value in (request.COOKIES.get(STICKY_COOKIE), request.headers.get(STICKY_HEADER)):
+        try:
+            if value and float(value) > time.time():
+                return True
+        except ValueError:
+            pass
+    return False
+
+
+def set_replica_reads(enabled: bool):
+    _replica_reads.set(enabled and replica_enabled())
+
+
+class ReplicaRouter:
+    """Reads go to the replica while a replica view allowed it, and the request has not written or opened a transaction."""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _replica_reads.set(False)  # read the rest of the request from the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def mark_sticky(request: HttpRequest, response):
+    """Send the client to the primary for `settings.REPLICA_STICKY_SECONDS` after a successful unsafe request."""
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    until = str(int(time.time() + settings.REPLICA_STICKY_SECONDS) + 1)
+    response.set_cookie(STICKY_COOKIE, until, max_age=settings.REPLICA_STICKY_SECONDS + 1, secure=request.is_secure(),
+                        httponly=True, samesite="Lax")
+    response[STICKY_HEADER] = until
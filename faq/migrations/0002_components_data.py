@@ -0,0 +1,55 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:52
+
+from django.db import migrations, models
+
+# Component model -> fields of its serializer in faq.serializers after `id` and `order`
+COMPONENT_FIELDS = {
+    'ImageComponent': ['image'],
+    'VideoComponent': ['video'],
+    'TextComponent': ['content'],
+}
+FILE_FIELDS = {'image', 'video'}
+
+
+def fill_components_data(apps, schema_editor):
+    """Serialize the components of every question into `Question.components_data`, as faq.signals.refresh_components does,
+    from the base table, its polymorphic content type and the child tables."""
+    Question = apps.get_model('faq', 'Question')
+    AnswerComponent = apps.get_model('faq', 'AnswerComponent')
+    children = {}
+    for model_name, fields in COMPONENT_FIELDS.items():
+        model = apps.get_model('faq', model_name)
+        children[model_name.lower()] = (model, fields, {row['pk']: row for row in model.objects.values('pk', *fields)})
+
+    components = {}
+    rows = AnswerComponent.objects.order_by('order', 'pk').values('pk', 'question_id', 'order', 'polymorphic_ctype__model')
+    for row in rows:
+        if row['polymorphic_ctype__model'] not in children:
+            continue
+        model, fields, values = children[row['polymorphic_ctype__model']]
+        data = {'id': row['pk'], 'order': row['order']}
+        for field in fields:
+            value = values[row['pk']][field]
+            if field in FILE_FIELDS:
+                value = model._meta.get_field(field).storage.url(value) if value else None
+            data[field] = value
+        data['component_type'] = model._meta.object_name
+        components.setdefault(row['question_id'], []).append(data)
+    for pk, data in components.items():
+        Question.objects.filter(pk=pk).update(components_data=data)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faq', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='components_data',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Serialized components'),
+        ),
+        migrations.RunPython(fill_components_data, migrations.RunPython.noop),
+    ]
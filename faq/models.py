@@ -9,6 +9,8 @@ from tinymce import models as t_models
 class Question(models.Model):
     question = models.CharField(verbose_name="Question", max_length=100, null=True, blank=True)
     order = models.PositiveIntegerField(default=1, verbose_name="Order of the question", validators=[MinValueValidator(1)])
+    # Serialized components in order, kept in sync by faq.signals so reads do not query the polymorphic tables
+    components_data = models.JSONField(verbose_name="Serialized components", default=list, blank=True, editable=False)
 
     class Meta:
         ordering = ["order"]
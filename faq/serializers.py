@@ -1,4 +1,5 @@
 
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_polymorphic.serializers import PolymorphicSerializer
 
@@ -33,8 +34,13 @@ class AnswerComponentSerializer(PolymorphicSerializer):
     }
 
 
+@extend_schema_field(AnswerComponentSerializer(many=True))
+class AnswerComponentsField(serializers.JSONField):
+    """Components as serialized into `Question.components_data`."""
+
+
 class QuestionSerializer(serializers.ModelSerializer):
-    components = AnswerComponentSerializer(many=True, read_only=True)
+    components = AnswerComponentsField(source='components_data', read_only=True)
 
     class Meta:
         model = Question
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from faq.models import (AnswerComponent, ImageComponent, Question,
+                        TextComponent, VideoComponent)
+from faq.serializers import AnswerComponentSerializer
+
+
+def refresh_components(question_id):
+    """Serialize the components of the question into `Question.components_data`."""
+    components = AnswerComponent.objects.filter(question_id=question_id)
+    Question.objects.filter(pk=question_id).update(components_data=AnswerComponentSerializer(components, many=True).data)
+
+
+# Signals of the polymorphic components are sent with the concrete class as sender
+@receiver(pre_save, sender=AnswerComponent)
+@receiver(pre_save, sender=ImageComponent)
+@receiver(pre_save, sender=VideoComponent)
+@receiver(pre_save, sender=TextComponent)
+def answer_component_saving(sender, instance: AnswerComponent, **kwargs):
+    # A component moved to another question must also be removed from the previous one
+    instance.previous_question_id = None
+    if instance.pk:
+        instance.previous_question_id = AnswerComponent._base_manager.filter(pk=instance.pk).values_list("question_id", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=AnswerComponent)
+@receiver([post_save, post_delete], sender=ImageComponent)
+@receiver([post_save, post_delete], sender=VideoComponent)
+@receiver([post_save, post_delete], sender=TextComponent)
+def answer_component_changed(sender, instance: AnswerComponent, **kwargs):
+    refresh_components(instance.question_id)
+    previous_question_id = getattr(instance, "previous_question_id", None)
+    if previous_question_id not in (None, instance.question_id):
+        refresh_components(previous_question_id)
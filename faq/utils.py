@@ -2,6 +2,9 @@ from django.conf import settings
 import requests
 import requests.auth
 import logging
+
+from shared.http_client import get_session
+
 logger = logging.getLogger(__name__)
 
 def createTicket(data: dict):
@@ -14,7 +17,7 @@ def createTicket(data: dict):
             "status": 2,
             "priority":2}
     try:
-        requests.post(url=url,
+        get_session("freshdesk").post(url=url,
                         auth=(requests.auth.HTTPBasicAuth(settings.FRESHDESK_API_KEY, "password")),
                         headers={"Content-Type" : "application/json"},
                         json=data,
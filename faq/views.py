@@ -1,17 +1,24 @@
+from django.conf import settings
 from rest_framework import mixins, viewsets
 
+from custom.custom_viewsets import CachedResponseMixin, ReplicaReadMixin
+from shared.cache import TieredCache
+
 from .models import Question
 from .serializers import ContactFormSerializer, QuestionSerializer
 from .utils import createTicket
 
+faq_cache = TieredCache("faq", ttl=settings.CONTENT_CACHE_TTL, models=["faq.Question", "faq.AnswerComponent"])
+
 
-class FaqViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
+class FaqViewSet(CachedResponseMixin, ReplicaReadMixin, viewsets.GenericViewSet, mixins.ListModelMixin):
     """The viewset for displaying FAQ info through Questions."""
     serializer_class = QuestionSerializer
     pagination_class = None
+    response_cache = faq_cache
 
     def get_queryset(self):
-        return Question.objects.prefetch_related('components').all()
+        return Question.objects.all()
 
 
 class ContactFormViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin):
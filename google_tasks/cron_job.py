@@ -2,6 +2,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from tasks.charge_users import run_charge_users
+from tasks.sync_addressbook import run_sync_addressbook
 import logging
 
 @api_view(['POST'])
@@ -19,4 +20,18 @@ def charge_users_scheduler_view(request):
         return Response({'message': 'Charge users process completed successfully.', 'details': response}, status=200)
     except Exception as e:
         logging.error(f"Error running `run_charge_users`: {str(e)}")
-        return Response({'error': 'Failed to charge users.', 'details': str(e)}, status=500)
\ No newline at end of file
+        return Response({'error': 'Failed to charge users.', 'details': str(e)}, status=500)
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def sync_addressbook_scheduler_view(request):
+    """
+    Trigger `run_sync_addressbook` via Google Cloud Scheduler.
+    """
+    try:
+        response = run_sync_addressbook()
+        logging.debug("Google Cloud Scheduler triggered `run_sync_addressbook` successfully.")
+        return Response({'message': 'Addressbook sync completed successfully.', 'details': response}, status=200)
+    except Exception as e:
+        logging.error(f"Error running `run_sync_addressbook`: {str(e)}")
+        return Response({'error': 'Failed to sync addressbook.', 'details': str(e)}, status=500)
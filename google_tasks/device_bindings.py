@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class DeviceBindingCache:
+    """Bounded in-process LRU of the last user bound to each recently bound device.
+
+    Binding a device to the user it was last bound to less than `window` seconds ago is a repeat binding and is
+    suppressed. A binding to another user is always sent, so the last binding sent downstream is the latest one.
+    """
+
+    def __init__(self, max_size: int, window: float) -> None:
+        self.max_size = max_size
+        self.window = window
+        self.bound_count = 0
+        self.suppressed_count = 0
+        self._devices: OrderedDict[str, tuple[str, float]] = OrderedDict()  # device_id -> (user_id, bound at)
+        self._lock = threading.Lock()
+
+    def should_bind(self, device_id: str, user_id: str | int) -> bool:
+        """Return `False` for a repeat binding, otherwise remember the user of the device and return `True`."""
+        user_id = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            last = self._devices.get(device_id)
+            if last is not None and last[0] == user_id and now - last[1] < self.window:
+                self._devices.move_to_end(device_id)
+                self.suppressed_count += 1
+                return False
+            self._devices[device_id] = (user_id, now)
+            self._devices.move_to_end(device_id)
+            while len(self._devices) > self.max_size:
+                self._devices.popitem(last=False)
+            self.bound_count += 1
+            return True
+
+    def forget(self, device_id: str, user_id: str | int):
+        """Drop the device if it was last bound to the user, e.g. when the binding task could not be created."""
+        with self._lock:
+            last = self._devices.get(device_id)
+            if last is not None and last[0] == str(user_id):
+                del self._devices[device_id]
+                self.bound_count -= 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._devices),
+                "bound": self.bound_count,
+                "suppressed": self.suppressed_count,
+            }
+
+
+DEVICE_BINDINGS = DeviceBindingCache(settings.BIND_DEVICE_CACHE_SIZE, settings.BIND_DEVICE_COALESCE_WINDOW)
@@ -1,3 +1,4 @@
+import functools
 from google.cloud import tasks_v2
 import json
 import logging
@@ -16,6 +17,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from google.protobuf.timestamp_pb2 import Timestamp
 from shared.emailer import send_complete_registration
+from google_tasks.device_bindings import DEVICE_BINDINGS
+from shared.ip_geo import ip_country
+
+@functools.cache
+def get_tasks_client() -> tasks_v2.CloudTasksClient:
+    """Process-wide client, its gRPC channel and credentials are reused by all threads."""
+    return tasks_v2.CloudTasksClient()
+
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, o):
@@ -27,7 +36,7 @@ class DateTimeEncoder(json.JSONEncoder):
 
 # 1st TASK
 def create_send_welcome_task(user_id, user_email):
-    client = tasks_v2.CloudTasksClient()
+    client = get_tasks_client()
     if settings.STAGE:
         queue = settings.STAGE_QUEUE_SEND_WELCOME
         url = f"{settings.STAGE_USERS_SERVICE_URL}/cloud_tasks/send_welcome/"
@@ -94,7 +103,7 @@ def send_welcome_task_view(request):
 def create_delay_registration_email_task(user_id, cascade, delay_minutes=0, delay_days=0):
     """Creates a delayed task for sending a complete registration email."""
     try:
-        client = tasks_v2.CloudTasksClient()
+        client = get_tasks_client()
 
         if settings.STAGE:
             queue = settings.STAGE_QUEUE_DELAY_EMAIL
@@ -182,7 +191,7 @@ def create_send_farewell_email_task(
 ):
     """Schedules a task to send a farewell email."""
     try:
-        client = tasks_v2.CloudTasksClient()
+        client = get_tasks_client()
         if settings.STAGE:
             queue = settings.STAGE_QUEUE_FAREWELL_EMAIL
             url = f"{settings.STAGE_USERS_SERVICE_URL}/cloud_tasks/send_farewell_email/"
@@ -269,7 +278,7 @@ def create_send_cloud_event_task(
 ):
     """Schedules a task to send a cloud event."""
     try:
-        client = tasks_v2.CloudTasksClient()
+        client = get_tasks_client()
         if settings.STAGE:
             queue = settings.STAGE_QUEUE_CLOUD_EVENT
             url = f"{settings.STAGE_USERS_SERVICE_URL}/cloud_tasks/send_cloud_event/"
@@ -330,6 +339,7 @@ def send_cloud_event_task_view(request):
         user = CustomUser.objects.get(id=user_id)
         fi = user.funnel_info or {}
         geo = fi.get("geolocation", {})
+        ip = fi.pop("ip", None)
         em = EventManager(user.payment_system)  # type: ignore
 
         em.sendCloudEvent(
@@ -337,10 +347,10 @@ def send_cloud_event_task_view(request):
             event_name,
             user.device_id,
             user.pk,
-            ip=fi.pop("ip", None),
+            ip=ip,
             referrer=fi.pop("referer", None),
             language=fi.pop("language", None),
-            country_code=geo.get("country_code", None),
+            country_code=geo.get("country_code", None) or ip_country(ip),
             country=geo.get("country_name", None),
             city=geo.get("city", None),
             region=geo.get("region", None),
@@ -357,7 +367,7 @@ def send_cloud_event_task_view(request):
 # 5th TASK
 def create_publish_payment_task(topic_id: str, data: dict):
 
-    client = tasks_v2.CloudTasksClient()
+    client = get_tasks_client()
     if settings.STAGE:
         queue = settings.STAGE_QUEUE_PUBLISH_PAYMENT
         url = f"{settings.STAGE_USERS_SERVICE_URL}/cloud_tasks/publish_payment/"
@@ -422,7 +432,7 @@ def publish_payment_task_view(request):
 def create_publish_event_task(topic_id: str, data: dict):
     """Schedules a task to publish an event message."""
 
-    client = tasks_v2.CloudTasksClient()
+    client = get_tasks_client()
     if settings.STAGE:
         queue = settings.STAGE_QUEUE_PUBLISH_EVENT
         url = f"{settings.STAGE_USERS_SERVICE_URL}/cloud_tasks/publish_event/"
@@ -484,9 +494,11 @@ def publish_event_task_view(request):
 
 # 7th TASK
 def create_bind_device_task(device_id: str, user_id: str | int):
-    """Schedules a task to bind a device to a user."""
+    """Schedules a task to bind a device to a user. Repeat bindings of a device to its last user are coalesced (see `DEVICE_BINDINGS`)."""
+    if not DEVICE_BINDINGS.should_bind(device_id, user_id):
+        logging.debug("Bind device task suppressed for device %s and user %s; stats=%s", device_id, user_id, DEVICE_BINDINGS.stats())
+        return
 
-    client = tasks_v2.CloudTasksClient()
     if settings.STAGE:
         queue = settings.STAGE_QUEUE_BIND_DEVICE
         url = f"{settings.STAGE_USERS_SERVICE_URL}/cloud_tasks/bind_device_to_user/"
@@ -494,9 +506,9 @@ def create_bind_device_task(device_id: str, user_id: str | int):
         queue = settings.PROD_QUEUE_BIND_DEVICE
         url = f"{settings.PROD_USERS_SERVICE_URL}/cloud_tasks/bind_device_to_user/"
 
-    parent = client.queue_path(settings.GCP_PROJECT_ID, settings.GCP_LOCATION, queue)
-
     try:
+        client = get_tasks_client()
+        parent = client.queue_path(settings.GCP_PROJECT_ID, settings.GCP_LOCATION, queue)
         ts = round(timezone.now().timestamp() * 1e6)
         payload = {
             "device_id": device_id,
@@ -519,6 +531,7 @@ def create_bind_device_task(device_id: str, user_id: str | int):
         client.create_task(parent=parent, task=task)
         logging.debug("Bind device task created for device %s and user %s", device_id, user_id)
     except Exception as e:
+        DEVICE_BINDINGS.forget(device_id, user_id)
         logging.error(f"Error processing create_bind_device_task: {str(e)}")
         raise
 
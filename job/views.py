@@ -2,13 +2,14 @@ from rest_framework import mixins, status, viewsets
 from rest_framework.response import Response
 
 from custom.custom_permissions import HasUnexpiredSubscription
+from custom.custom_viewsets import ReplicaReadMixin
 from job.models import Job, JobUser
 from job.serializers import (JobExpiredSerializer, JobListSerializer,
                              JobSerializer, JobUserCreateSerializer,
                              JobUserListSerializer)
 
 
-class JobViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
+class JobViewSet(ReplicaReadMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
     """The viewset for retrieveing Jobs information."""
     queryset = Job.objects.all()
     permission_classes = [HasUnexpiredSubscription]
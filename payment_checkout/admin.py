@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from payment_checkout.fraud_models import FraudPayment
+from payment_checkout.fraud_models import BinRule, FraudPayment, FraudRule
 from payment_checkout.models import (CheckoutCustomer, CheckoutPaymentAttempt,
                                      CheckoutPaymentMethod,
                                      CheckoutTransaction,
@@ -36,6 +36,22 @@ class FraudPaymentAttemptAdmin(admin.ModelAdmin):
     search_fields = ['email', 'fingerprint', 'ip']
 
 
+@admin.register(BinRule)
+class BinRuleAdmin(admin.ModelAdmin):
+    list_display = ('prefix', 'action', 'is_active', 'comment', 'date_updated')
+    list_editable = ('action', 'is_active')
+    list_filter = ('action', 'is_active')
+    search_fields = ['prefix', 'comment']
+
+
+@admin.register(FraudRule)
+class FraudRuleAdmin(admin.ModelAdmin):
+    list_display = ('message', 'outcome', 'feature', 'window', 'threshold', 'priority', 'is_active', 'date_updated')
+    list_editable = ('threshold', 'priority', 'is_active')
+    list_filter = ('outcome', 'feature', 'is_active')
+    search_fields = ['message', 'values']
+
+
 @admin.register(CheckoutPaymentMethod)
 class CheckoutPaymentMethodAdmin(admin.ModelAdmin):
     list_display = ('pk', 'user', 'type', 'is_selected')
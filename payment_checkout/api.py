@@ -1,4 +1,5 @@
 
+import functools
 import logging
 from typing import Any, Literal, Tuple
 
@@ -28,6 +29,16 @@ _EVENT_MANAGER = EventManager(GatewayChoices.CHECKOUT)
 PAYMENT_REFERENCE = "jobescape_subscription"
 
 
+@functools.cache
+def get_checkout_client(secret_key: str, public_key: str, sandbox: bool) -> CheckoutApi:
+    """Process-wide SDK client, its HTTP session (and connections) are reused by all API instances."""
+    return CheckoutSdk.builder()\
+        .secret_key(secret_key)\
+        .public_key(public_key)\
+        .environment(Environment.sandbox() if sandbox else Environment.production())\
+        .build()
+
+
 class API(BaseAPI):
     system = GatewayChoices.CHECKOUT
     api_secret = settings.CHECKOUT_API_SECRET
@@ -36,11 +47,7 @@ class API(BaseAPI):
     client: CheckoutApi
 
     def __init__(self) -> None:
-        self.client = CheckoutSdk.builder()\
-            .secret_key(self.api_secret)\
-            .public_key(self.api_public)\
-            .environment(Environment.sandbox() if settings.CHECKOUT_SANDBOX else Environment.production())\
-            .build()
+        self.client = get_checkout_client(self.api_secret, self.api_public, bool(settings.CHECKOUT_SANDBOX))
 
     def checkout(
         self,
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PaymentCheckoutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'payment_checkout'
+
+    def ready(self):
+        from payment_checkout import signals  # noqa: F401 pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,61 @@
+"""Default fraud rules, the ones seeded by migration 0007 (previously hard-coded in `rejects` and `force_3ds`).
+
+The engine falls back to them when the `FraudRule` table cannot be read before any plan was loaded, or when it
+has no active rules, so payments are never checked against an empty plan.
+"""
+from payment_checkout.fraud_models import (BinRuleActions, FraudRule,
+                                           FraudRuleFeatures,
+                                           FraudRuleOutcomes)
+
+REJECT_GEO = (
+    'AF', 'TG', 'CU', 'ER', 'ET', 'GW', 'IR', 'KP', 'RU', 'SY', 'YE', 'MM', 'PA', 'CR',
+    'MX', 'PE', 'OM', 'SV', 'AZ', 'MY', 'PS', 'RO', 'CZ', 'BO', 'AR', 'ZA', 'UY', 'GR', 'RS', 'KW'
+)
+FORCE_3DS_GEO = ('NA', 'MW', 'ZM', 'TZ', 'CN', 'BW', 'UZ', 'JM', 'TN', 'CM', 'YE', 'BJ', 'TJ', 'SZ',
+                 'BT', 'SE', 'SR', 'HT', 'TD', 'NG', 'PK', 'SN', "GY", "SV", "CL", "BS", "CR", "HN")
+
+# (feature, window, threshold, message) in evaluation order
+REJECT_RULES = (
+    ("fingerprints_by_email", "24h", 7, "Suspected Fraud 1"),
+    ("fingerprints_by_email", "30m", 5, "Suspected Fraud 2"),
+    ("hard_errors_by_email", "7d", 3, "Suspected Fraud 4"),
+    ("errors_by_email", "7d", 15, "Suspected Fraud 5"),
+    ("emails_by_fingerprint", "24h", 6, "Suspected Fraud 3"),
+    ("errors_by_fingerprint", "30m", 6, "Suspected Fraud 6"),
+)
+FORCE_3DS_RULES = (
+    ("fingerprints_by_email", "30m", 3, "Forced 3DS 5"),
+    ("fingerprints_by_email", "24h", 4, "Forced 3DS 6"),
+    ("fingerprints_by_email", "7d", 6, "Forced 3DS 7"),
+    ("emails_by_fingerprint", "24h", 3, "Forced 3DS 3"),
+    ("emails_by_fingerprint", "7d", 6, "Forced 3DS 4"),
+    ("errors_20151_by_fingerprint", "24h", 2, "Forced 3DS 16"),
+    ("hard_errors_by_fingerprint", "30d", 0, "Forced 3DS 17"),
+    ("errors_20151_by_email", "24h", 2, "Forced 3DS 12"),
+    ("errors_20051_by_email", "24h", 3, "Forced 3DS 13"),
+    ("hard_errors_by_email", "30d", 0, "Forced 3DS 14"),
+    ("errors_by_email", "24h", 5, "Forced 3DS 15"),
+    ("emails_by_ip", "30m", 4, "Forced 3DS 8"),
+    ("emails_by_ip", "24h", 6, "Forced 3DS 9"),
+    ("emails_by_ip", "7d", 11, "Forced 3DS 10"),
+    ("geos_by_email", "30m", 3, "Forced 3DS 11"),
+)
+
+
+def default_rules() -> list[FraudRule]:
+    """Unsaved `FraudRule` instances of the default rules."""
+    rules = [
+        FraudRule(feature=FraudRuleFeatures.GEO, values=",".join(REJECT_GEO), outcome=FraudRuleOutcomes.REJECT,
+                  message="JobEscape is not supported in your country", priority=0),
+        FraudRule(feature=FraudRuleFeatures.BIN, values=BinRuleActions.REJECT, outcome=FraudRuleOutcomes.REJECT,
+                  message="JobEscape is not supported by your bank", priority=100),
+        FraudRule(feature=FraudRuleFeatures.GEO, values=",".join(FORCE_3DS_GEO), outcome=FraudRuleOutcomes.FORCE_3DS,
+                  message="Forced 3DS 1", priority=0),
+        FraudRule(feature=FraudRuleFeatures.BIN, values=BinRuleActions.FORCE_3DS, outcome=FraudRuleOutcomes.FORCE_3DS,
+                  message="Forced 3DS 2", priority=10),
+    ]
+    for outcome, definitions in ((FraudRuleOutcomes.REJECT, REJECT_RULES), (FraudRuleOutcomes.FORCE_3DS, FORCE_3DS_RULES)):
+        for i, (feature, window, threshold, message) in enumerate(definitions, start=1):
+            rules.append(FraudRule(feature=feature, window=window, threshold=threshold, outcome=outcome,
+                                   message=message, priority=10 + i * 10))
+    return rules
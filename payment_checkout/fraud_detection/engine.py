@@ -0,0 +1,225 @@
+"""Evaluation of the `FraudRule` table.
+
+Active rules are compiled into a plan that runs the cheap static rules (GEO, BIN, IP GEO) before the windowed count
+rules, which need a database or velocity read. Reject rules win over force 3DS rules, so evaluation stops at
+the first matching static reject rule, and only the features of rules that can still change the decision are
+loaded. The plan is rebuilt when the table changes (checked every `settings.FRAUD_RULES_TTL` seconds).
+
+The engine fails closed: a failed reload keeps the last loaded plan, and the default rules
+(`payment_checkout.fraud_detection.defaults`) are used until the table is read, or while it has no active rules.
+
+The cost of a rule is the time spent producing its feature (its share of the batched feature load, the BIN or IP
+GEO lookup) plus the comparison, so it is the time saved per payment by removing the rule and its feature.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from payment_checkout.fraud_detection.defaults import default_rules
+from payment_checkout.fraud_detection.features import extract_features
+from payment_checkout.fraud_detection.velocity import velocity_features
+from payment_checkout.fraud_models import (FraudRule, FraudRuleFeatures,
+                                           FraudRuleOutcomes)
+from shared.bin_rules import lookup_bin
+from shared.ip_geo import ip_country
+
+OK = "OK"
+ANY = "*"
+LATENCY_SAMPLES = 10000  # latest costs kept per rule for percentiles
+
+FeatureLoader = Callable[[list[str]], dict[str, int]]
+
+
+class RuleStats:
+    """In-process counters of a rule. Not synchronised, so counts are approximate under threads."""
+    __slots__ = ("evaluations", "hits", "seconds", "latencies")
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.hits = 0
+        self.seconds = 0.0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, seconds: float, hit: bool):
+        self.evaluations += 1
+        self.hits += hit
+        self.seconds += seconds
+        self.latencies.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+_stats: dict[str, RuleStats] = {}
+
+
+def get_stats(name: str) -> RuleStats:
+    if name not in _stats:
+        _stats[name] = RuleStats()
+    return _stats[name]
+
+
+class CompiledRule:
+    __slots__ = ("name", "feature", "outcome", "message", "threshold", "values", "stats")
+
+    def __init__(self, rule: FraudRule) -> None:
+        self.name = f"{rule.pk or 'default'}:{rule.message}"
+        self.feature = rule.feature if rule.is_static else f"{rule.feature}_{rule.window}"
+        self.outcome = rule.outcome
+        self.message = rule.message
+        self.threshold = None if rule.is_static else rule.threshold or 0
+        self.values = frozenset(rule.value_list())
+        self.stats = get_stats(self.name)
+
+    def matches(self, context: dict, costs: dict[str, float]) -> bool:
+        """Match the rule against the context, charging it the cost of its feature (seconds per feature in `costs`)."""
+        start = time.perf_counter()
+        if self.threshold is None:
+            value = context[self.feature]
+            hit = value is not None and (value in self.values or ANY in self.values)
+        else:
+            hit = context[self.feature] > self.threshold
+        self.stats.add(time.perf_counter() - start + costs.get(self.feature, 0.0), hit)
+        return hit
+
+
+class Plan:
+    __slots__ = ("static_rejects", "static_forces", "rejects", "forces", "reject_features", "force_features", "uses_ip_geo")
+
+    def __init__(self, rules: list[FraudRule]) -> None:
+        compiled = [CompiledRule(rule) for rule in sorted(rules, key=lambda rule: (rule.priority, rule.pk))]
+        self.static_rejects = [rule for rule in compiled if rule.threshold is None and rule.outcome == FraudRuleOutcomes.REJECT]
+        self.static_forces = [rule for rule in compiled if rule.threshold is None and rule.outcome == FraudRuleOutcomes.FORCE_3DS]
+        self.rejects = [rule for rule in compiled if rule.threshold is not None and rule.outcome == FraudRuleOutcomes.REJECT]
+        self.forces = [rule for rule in compiled if rule.threshold is not None and rule.outcome == FraudRuleOutcomes.FORCE_3DS]
+        self.reject_features = sorted({rule.feature for rule in self.rejects})
+        self.force_features = sorted({rule.feature for rule in self.forces} - set(self.reject_features))
+        self.uses_ip_geo = any(rule.feature in (FraudRuleFeatures.IP_GEO, FraudRuleFeatures.GEO_MISMATCH) for rule in compiled)
+
+    def evaluate(self, ip: str, geo: str, card_bin: str | None, load_features: FeatureLoader) -> tuple[str, str | None]:
+        """Return the outcome (`OK`, `REJECT` or `FORCE_3DS`) and the message of the deciding rule.
+        `load_features` is called at most once, with the count features still needed."""
+        start = time.perf_counter()
+        bin_match = lookup_bin(card_bin)
+        context = {FraudRuleFeatures.GEO: geo, FraudRuleFeatures.BIN: bin_match.action if bin_match else None}
+        costs = {FraudRuleFeatures.BIN: time.perf_counter() - start}
+        if self.uses_ip_geo:
+            start = time.perf_counter()
+            resolved = ip_country(ip)
+            context[FraudRuleFeatures.IP_GEO] = resolved
+            context[FraudRuleFeatures.GEO_MISMATCH] = geo if resolved and geo and resolved != geo.upper() else None
+            costs[FraudRuleFeatures.IP_GEO] = costs[FraudRuleFeatures.GEO_MISMATCH] = time.perf_counter() - start
+        for rule in self.static_rejects:
+            if rule.matches(context, costs):
+                return rule.outcome, rule.message
+        forced = next((rule for rule in self.static_forces if rule.matches(context, costs)), None)
+
+        # A force 3DS rule already matched, so only reject rules can change the decision
+        features = self.reject_features if forced else self.reject_features + self.force_features
+        if features:
+            start = time.perf_counter()
+            context.update(load_features(features))
+            # The features are loaded together (one query or one read), so each one is charged an equal share
+            share = (time.perf_counter() - start) / len(features)
+            costs.update(dict.fromkeys(features, share))
+        for rule in self.rejects:
+            if rule.matches(context, costs):
+                return rule.outcome, rule.message
+        if forced is None:
+            forced = next((rule for rule in self.forces if rule.matches(context, costs)), None)
+        if forced:
+            return forced.outcome, forced.message
+        return OK, None
+
+
+_plan: Plan | None = None  # None until the table was read, the default rules are used meanwhile
+_default_plan: Plan | None = None
+_version: tuple | None = None
+_checked_at: float | None = None
+_lock = threading.Lock()
+
+
+def get_version() -> tuple:
+    """Cheap version stamp of the rules table, changed by any saved, deleted or (de)activated rule."""
+    stats = FraudRule.objects.aggregate(count=Count("id"), active=Count("id", filter=Q(is_active=True)), updated=Max("date_updated"))
+    return stats["count"], stats["active"], stats["updated"]
+
+
+def get_default_plan() -> Plan:
+    global _default_plan
+    if _default_plan is None:
+        _default_plan = Plan(default_rules())
+    return _default_plan
+
+
+def get_plan() -> Plan:
+    """Return the in-process plan. Every `settings.FRAUD_RULES_TTL` seconds the table version is checked and the plan is rebuilt if it changed.
+    Until the table was read once, it is read again on every call and the default plan is returned."""
+    global _plan, _version, _checked_at
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at <= settings.FRAUD_RULES_TTL:
+        return _plan or get_default_plan()
+    with _lock:
+        if _checked_at is None or now - _checked_at > settings.FRAUD_RULES_TTL:
+            try:
+                version = get_version()
+                if version != _version:
+                    rules = list(FraudRule.objects.filter(is_active=True))
+                    if not rules:
+                        logging.error("Fraud rules: no active rules in the database, using the default rules")
+                    _plan = Plan(rules) if rules else None
+                    _version = version
+                _checked_at = now
+            except DatabaseError as e:
+                if _plan is None:
+                    logging.error("Fraud rules: failed to load rules from the database due to exception %s, using the default rules", str(e))
+                else:
+                    logging.error("Fraud rules: failed to reload rules from the database due to exception %s, keeping the loaded rules", str(e))
+                    _checked_at = now
+    return _plan or get_default_plan()
+
+
+def evaluate(email: str, fingerprint: str, ip: str, geo: str, card_bin: str | None,
+             now: timezone.datetime | None = None) -> tuple[str, str | None]:
+    def load_features(features: list[str]) -> dict[str, int]:
+        if settings.FRAUD_VELOCITY_READ:
+            return velocity_features(email, fingerprint, ip, now=now, features=features)
+        return extract_features(email, fingerprint, ip, now=now, features=features)
+
+    return get_plan().evaluate(ip, geo, card_bin, load_features)
+
+
+def invalidate_fraud_rules():
+    """Force a version check on the next evaluation."""
+    global _checked_at
+    _checked_at = None
+
+
+def rule_stats() -> list[dict]:
+    """Hit and cost counters of the rules since the process started (or `reset_rule_stats`). The cost of an evaluation
+    includes the load of the rule's feature (see the module docstring)."""
+    return [
+        {
+            "rule": name,
+            "evaluations": stats.evaluations,
+            "hits": stats.hits,
+            "avg_ms": stats.seconds / stats.evaluations * 1000 if stats.evaluations else None,
+            "p99_ms": stats.percentile(0.99) * 1000 if stats.latencies else None,
+        }
+        for name, stats in _stats.items()
+    ]
+
+
+def reset_rule_stats():
+    for stats in list(_stats.values()):
+        stats.__init__()
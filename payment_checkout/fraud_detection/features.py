@@ -0,0 +1,76 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.timezone import timedelta
+
+from payment_checkout.fraud_models import FraudPayment
+
+WINDOWS = {
+    "30m": timedelta(minutes=30),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+MAX_WINDOW = max(WINDOWS.values())
+
+hard_error_codes = ['20062', '30036', '30043', '30041']
+
+# Measure -> (key field, counted field for distinct counts or None for row counts, row condition)
+MEASURES = {
+    "fingerprints_by_email": ("email", "fingerprint", Q()),
+    "geos_by_email": ("email", "geo", Q()),
+    "errors_by_email": ("email", None, Q(error_code__isnull=False)),
+    "errors_20151_by_email": ("email", None, Q(error_code="20151")),
+    "errors_20051_by_email": ("email", None, Q(error_code="20051")),
+    "hard_errors_by_email": ("email", None, Q(error_code__in=hard_error_codes)),
+    "emails_by_fingerprint": ("fingerprint", "email", Q()),
+    "errors_by_fingerprint": ("fingerprint", None, Q(error_code__isnull=False)),
+    "errors_20151_by_fingerprint": ("fingerprint", None, Q(error_code="20151")),
+    "hard_errors_by_fingerprint": ("fingerprint", None, Q(error_code__in=hard_error_codes)),
+    "emails_by_ip": ("ip", "email", Q()),
+}
+# Features used by the default fraud rules
+DEFAULT_FEATURES = (
+    "fingerprints_by_email_30m", "fingerprints_by_email_24h", "fingerprints_by_email_7d", "geos_by_email_30m",
+    "errors_20151_by_email_24h", "errors_20051_by_email_24h", "errors_by_email_24h", "errors_by_email_7d",
+    "hard_errors_by_email_7d", "hard_errors_by_email_30d", "emails_by_fingerprint_24h", "emails_by_fingerprint_7d",
+    "errors_by_fingerprint_30m", "errors_20151_by_fingerprint_24h", "hard_errors_by_fingerprint_30d",
+    "emails_by_ip_30m", "emails_by_ip_24h", "emails_by_ip_7d",
+)
+
+
+def split_feature(feature: str) -> tuple[str, str]:
+    """Split a feature name into its measure and window, e.g. `fingerprints_by_email_24h` -> (`fingerprints_by_email`, `24h`)."""
+    measure, _, window = feature.rpartition("_")
+    if measure not in MEASURES or window not in WINDOWS:
+        raise ValueError(f"Unknown fraud feature '{feature}'")
+    return measure, window
+
+
+def extract_features(email: str, fingerprint: str, ip: str, now: timezone.datetime | None = None,
+                     features: tuple[str, ...] | list[str] = DEFAULT_FEATURES, pending_pk: int | None = None) -> dict[str, int]:
+    """Compute the windowed `FraudPayment` counts used by the fraud rules in a single aggregate query.
+
+    Feature names are `<measure>_<window>`, e.g. `fingerprints_by_email_24h` is the number of distinct
+    card fingerprints used with the email during the last 24 hours.
+    Rows after `now` are ignored, as is the error code of the `pending_pk` attempt, so past checks can be replayed.
+    """
+    if not features:
+        return {}
+    if now is None:
+        now = timezone.now()
+    keys = {"email": Q(email=email), "fingerprint": Q(fingerprint=fingerprint), "ip": Q(ip=ip)}
+    aggregates = {}
+    used_keys = set()
+    for feature in features:
+        measure, window = split_feature(feature)
+        key, field, condition = MEASURES[measure]
+        if field is None and pending_pk is not None:
+            condition = condition & ~Q(pk=pending_pk)
+        row_filter = keys[key] & condition & Q(datetime__gte=now - WINDOWS[window])
+        aggregates[feature] = Count(field, distinct=True, filter=row_filter) if field else Count("id", filter=row_filter)
+        used_keys.add(key)
+    key_filter = Q()
+    for key in sorted(used_keys):
+        key_filter |= keys[key]
+    widest = max(WINDOWS[split_feature(feature)[1]] for feature in features)
+    return FraudPayment.objects.filter(key_filter, datetime__gte=now - widest, datetime__lte=now).aggregate(**aggregates)
@@ -1,18 +1,8 @@
 from growthbook import GrowthBook
 
 from account.models import GatewayChoices
-from custom.custom_exceptions import Fraud3dsException, FraudRejectException
-from payment_checkout.fraud_detection.force_3ds import (
-    force_3ds_cardHashByEmail, force_3ds_check_bin, force_3ds_check_geo,
-    force_3ds_emailByCardHash, force_3ds_emailByIp, force_3ds_geoByEmail,
-    force_3ds_orderByCardHash, force_3ds_orderByEmail)
-from payment_checkout.fraud_detection.rejects import (reject_cardHashByEmail,
-                                                      reject_check_bin,
-                                                      reject_check_geo,
-                                                      reject_emailByCardHash,
-                                                      reject_orderByCardHash,
-                                                      reject_orderByEmail)
-from payment_checkout.fraud_models import FraudPayment
+from payment_checkout.fraud_detection import engine
+from payment_checkout.fraud_models import FraudPayment, FraudRuleOutcomes
 from web_analytics.event_manager import EventManager
 
 check_3ds_codes = ['20001', '20002', '20005', '20012', '20038', '20046', '20057', '20059', '20062', '20063', '20064',
@@ -30,7 +20,8 @@ def check(user_id: int, fingerprint: str, email: str, ip: str, geo: str, sub_id:
         ip=ip,
         geo=geo,
         sub_id=sub_id,
-        trial=trial
+        trial=trial,
+        card_bin=card_bin
     )
     event_data: dict[str, str | dict] = {
         "result": "OK",
@@ -38,32 +29,12 @@ def check(user_id: int, fingerprint: str, email: str, ip: str, geo: str, sub_id:
         "ip": ip,
         "geo": geo
     }
-    try:
-        reject_check_geo(geo)
-        reject_cardHashByEmail(email)
-        reject_orderByEmail(email)
-        reject_emailByCardHash(fingerprint)
-        reject_orderByCardHash(fingerprint)
-        reject_check_bin(card_bin)
-
-        force_3ds_check_geo(geo)
-        force_3ds_check_bin(card_bin)
-        force_3ds_cardHashByEmail(email)
-        force_3ds_emailByCardHash(fingerprint)
-        force_3ds_orderByCardHash(fingerprint)
-        force_3ds_orderByEmail(email)
-        force_3ds_emailByIp(ip)
-        force_3ds_geoByEmail(email)
-    except FraudRejectException as e:
-        event_data["message"] = str(e)
-        event_data["result"] = "REJECT"
-        _EVENT_MANAGER.sendEvent("pr_funnel_middleware", user_id, event_data, topic="funnel")
-        return "REJECT", str(e), fraud_payment
-    except Fraud3dsException as e:
-        event_data["message"] = str(e)
-        event_data["result"] = "FORCE_3DS"
+    result, message = engine.evaluate(email, fingerprint, ip, geo, card_bin)
+    if result != engine.OK:
+        event_data["message"] = message
+        event_data["result"] = result
         _EVENT_MANAGER.sendEvent("pr_funnel_middleware", user_id, event_data, topic="funnel")
-        return "FORCE_3DS", None, fraud_payment
+        return result, message if result == FraudRuleOutcomes.REJECT else None, fraud_payment
 
     _EVENT_MANAGER.sendEvent("pr_funnel_middleware", user_id, event_data, topic="funnel")
     return "OK", None, fraud_payment
@@ -0,0 +1,91 @@
+"""Monthly range partitions of the `FraudPayment` table (PostgreSQL only, created by migration 0005)."""
+import gzip
+import re
+import tempfile
+from datetime import timezone as dt_timezone
+
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.db import connection, transaction
+from django.utils import timezone
+
+from payment_checkout.fraud_models import FraudPayment
+
+TABLE = FraudPayment._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(dt: timezone.datetime) -> timezone.datetime:
+    dt = dt.astimezone(dt_timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(month: timezone.datetime) -> timezone.datetime:
+    return month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+
+
+def partition_name(month: timezone.datetime) -> str:
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def list_partitions() -> dict[str, timezone.datetime]:
+    """Monthly partitions by name, with the start of their month. The default partition is not included."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = %s::regclass", [TABLE])
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            partitions[name] = timezone.datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+    return partitions
+
+
+def create_partition(month: timezone.datetime):
+    """Create the partition of the month. Rows of that month that landed in the default partition are moved into it."""
+    name = connection.ops.quote_name(partition_name(month))
+    table = connection.ops.quote_name(TABLE)
+    default = connection.ops.quote_name(DEFAULT_PARTITION)
+    bounds = [month, next_month(month)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} WHERE datetime >= %s AND datetime < %s RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved", bounds
+        )
+        cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)", bounds)
+
+
+def archive_query(query: str, params: list, storage: Storage, path: str) -> str:
+    """Stream the query result as gzipped CSV to the storage. Returns the saved file name."""
+    with tempfile.TemporaryFile() as tmp:
+        with gzip.GzipFile(fileobj=tmp, mode="wb") as gz, connection.cursor() as cursor:
+            sql = cursor.mogrify(query, params).decode("utf-8")
+            cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH CSV HEADER", gz)
+        tmp.seek(0)
+        return storage.save(path, File(tmp))
+
+
+def archive_partition(name: str, storage: Storage) -> str:
+    return archive_query(f"SELECT * FROM {connection.ops.quote_name(name)}", [], storage, f"fraud_payments/{name}.csv.gz")
+
+
+def drop_partition(name: str):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {connection.ops.quote_name(TABLE)} DETACH PARTITION {connection.ops.quote_name(name)}")
+        cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+
+
+def archive_default_partition(before: timezone.datetime, storage: Storage) -> tuple[str | None, int]:
+    """Archive and delete rows older than `before` from the default partition."""
+    default = connection.ops.quote_name(DEFAULT_PARTITION)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE datetime < %s)", [before])
+        if not cursor.fetchone()[0]:
+            return None, 0
+    path = archive_query(f"SELECT * FROM {default} WHERE datetime < %s", [before], storage,
+                         f"fraud_payments/{DEFAULT_PARTITION}_{before:%Y_%m_%d}.csv.gz")
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {default} WHERE datetime < %s", [before])
+        return path, cursor.rowcount
@@ -0,0 +1,307 @@
+"""Incremental velocity counters for the fraud rules.
+
+Every `FraudPayment` is added to time buckets of its email, fingerprint and IP keys: error counters and
+approximate distinct-count sketches (k minimum values, exact below `SKETCH_SIZE` distinct values). Windowed
+features are then summed from a few buckets instead of scanning `FraudPayment`. A window includes its oldest
+partial bucket, so counts may slightly exceed the exact ones.
+"""
+import hashlib
+import heapq
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from payment_checkout.fraud_detection.features import (DEFAULT_FEATURES,
+                                                       WINDOWS,
+                                                       extract_features,
+                                                       hard_error_codes,
+                                                       split_feature)
+from payment_checkout.fraud_models import FraudPayment, FraudVelocityBucket
+
+SKETCH_SIZE = 32
+# Bucket size in seconds -> number of buckets to keep
+RESOLUTIONS = {300: 7, 3600: 25, 86400: 31}
+LOCK_ATTEMPTS = 50  # tries to take the sketch lock of a cache bucket, LOCK_WAIT seconds apart
+LOCK_WAIT = 0.01
+LOCK_TIMEOUT = 5  # seconds after which the lock of a crashed update expires
+WINDOW_RESOLUTIONS = {"30m": 300, "24h": 3600, "7d": 86400, "30d": 86400}
+# Feature measure -> (key type, stored counter or sketch name); names in SKETCHES are distinct counts
+MEASURES = {
+    "fingerprints_by_email": ("email", "fingerprints"),
+    "geos_by_email": ("email", "geos"),
+    "errors_by_email": ("email", "errors"),
+    "errors_20151_by_email": ("email", "errors_20151"),
+    "errors_20051_by_email": ("email", "errors_20051"),
+    "hard_errors_by_email": ("email", "hard_errors"),
+    "emails_by_fingerprint": ("fingerprint", "emails"),
+    "errors_by_fingerprint": ("fingerprint", "errors"),
+    "errors_20151_by_fingerprint": ("fingerprint", "errors_20151"),
+    "hard_errors_by_fingerprint": ("fingerprint", "hard_errors"),
+    "emails_by_ip": ("ip", "emails"),
+}
+SKETCHES = ("fingerprints", "geos", "emails")
+COUNTERS = ("errors", "errors_20151", "errors_20051", "hard_errors")
+
+Bucket = dict[str, dict]  # {"c": {counter: int}, "s": {measure: sorted list of hashes}}
+
+
+def hash_value(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def merge_sketches(*sketches: list[int]) -> list[int]:
+    return heapq.nsmallest(SKETCH_SIZE, set().union(*sketches))
+
+
+def estimate_distinct(sketch: list[int]) -> int:
+    if len(sketch) < SKETCH_SIZE:
+        return len(sketch)
+    return round((SKETCH_SIZE - 1) / (max(sketch) / 2**64))
+
+
+def merge_bucket(bucket: Bucket, counters: dict[str, int], members: dict[str, int]) -> Bucket:
+    bucket.setdefault("c", {})
+    bucket.setdefault("s", {})
+    for name, value in counters.items():
+        bucket["c"][name] = bucket["c"].get(name, 0) + value
+    for name, value in members.items():
+        bucket["s"][name] = merge_sketches(bucket["s"].get(name, []), [value])
+    return bucket
+
+
+class VelocityBackend(ABC):
+    """Storage of velocity buckets. A bucket is identified by the key, resolution (bucket size in seconds) and bucket number."""
+
+    @abstractmethod
+    def update(self, key: str, resolution: int, bucket: int, counters: dict[str, int], members: dict[str, int]):
+        """Add the counters to the bucket and the member hashes to its sketches."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def read(self, requests: list[tuple[str, int, int]], now: float) -> dict[tuple[str, int], dict[int, Bucket]]:
+        """Fetch buckets newer or equal to the bucket number of each (key, resolution, bucket) request, up to the
+        bucket of the `now` timestamp."""
+        raise NotImplementedError()
+
+    def prune(self, now: float):
+        """Drop buckets that fell out of all windows."""
+
+
+class LocalVelocityBackend(VelocityBackend):
+    """In-process storage, for tests and single-process deployments."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[tuple[str, int], dict[int, Bucket]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, key, resolution, bucket, counters, members):
+        with self._lock:
+            buckets = self._buckets.setdefault((key, resolution), {})
+            merge_bucket(buckets.setdefault(bucket, {}), counters, members)
+            for old in [b for b in buckets if b <= bucket - RESOLUTIONS[resolution]]:
+                del buckets[old]
+
+    def read(self, requests, now):
+        with self._lock:
+            return {
+                (key, resolution): {b: data for b, data in self._buckets.get((key, resolution), {}).items()
+                                    if since <= b <= now // resolution}
+                for key, resolution, since in requests
+            }
+
+    def prune(self, now):
+        with self._lock:
+            for (key, resolution), buckets in list(self._buckets.items()):
+                oldest = int(now // resolution) - RESOLUTIONS[resolution]
+                for old in [b for b in buckets if b <= oldest]:
+                    del buckets[old]
+                if not buckets:
+                    del self._buckets[(key, resolution)]
+
+
+class DatabaseVelocityBackend(VelocityBackend):
+    """Storage in the `FraudVelocityBucket` table, one row per bucket."""
+
+    def update(self, key, resolution, bucket, counters, members):
+        try:
+            with transaction.atomic():
+                row, _ = FraudVelocityBucket.objects.select_for_update().get_or_create(key=key, resolution=resolution, bucket=bucket)
+                merge_bucket(row.data, counters, members)
+                row.save(update_fields=["data"])
+        except IntegrityError:  # concurrent insert of the same bucket
+            with transaction.atomic():
+                row = FraudVelocityBucket.objects.select_for_update().get(key=key, resolution=resolution, bucket=bucket)
+                merge_bucket(row.data, counters, members)
+                row.save(update_fields=["data"])
+
+    def read(self, requests, now):
+        query = Q()
+        for key, resolution, since in requests:
+            query |= Q(key=key, resolution=resolution, bucket__gte=since, bucket__lte=int(now // resolution))
+        result: dict[tuple[str, int], dict[int, Bucket]] = {(key, resolution): {} for key, resolution, _ in requests}
+        for row in FraudVelocityBucket.objects.filter(query).only("key", "resolution", "bucket", "data"):
+            result[(row.key, row.resolution)][row.bucket] = row.data
+        return result
+
+    def prune(self, now):
+        for resolution, keep in RESOLUTIONS.items():
+            FraudVelocityBucket.objects.filter(resolution=resolution, bucket__lte=int(now // resolution) - keep).delete()
+
+
+class CacheVelocityBackend(VelocityBackend):
+    """Storage in a Django cache (e.g. `django.core.cache.backends.redis.RedisCache`). Buckets expire with the cache timeout.
+    Each counter of a bucket is a cache key updated with `incr`. The sketches of a bucket are one key, merged under a
+    lock taken with `add`, so concurrent updates are not lost as long as the cache has atomic `incr` and `add`
+    (Redis, Memcached, database cache)."""
+
+    def __init__(self, alias: str) -> None:
+        self.cache = caches[alias]
+
+    @staticmethod
+    def cache_key(key: str, resolution: int, bucket: int) -> str:
+        return f"fraud-velocity:{hashlib.md5(key.encode('utf-8')).hexdigest()}:{resolution}:{bucket}"
+
+    def update(self, key, resolution, bucket, counters, members):
+        cache_key = self.cache_key(key, resolution, bucket)
+        timeout = resolution * RESOLUTIONS[resolution]
+        for name, value in counters.items():
+            counter_key = f"{cache_key}:c:{name}"
+            self.cache.add(counter_key, 0, timeout=timeout)
+            try:
+                self.cache.incr(counter_key, value)
+            except ValueError:  # expired between add and incr
+                self.cache.set(counter_key, value, timeout=timeout)
+        if members:
+            with self.lock(f"{cache_key}:lock"):
+                sketches = self.cache.get(f"{cache_key}:s") or {}
+                for name, value in members.items():
+                    sketches[name] = merge_sketches(sketches.get(name, []), [value])
+                self.cache.set(f"{cache_key}:s", sketches, timeout=timeout)
+
+    @contextmanager
+    def lock(self, lock_key: str):
+        for _ in range(LOCK_ATTEMPTS):
+            locked = self.cache.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+            if locked:
+                break
+            time.sleep(LOCK_WAIT)
+        else:
+            logging.warning("Fraud velocity: %s is still locked, updating the sketches without the lock", lock_key)
+        try:
+            yield
+        finally:
+            if locked:
+                self.cache.delete(lock_key)
+
+    def read(self, requests, now):
+        keys = {}
+        for key, resolution, since in requests:
+            for bucket in range(since, int(now // resolution) + 1):
+                cache_key = self.cache_key(key, resolution, bucket)
+                keys[f"{cache_key}:s"] = (key, resolution, bucket, "s", None)
+                for name in COUNTERS:
+                    keys[f"{cache_key}:c:{name}"] = (key, resolution, bucket, "c", name)
+        found = self.cache.get_many(list(keys))
+        result: dict[tuple[str, int], dict[int, Bucket]] = {(key, resolution): {} for key, resolution, _ in requests}
+        for cache_key, value in found.items():
+            key, resolution, bucket, kind, name = keys[cache_key]
+            data = result[(key, resolution)].setdefault(bucket, {"c": {}, "s": {}})
+            if kind == "s":
+                data["s"] = value
+            else:
+                data["c"][name] = value
+        return result
+
+
+_backend: VelocityBackend | None = None
+
+
+def get_backend() -> VelocityBackend | None:
+    """Return the backend configured by `settings.FRAUD_VELOCITY_BACKEND`, or `None` if velocity counters are disabled."""
+    global _backend
+    if _backend is None:
+        match settings.FRAUD_VELOCITY_BACKEND:
+            case "local":
+                _backend = LocalVelocityBackend()
+            case "db":
+                _backend = DatabaseVelocityBackend()
+            case "cache":
+                _backend = CacheVelocityBackend(settings.FRAUD_VELOCITY_CACHE)
+    return _backend
+
+
+def _update(backend: VelocityBackend, key: str, ts: float, counters: dict[str, int], members: dict[str, str]):
+    hashed = {name: hash_value(value) for name, value in members.items()}
+    for resolution in RESOLUTIONS:
+        backend.update(key, resolution, int(ts // resolution), counters, hashed)
+
+
+def record_payment(fraud_payment: FraudPayment):
+    """Add a new payment attempt to the distinct-count sketches of its keys."""
+    backend = get_backend()
+    if backend is None:
+        return
+    ts = fraud_payment.datetime.timestamp()
+    _update(backend, f"email:{fraud_payment.email}", ts, {}, {"fingerprints": fraud_payment.fingerprint, "geos": fraud_payment.geo})
+    _update(backend, f"fingerprint:{fraud_payment.fingerprint}", ts, {}, {"emails": fraud_payment.email})
+    _update(backend, f"ip:{fraud_payment.ip}", ts, {}, {"emails": fraud_payment.email})
+
+
+def record_error(fraud_payment: FraudPayment):
+    """Add the error code of a declined payment attempt to the error counters of its keys."""
+    backend = get_backend()
+    if backend is None or fraud_payment.error_code is None:
+        return
+    counters = {"errors": 1}
+    if fraud_payment.error_code in ("20151", "20051"):
+        counters[f"errors_{fraud_payment.error_code}"] = 1
+    if fraud_payment.error_code in hard_error_codes:
+        counters["hard_errors"] = 1
+    ts = fraud_payment.datetime.timestamp()
+    _update(backend, f"email:{fraud_payment.email}", ts, counters, {})
+    _update(backend, f"fingerprint:{fraud_payment.fingerprint}", ts, counters, {})
+
+
+def velocity_features(email: str, fingerprint: str, ip: str, now: timezone.datetime | None = None,
+                      features: tuple[str, ...] | list[str] = DEFAULT_FEATURES) -> dict[str, int]:
+    """Same features as `features.extract_features`, read from the velocity backend (or computed by
+    `extract_features` when no backend is configured)."""
+    backend = get_backend()
+    if backend is None:
+        logging.error("Fraud velocity: FRAUD_VELOCITY_READ is set but FRAUD_VELOCITY_BACKEND is not, reading features from FraudPayment")
+        return extract_features(email, fingerprint, ip, now=now, features=features)
+    if not features:
+        return {}
+    ts = (now or timezone.now()).timestamp()
+    keys = {"email": f"email:{email}", "fingerprint": f"fingerprint:{fingerprint}", "ip": f"ip:{ip}"}
+    since = {window: int((ts - delta.total_seconds()) // WINDOW_RESOLUTIONS[window]) for window, delta in WINDOWS.items()}
+    oldest = {resolution: min(since[w] for w, r in WINDOW_RESOLUTIONS.items() if r == resolution) for resolution in RESOLUTIONS}
+    buckets = backend.read([(key, resolution, oldest[resolution]) for key in keys.values() for resolution in RESOLUTIONS], ts)
+
+    result = {}
+    for feature in features:
+        measure, window = split_feature(feature)
+        key_type, name = MEASURES[measure]
+        resolution = WINDOW_RESOLUTIONS[window]
+        in_window = [data for b, data in buckets[(keys[key_type], resolution)].items() if b >= since[window]]
+        if name in SKETCHES:
+            result[feature] = estimate_distinct(merge_sketches(*(data.get("s", {}).get(name, []) for data in in_window)))
+        else:
+            result[feature] = sum(data.get("c", {}).get(name, 0) for data in in_window)
+    return result
+
+
+def safe_record(func, fraud_payment: FraudPayment):
+    """Velocity counters must never break the payment flow."""
+    try:
+        func(fraud_payment)
+    except Exception as e:
+        logging.warning("Fraud velocity: %s failed for FraudPayment[%s] due to exception %s", func.__name__, fraud_payment.pk, str(e))
@@ -1,3 +1,5 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import RegexValidator
 from django.db import models
 
 
@@ -9,4 +11,124 @@ class FraudPayment(models.Model):
     sub_id = models.IntegerField(verbose_name="Subscription ID")
     trial = models.CharField(verbose_name="Trial type")
     error_code = models.CharField(verbose_name="Error code", null=True, blank=True)
+    card_bin = models.CharField(verbose_name="Card BIN", null=True, blank=True)
     datetime = models.DateTimeField(verbose_name="Date Created", auto_now_add=True)
+
+    class Meta:
+        # The table is partitioned by month on `datetime` (see migration 0005 and the `fraud_retention` command).
+        # Indexes match the fraud feature query: one key equality + `datetime` range, covering the counted columns.
+        indexes = [
+            models.Index(fields=["email", "datetime"], include=["fingerprint", "geo", "error_code"], name="fraud-payment--email-dt"),
+            models.Index(fields=["fingerprint", "datetime"], include=["email", "error_code"], name="fraud-payment--fp-dt"),
+            models.Index(fields=["ip", "datetime"], include=["email"], name="fraud-payment--ip-dt"),
+        ]
+
+
+class FraudVelocityBucket(models.Model):
+    """Time bucket of velocity counters of one fraud key (see `payment_checkout.fraud_detection.velocity`)."""
+    key = models.CharField(verbose_name="Key", max_length=300)
+    resolution = models.PositiveIntegerField(verbose_name="Bucket size in seconds")
+    bucket = models.BigIntegerField(verbose_name="Bucket number")
+    data = models.JSONField(verbose_name="Counters and sketches", default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["key", "resolution", "bucket"], name="fraud-velocity--key-resolution-bucket-unique-constraint"),
+        ]
+
+
+class BinRuleActions(models.TextChoices):
+    REJECT = 'reject', 'Reject'
+    FORCE_3DS = 'force_3ds', 'Force 3DS'
+    ALLOW = 'allow', 'Allow'
+
+
+class BinRule(models.Model):
+    """Card BIN rule used by the fraud checks of all payment systems (see `shared.bin_rules`). The longest matching prefix wins."""
+    prefix = models.CharField(verbose_name="BIN prefix", max_length=8, unique=True,
+                              validators=[RegexValidator(r"^\d{6,8}$", "BIN prefix must have 6 to 8 digits.")])
+    action = models.CharField(verbose_name="Action", max_length=10, choices=BinRuleActions.choices)
+    is_active = models.BooleanField(verbose_name="Is active?", default=True)
+    comment = models.CharField(verbose_name="Comment", max_length=200, default="", blank=True)
+    date_updated = models.DateTimeField(verbose_name="Datetime updated", auto_now=True)
+
+    def __str__(self):
+        return f"BinRule[{self.pk}] {self.prefix} {self.action}"
+
+
+class FraudRuleOutcomes(models.TextChoices):
+    REJECT = 'REJECT', 'Reject'
+    FORCE_3DS = 'FORCE_3DS', 'Force 3DS'
+
+
+class FraudRuleFeatures(models.TextChoices):
+    GEO = 'geo', 'GEO of the payment is in values'
+    BIN = 'bin', 'BIN rule action of the card is in values'
+    IP_GEO = 'ip_geo', 'GEO resolved from the IP is in values'
+    GEO_MISMATCH = 'geo_mismatch', 'GEO differs from the IP GEO, for the GEOs in values'
+    FINGERPRINTS_BY_EMAIL = 'fingerprints_by_email', 'Distinct fingerprints of the email'
+    GEOS_BY_EMAIL = 'geos_by_email', 'Distinct GEOs of the email'
+    ERRORS_BY_EMAIL = 'errors_by_email', 'Declines of the email'
+    ERRORS_20151_BY_EMAIL = 'errors_20151_by_email', '20151 declines of the email'
+    ERRORS_20051_BY_EMAIL = 'errors_20051_by_email', '20051 declines of the email'
+    HARD_ERRORS_BY_EMAIL = 'hard_errors_by_email', 'Hard declines of the email'
+    EMAILS_BY_FINGERPRINT = 'emails_by_fingerprint', 'Distinct emails of the fingerprint'
+    ERRORS_BY_FINGERPRINT = 'errors_by_fingerprint', 'Declines of the fingerprint'
+    ERRORS_20151_BY_FINGERPRINT = 'errors_20151_by_fingerprint', '20151 declines of the fingerprint'
+    HARD_ERRORS_BY_FINGERPRINT = 'hard_errors_by_fingerprint', 'Hard declines of the fingerprint'
+    EMAILS_BY_IP = 'emails_by_ip', 'Distinct emails of the IP'
+
+
+STATIC_FRAUD_FEATURES = (FraudRuleFeatures.GEO, FraudRuleFeatures.BIN, FraudRuleFeatures.IP_GEO, FraudRuleFeatures.GEO_MISMATCH)
+
+
+class FraudRuleWindows(models.TextChoices):
+    MINUTES_30 = '30m', '30 minutes'
+    HOURS_24 = '24h', '24 hours'
+    DAYS_7 = '7d', '7 days'
+    DAYS_30 = '30d', '30 days'
+
+
+class FraudRule(models.Model):
+    """Fraud check rule (see `payment_checkout.fraud_detection.engine`).
+
+    Static rules (`geo`, `bin`, `ip_geo`, `geo_mismatch`) match when the value of the feature is one of the
+    comma-separated `values`, `*` matches any known value. `geo_mismatch` is the declared GEO when the IP resolves
+    to another country.
+    Count rules match when the count of the feature over the window is greater than `threshold`.
+    Any matching reject rule wins over force 3DS rules, `priority` orders rules of the same outcome and cost.
+    """
+    feature = models.CharField(verbose_name="Feature", max_length=30, choices=FraudRuleFeatures.choices)
+    window = models.CharField(verbose_name="Window", max_length=3, choices=FraudRuleWindows.choices, default="", blank=True)
+    threshold = models.PositiveIntegerField(verbose_name="Threshold", null=True, blank=True)
+    values = models.TextField(verbose_name="Values", default="", blank=True)
+    outcome = models.CharField(verbose_name="Outcome", max_length=10, choices=FraudRuleOutcomes.choices)
+    message = models.CharField(verbose_name="Message", max_length=200)
+    priority = models.PositiveIntegerField(verbose_name="Priority", default=0)
+    is_active = models.BooleanField(verbose_name="Is active?", default=True)
+    date_updated = models.DateTimeField(verbose_name="Datetime updated", auto_now=True)
+
+    class Meta:
+        ordering = ("outcome", "priority", "pk")
+
+    def __str__(self):
+        return f"FraudRule[{self.pk}] {self.message}"
+
+    @property
+    def is_static(self) -> bool:
+        return self.feature in STATIC_FRAUD_FEATURES
+
+    def value_list(self) -> list[str]:
+        return [value.strip() for value in self.values.split(",") if value.strip()]
+
+    def clean(self):
+        if self.is_static:
+            if not self.value_list():
+                raise ValidationError({"values": "Static rules need values."})
+            if self.feature == FraudRuleFeatures.BIN and not set(self.value_list()) <= set(BinRuleActions.values):
+                raise ValidationError({"values": f"BIN rule values must be among {', '.join(BinRuleActions.values)}."})
+        else:
+            if not self.window:
+                raise ValidationError({"window": "Count rules need a window."})
+            if self.threshold is None:
+                raise ValidationError({"threshold": "Count rules need a threshold."})
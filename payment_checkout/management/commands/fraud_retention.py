@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from payment_checkout.fraud_detection.features import MAX_WINDOW
+from payment_checkout.fraud_detection.partitions import (
+    archive_default_partition, archive_partition, create_partition,
+    drop_partition, list_partitions, month_start, next_month)
+
+
+def get_archive_storage():
+    if settings.AWS_ACCESS_KEY_ID:
+        from custom.custom_storage import ArchiveStorage  # pylint: disable=import-outside-toplevel
+        return ArchiveStorage()
+    return FileSystemStorage(location=settings.BASE_DIR / "archive")
+
+
+class Command(BaseCommand):
+    help = "Creates upcoming monthly FraudPayment partitions, archives and drops partitions older than the longest fraud rule window"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months-ahead", type=int, default=2, help="Number of future monthly partitions to keep created")
+        parser.add_argument("--keep-days", type=int, default=MAX_WINDOW.days,
+                            help=f"Rows newer than this are kept (at least {MAX_WINDOW.days}, the longest rule window)")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("FraudPayment partitioning requires PostgreSQL")
+        if options["keep_days"] < MAX_WINDOW.days:
+            raise CommandError(f"--keep-days can not be shorter than the longest fraud rule window ({MAX_WINDOW.days} days)")
+        dry_run = options["dry_run"]
+        now = timezone.now()
+        partitions = list_partitions()
+
+        month = month_start(now)
+        for _ in range(options["months_ahead"] + 1):
+            if month not in partitions.values():
+                self.stdout.write(f"Creating partition for {month:%Y-%m}")
+                if not dry_run:
+                    create_partition(month)
+            month = next_month(month)
+
+        cutoff = now - timezone.timedelta(days=options["keep_days"])
+        storage = get_archive_storage()
+        for name, month in sorted(partitions.items(), key=lambda item: item[1]):
+            if next_month(month) > cutoff:
+                continue
+            self.stdout.write(f"Archiving and dropping {name}")
+            if not dry_run:
+                path = archive_partition(name, storage)
+                drop_partition(name)
+                self.stdout.write(f"Archived {name} to {path}")
+        if not dry_run:
+            path, deleted = archive_default_partition(cutoff, storage)
+            if deleted:
+                self.stdout.write(f"Archived {deleted} rows of the default partition to {path}")
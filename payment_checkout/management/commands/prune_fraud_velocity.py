@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payment_checkout.fraud_detection.velocity import get_backend
+
+
+class Command(BaseCommand):
+    help = "Drops fraud velocity buckets that fell out of all rule windows"
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if backend is None:
+            raise CommandError("FRAUD_VELOCITY_BACKEND is not configured")
+        backend.prune(time.time())
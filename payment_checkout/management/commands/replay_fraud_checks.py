@@ -0,0 +1,126 @@
+import json
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payment_checkout.fraud_detection import engine
+from payment_checkout.fraud_detection.features import extract_features
+from payment_checkout.fraud_models import FraudPayment
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+
+def load_baseline(path: str) -> dict[int, tuple[str, str | None]]:
+    baseline = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                decision = json.loads(line)
+                baseline[decision["pk"]] = (decision["result"], decision["message"])
+    return baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays FraudPayment rows through the fraud rule engine at the time of each attempt and reports the decision diff "
+        "against a baseline, checks/s and the cost of each rule, i.e. its share of the feature loading. Features are always read from FraudPayment (the velocity "
+        "counters only cover the present). Rows created before card BINs were stored are replayed without a BIN."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=timezone.datetime.fromisoformat, help="Start date (inclusive), e.g. 2024-01-31")
+        parser.add_argument("--until", type=timezone.datetime.fromisoformat, help="End date (exclusive)")
+        parser.add_argument("--baseline", help="Decisions file written by a previous run with --save")
+        parser.add_argument("--save", help="Write the decisions of this run to a file (JSON lines), to be used as a baseline")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--show-diffs", type=int, default=20, help="Number of changed decisions to print")
+
+    def handle(self, *args, **options):
+        queryset = FraudPayment.objects.all()
+        if options["since"]:
+            queryset = queryset.filter(datetime__gte=timezone.make_aware(options["since"]))
+        if options["until"]:
+            queryset = queryset.filter(datetime__lt=timezone.make_aware(options["until"]))
+        try:
+            baseline = load_baseline(options["baseline"]) if options["baseline"] else None
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Invalid baseline file: {e}") from e
+        output = open(options["save"], "w", encoding="utf-8") if options["save"] else None  # pylint: disable=consider-using-with
+
+        engine.invalidate_fraud_rules()
+        engine.get_plan()
+        engine.reset_rule_stats()
+        latencies: list[float] = []
+        results: Counter = Counter()
+        transitions: Counter = Counter()
+        missing = messages_changed = shown = 0
+        last_pk = 0
+        start = time.perf_counter()
+        try:
+            while True:
+                chunk = list(queryset.filter(pk__gt=last_pk).order_by("pk")[:options["chunk_size"]])
+                if not chunk:
+                    break
+                for fraud_payment in chunk:
+                    check_start = time.perf_counter()
+                    result, message = self.replay(fraud_payment)
+                    latencies.append(time.perf_counter() - check_start)
+                    results[result] += 1
+                    if output:
+                        output.write(json.dumps({"pk": fraud_payment.pk, "result": result, "message": message}) + "\n")
+                    if baseline is None:
+                        continue
+                    if fraud_payment.pk not in baseline:
+                        missing += 1
+                        continue
+                    old_result, old_message = baseline[fraud_payment.pk]
+                    if old_result != result:
+                        transitions[(old_result, result)] += 1
+                        if shown < options["show_diffs"]:
+                            self.stdout.write(f"FraudPayment[{fraud_payment.pk}] {fraud_payment.datetime:%Y-%m-%d %H:%M:%S}: "
+                                              f"{old_result} ({old_message}) -> {result} ({message})")
+                            shown += 1
+                    elif old_message != message:
+                        messages_changed += 1
+                last_pk = chunk[-1].pk
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"checks={len(latencies)} rate={len(latencies) / max(elapsed, 1e-9):.0f} checks/s last_pk={last_pk}")
+        finally:
+            if output:
+                output.close()
+        elapsed = time.perf_counter() - start
+        self.report(latencies, elapsed, results, baseline, transitions, missing, messages_changed)
+
+    @staticmethod
+    def replay(fraud_payment: FraudPayment) -> tuple[str, str | None]:
+        """Evaluate the attempt as it was checked: only earlier rows count and its own decline is not known yet."""
+        def load_features(features: list[str]) -> dict[str, int]:
+            return extract_features(fraud_payment.email, fraud_payment.fingerprint, fraud_payment.ip,
+                                    now=fraud_payment.datetime, features=features, pending_pk=fraud_payment.pk)
+
+        return engine.get_plan().evaluate(fraud_payment.ip, fraud_payment.geo, fraud_payment.card_bin, load_features)
+
+    def report(self, latencies, elapsed, results, baseline, transitions, missing, messages_changed):
+        total = len(latencies)
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {total} checks in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} checks/s), "
+            f"p50={percentile(latencies, 0.5) * 1000:.2f}ms p99={percentile(latencies, 0.99) * 1000:.2f}ms"
+        ))
+        self.stdout.write("Decisions: " + ", ".join(f"{result}={count}" for result, count in sorted(results.items())))
+        if baseline is not None:
+            changed = sum(transitions.values())
+            self.stdout.write(f"Diff against baseline: {changed} decisions changed, {messages_changed} messages changed, "
+                              f"{missing} rows not in the baseline")
+            for (old_result, result), count in transitions.most_common():
+                self.stdout.write(f"  {old_result} -> {result}: {count}")
+        self.stdout.write(f"Per rule cost, feature load included (p99 over the latest {engine.LATENCY_SAMPLES} evaluations):")
+        for stats in engine.rule_stats():
+            if not stats["evaluations"]:
+                continue
+            self.stdout.write(f"  {stats['rule']}: evaluations={stats['evaluations']} hits={stats['hits']} "
+                              f"avg={stats['avg_ms']:.4f}ms p99={stats['p99_ms']:.4f}ms")
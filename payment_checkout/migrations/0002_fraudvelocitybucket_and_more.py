@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment_checkout', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FraudVelocityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=300, verbose_name='Key')),
+                ('resolution', models.PositiveIntegerField(verbose_name='Bucket size in seconds')),
+                ('bucket', models.BigIntegerField(verbose_name='Bucket number')),
+                ('data', models.JSONField(default=dict, verbose_name='Counters and sketches')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='fraudvelocitybucket',
+            constraint=models.UniqueConstraint(fields=('key', 'resolution', 'bucket'), name='fraud-velocity--key-resolution-bucket-unique-constraint'),
+        ),
+    ]
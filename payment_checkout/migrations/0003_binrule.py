@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:06
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment_checkout', '0002_fraudvelocitybucket_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BinRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=8, unique=True, validators=[django.core.validators.RegexValidator('^\\d{6,8}$', 'BIN prefix must have 6 to 8 digits.')], verbose_name='BIN prefix')),
+                ('action', models.CharField(choices=[('reject', 'Reject'), ('force_3ds', 'Force 3DS'), ('allow', 'Allow')], max_length=10, verbose_name='Action')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Is active?')),
+                ('comment', models.CharField(blank=True, default='', max_length=200, verbose_name='Comment')),
+                ('date_updated', models.DateTimeField(auto_now=True, verbose_name='Datetime updated')),
+            ],
+        ),
+    ]
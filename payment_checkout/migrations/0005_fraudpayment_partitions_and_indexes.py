@@ -0,0 +1,120 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:08
+
+from datetime import timedelta
+
+from django.db import migrations, models, transaction
+from django.db.migrations.exceptions import IrreversibleError
+from django.utils import timezone
+
+# Recreate the table partitioned by month on "datetime". The primary key of a partitioned table must contain the
+# partition key, so it becomes (id, datetime); ids stay unique through the sequence.
+#
+# The swap runs in one short transaction under LOCK_TIMEOUT (the migration fails instead of queueing behind
+# long transactions, and can be run again): the table is renamed, the partitioned table and its indexes are
+# created empty, and the rows of the last RECENT_DAYS days are moved, so that the error codes set on recent payment
+# attempts reach the new table. Older rows are then moved in batches of BATCH_SIZE, each in its own transaction,
+# while payments are written to the new table; until then the windowed fraud features may undercount. An
+# interrupted run resumes moving the remaining rows. The migration cannot be reversed.
+LOCK_TIMEOUT = "5s"
+RECENT_DAYS = 1
+BATCH_SIZE = 10000
+
+INDEXES = [
+    models.Index(fields=['email', 'datetime'], include=('fingerprint', 'geo', 'error_code'), name='fraud-payment--email-dt'),
+    models.Index(fields=['fingerprint', 'datetime'], include=('email', 'error_code'), name='fraud-payment--fp-dt'),
+    models.Index(fields=['ip', 'datetime'], include=('email',), name='fraud-payment--ip-dt'),
+]
+
+COLUMNS = "id, email, ip, geo, fingerprint, sub_id, trial, error_code, datetime"
+SWAP_SQL = """
+ALTER TABLE payment_checkout_fraudpayment RENAME TO payment_checkout_fraudpayment_old;
+ALTER INDEX payment_checkout_fraudpayment_pkey RENAME TO payment_checkout_fraudpayment_old_pkey;
+ALTER SEQUENCE payment_checkout_fraudpayment_id_seq RENAME TO payment_checkout_fraudpayment_old_id_seq;
+CREATE SEQUENCE payment_checkout_fraudpayment_id_seq;
+SELECT setval('payment_checkout_fraudpayment_id_seq', COALESCE((SELECT MAX(id) FROM payment_checkout_fraudpayment_old), 0) + 1, false);
+CREATE TABLE payment_checkout_fraudpayment (
+    id bigint NOT NULL DEFAULT nextval('payment_checkout_fraudpayment_id_seq'),
+    email varchar NOT NULL,
+    ip varchar NOT NULL,
+    geo varchar NOT NULL,
+    fingerprint varchar NOT NULL,
+    sub_id integer NOT NULL,
+    trial varchar NOT NULL,
+    error_code varchar NULL,
+    datetime timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, datetime)
+) PARTITION BY RANGE (datetime);
+CREATE TABLE payment_checkout_fraudpayment_default PARTITION OF payment_checkout_fraudpayment DEFAULT;
+DO $$
+DECLARE
+    m timestamp := date_trunc('month', COALESCE((SELECT MIN(datetime) FROM payment_checkout_fraudpayment_old), now()) AT TIME ZONE 'UTC');
+BEGIN
+    WHILE m <= date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF payment_checkout_fraudpayment FOR VALUES FROM (%L) TO (%L)',
+            'payment_checkout_fraudpayment_p' || to_char(m, 'YYYY_MM'), m AT TIME ZONE 'UTC', (m + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        m := m + interval '1 month';
+    END LOOP;
+END $$;
+ALTER SEQUENCE payment_checkout_fraudpayment_id_seq OWNED BY payment_checkout_fraudpayment.id;
+"""
+MOVE_SQL = f"""
+WITH moved AS (
+    DELETE FROM payment_checkout_fraudpayment_old WHERE id IN (
+        SELECT id FROM payment_checkout_fraudpayment_old WHERE datetime >= %s ORDER BY id DESC LIMIT %s
+    ) RETURNING {COLUMNS}
+)
+INSERT INTO payment_checkout_fraudpayment ({COLUMNS}) SELECT {COLUMNS} FROM moved
+"""
+
+
+def move_rows(cursor, since, limit: int | None) -> int:
+    cursor.execute(MOVE_SQL, [since, limit])
+    return cursor.rowcount
+
+
+def partition_fraud_payments(apps, schema_editor):
+    FraudPayment = apps.get_model('payment_checkout', 'FraudPayment')
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        for index in INDEXES:
+            schema_editor.add_index(FraudPayment, index)
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('payment_checkout_fraudpayment_old') IS NOT NULL, "
+                       "EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'payment_checkout_fraudpayment'::regclass)")
+        interrupted, partitioned = cursor.fetchone()
+        if partitioned and not interrupted:
+            return
+        if not partitioned:
+            with transaction.atomic(using=connection.alias):
+                cursor.execute("SET LOCAL lock_timeout = %s", [LOCK_TIMEOUT])
+                cursor.execute(SWAP_SQL)  # no params, so the % placeholders of format() are kept
+                for index in INDEXES:
+                    schema_editor.add_index(FraudPayment, index)
+                move_rows(cursor, timezone.now() - timedelta(days=RECENT_DAYS), None)
+        while True:
+            with transaction.atomic(using=connection.alias):
+                if not move_rows(cursor, "-infinity", BATCH_SIZE):
+                    break
+        cursor.execute("DROP TABLE payment_checkout_fraudpayment_old")
+
+
+def unpartition_fraud_payments(apps, schema_editor):
+    raise IrreversibleError("The partitioned FraudPayment table cannot be converted back, restore a backup instead")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('payment_checkout', '0004_seed_bin_rules'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(partition_fraud_payments, unpartition_fraud_payments, atomic=False)],
+            state_operations=[migrations.AddIndex(model_name='fraudpayment', index=index) for index in INDEXES],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment_checkout', '0005_fraudpayment_partitions_and_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FraudRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature', models.CharField(choices=[('geo', 'GEO of the payment is in values'), ('bin', 'BIN rule action of the card is in values'), ('fingerprints_by_email', 'Distinct fingerprints of the email'), ('geos_by_email', 'Distinct GEOs of the email'), ('errors_by_email', 'Declines of the email'), ('errors_20151_by_email', '20151 declines of the email'), ('errors_20051_by_email', '20051 declines of the email'), ('hard_errors_by_email', 'Hard declines of the email'), ('emails_by_fingerprint', 'Distinct emails of the fingerprint'), ('errors_by_fingerprint', 'Declines of the fingerprint'), ('errors_20151_by_fingerprint', '20151 declines of the fingerprint'), ('hard_errors_by_fingerprint', 'Hard declines of the fingerprint'), ('emails_by_ip', 'Distinct emails of the IP')], max_length=30, verbose_name='Feature')),
+                ('window', models.CharField(blank=True, choices=[('30m', '30 minutes'), ('24h', '24 hours'), ('7d', '7 days'), ('30d', '30 days')], default='', max_length=3, verbose_name='Window')),
+                ('threshold', models.PositiveIntegerField(blank=True, null=True, verbose_name='Threshold')),
+                ('values', models.TextField(blank=True, default='', verbose_name='Values')),
+                ('outcome', models.CharField(choices=[('REJECT', 'Reject'), ('FORCE_3DS', 'Force 3DS')], max_length=10, verbose_name='Outcome')),
+                ('message', models.CharField(max_length=200, verbose_name='Message')),
+                ('priority', models.PositiveIntegerField(default=0, verbose_name='Priority')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Is active?')),
+                ('date_updated', models.DateTimeField(auto_now=True, verbose_name='Datetime updated')),
+            ],
+            options={
+                'ordering': ('outcome', 'priority', 'pk'),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment_checkout', '0007_seed_fraud_rules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fraudpayment',
+            name='card_bin',
+            field=models.CharField(blank=True, null=True, verbose_name='Card BIN'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment_checkout', '0008_fraudpayment_card_bin'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='fraudrule',
+            name='feature',
+            field=models.CharField(choices=[('geo', 'GEO of the payment is in values'), ('bin', 'BIN rule action of the card is in values'), ('ip_geo', 'GEO resolved from the IP is in values'), ('geo_mismatch', 'GEO differs from the IP GEO, for the GEOs in values'), ('fingerprints_by_email', 'Distinct fingerprints of the email'), ('geos_by_email', 'Distinct GEOs of the email'), ('errors_by_email', 'Declines of the email'), ('errors_20151_by_email', '20151 declines of the email'), ('errors_20051_by_email', '20051 declines of the email'), ('hard_errors_by_email', 'Hard declines of the email'), ('emails_by_fingerprint', 'Distinct emails of the fingerprint'), ('errors_by_fingerprint', 'Declines of the fingerprint'), ('errors_20151_by_fingerprint', '20151 declines of the fingerprint'), ('hard_errors_by_fingerprint', 'Hard declines of the fingerprint'), ('emails_by_ip', 'Distinct emails of the IP')], max_length=30, verbose_name='Feature'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from payment_checkout.fraud_detection.engine import invalidate_fraud_rules
+from payment_checkout.fraud_detection.velocity import (record_error,
+                                                       record_payment,
+                                                       safe_record)
+from payment_checkout.fraud_models import BinRule, FraudPayment, FraudRule
+from shared.bin_rules import invalidate_bin_rules
+
+
+@receiver(post_init, sender=FraudPayment)
+def fraud_payment_loaded(sender, instance: FraudPayment, **kwargs):
+    instance._recorded_error_code = instance.error_code  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=FraudPayment)
+def fraud_payment_saved(sender, instance: FraudPayment, created: bool, **kwargs):
+    if created:
+        safe_record(record_payment, instance)
+    if instance.error_code is not None and instance.error_code != instance._recorded_error_code:  # pylint: disable=protected-access
+        safe_record(record_error, instance)
+        instance._recorded_error_code = instance.error_code  # pylint: disable=protected-access
+
+
+@receiver([post_save, post_delete], sender=BinRule)
+def bin_rule_changed(sender, **kwargs):
+    invalidate_bin_rules()
+
+
+@receiver([post_save, post_delete], sender=FraudRule)
+def fraud_rule_changed(sender, **kwargs):
+    invalidate_fraud_rules()
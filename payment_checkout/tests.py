@@ -1,3 +1,169 @@
-from django.test import TestCase
+import random
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from payment_checkout.fraud_detection import engine
+from payment_checkout.fraud_detection.defaults import (FORCE_3DS_GEO,
+                                                       FORCE_3DS_RULES,
+                                                       REJECT_GEO,
+                                                       REJECT_RULES,
+                                                       default_rules)
+from payment_checkout.fraud_models import (BinRuleActions, FraudRule,
+                                           FraudRuleOutcomes)
+
+REJECT_BIN_MESSAGE = "JobEscape is not supported by your bank"
+
+
+def legacy_check(geo: str, bin_action: str | None, features: dict[str, int]) -> tuple[str, str | None]:
+    """Decision of the hard-coded checks replaced by the rule engine (`rejects` and `force_3ds`, in the order of `main.check`)."""
+    f = features
+    if geo in REJECT_GEO:
+        return "REJECT", "JobEscape is not supported in your country"
+    rejects = (
+        (f["fingerprints_by_email_24h"] > 7, "Suspected Fraud 1"),
+        (f["fingerprints_by_email_30m"] > 5, "Suspected Fraud 2"),
+        (f["hard_errors_by_email_7d"] > 3, "Suspected Fraud 4"),
+        (f["errors_by_email_7d"] > 15, "Suspected Fraud 5"),
+        (f["emails_by_fingerprint_24h"] > 6, "Suspected Fraud 3"),
+        (f["errors_by_fingerprint_30m"] > 6, "Suspected Fraud 6"),
+        (bin_action == BinRuleActions.REJECT, REJECT_BIN_MESSAGE),
+    )
+    forces = (
+        (geo in FORCE_3DS_GEO, "Forced 3DS 1"),
+        (bin_action == BinRuleActions.FORCE_3DS, "Forced 3DS 2"),
+        (f["fingerprints_by_email_30m"] > 3, "Forced 3DS 5"),
+        (f["fingerprints_by_email_24h"] > 4, "Forced 3DS 6"),
+        (f["fingerprints_by_email_7d"] > 6, "Forced 3DS 7"),
+        (f["emails_by_fingerprint_24h"] > 3, "Forced 3DS 3"),
+        (f["emails_by_fingerprint_7d"] > 6, "Forced 3DS 4"),
+        (f["errors_20151_by_fingerprint_24h"] > 2, "Forced 3DS 16"),
+        (f["hard_errors_by_fingerprint_30d"] > 0, "Forced 3DS 17"),
+        (f["errors_20151_by_email_24h"] > 2, "Forced 3DS 12"),
+        (f["errors_20051_by_email_24h"] > 3, "Forced 3DS 13"),
+        (f["hard_errors_by_email_30d"] > 0, "Forced 3DS 14"),
+        (f["errors_by_email_24h"] > 5, "Forced 3DS 15"),
+        (f["emails_by_ip_30m"] > 4, "Forced 3DS 8"),
+        (f["emails_by_ip_24h"] > 6, "Forced 3DS 9"),
+        (f["emails_by_ip_7d"] > 11, "Forced 3DS 10"),
+        (f["geos_by_email_30m"] > 3, "Forced 3DS 11"),
+    )
+    for outcome, checks in (("REJECT", rejects), ("FORCE_3DS", forces)):
+        for matched, message in checks:
+            if matched:
+                return outcome, message
+    return "OK", None
+
+
+def feature_values() -> dict[str, list[int]]:
+    """Values around every threshold of each count feature."""
+    values: dict[str, set[int]] = {}
+    for feature, window, threshold, _ in REJECT_RULES + FORCE_3DS_RULES:
+        values.setdefault(f"{feature}_{window}", {0}).update((threshold, threshold + 1))
+    return {feature: sorted(feature_set) for feature, feature_set in values.items()}
+
+
+def feature_cases(count: int = 1000) -> list[dict[str, int]]:
+    values = feature_values()
+    rng = random.Random(0)
+    cases = [dict.fromkeys(values, 0)]
+    for feature, feature_set in values.items():  # each feature alone
+        for value in feature_set:
+            cases.append({**dict.fromkeys(values, 0), feature: value})
+    for _ in range(count):  # combinations, mostly below the thresholds so that the later rules are reached
+        cases.append({feature: rng.choice(feature_set) if rng.random() < 0.2 else 0 for feature, feature_set in values.items()})
+    return cases
+
+
+GEOS = ("US", "RU", "NG", "YE", "SV", "CR", "", None)
+BIN_ACTIONS = (None, BinRuleActions.REJECT, BinRuleActions.FORCE_3DS, BinRuleActions.ALLOW)
+
+
+class DecisionEquivalenceMixin:
+    def get_plan(self) -> engine.Plan:
+        raise NotImplementedError
+
+    def assert_same_decisions(self):
+        plan = self.get_plan()
+        for features in feature_cases():
+            for geo in GEOS:
+                for bin_action in BIN_ACTIONS:
+                    bin_match = SimpleNamespace(action=bin_action) if bin_action else None
+                    with mock.patch.object(engine, "lookup_bin", return_value=bin_match):
+                        result = plan.evaluate("10.0.0.1", geo, "424242", lambda names, f=features: {name: f[name] for name in names})
+                    expected = legacy_check(geo, bin_action, features)
+                    if bin_action == BinRuleActions.REJECT and geo not in REJECT_GEO:
+                        expected = ("REJECT", REJECT_BIN_MESSAGE)  # the BIN reject now runs before the count rejects
+                    self.assertEqual(result, expected, (geo, bin_action, features))
+
+
+class DefaultRulesTest(DecisionEquivalenceMixin, SimpleTestCase):
+    def get_plan(self) -> engine.Plan:
+        return engine.Plan(default_rules())
+
+    def test_same_decisions_as_legacy_checks(self):
+        self.assert_same_decisions()
+
+    def test_rule_cost_includes_feature_load(self):
+        engine.reset_rule_stats()
+        plan = self.get_plan()
+        features = dict.fromkeys(feature_values(), 0)
+        clock = [0.0]
+
+        def load_features(names: list[str]) -> dict[str, int]:
+            clock[0] += 0.64
+            return {name: features[name] for name in names}
+
+        with mock.patch.object(engine, "lookup_bin", return_value=None), \
+                mock.patch.object(engine.time, "perf_counter", lambda: clock[0]):
+            plan.evaluate("10.0.0.1", "US", "424242", load_features)
+        stats = {row["rule"]: row for row in engine.rule_stats()}
+        share = 0.64 / len(features) * 1000
+        self.assertAlmostEqual(stats["default:Suspected Fraud 1"]["avg_ms"], share)
+        self.assertAlmostEqual(stats["default:Forced 3DS 11"]["avg_ms"], share)
+        self.assertEqual(stats["default:Forced 3DS 1"]["avg_ms"], 0)
+        self.assertNotIn("features", stats)
+
+
+class SeededRulesTest(DecisionEquivalenceMixin, TestCase):
+    def get_plan(self) -> engine.Plan:
+        return engine.Plan(list(FraudRule.objects.filter(is_active=True)))
+
+    def test_same_decisions_as_legacy_checks(self):
+        self.assert_same_decisions()
+
+
+@override_settings(FRAUD_RULES_TTL=30)
+class PlanLoadingTest(TestCase):
+    def setUp(self):
+        engine._plan, engine._version, engine._checked_at = None, None, None
+
+    def tearDown(self):
+        engine._plan, engine._version, engine._checked_at = None, None, None
+
+    def evaluate(self, geo: str) -> tuple[str, str | None]:
+        with mock.patch.object(engine, "lookup_bin", return_value=None):
+            return engine.get_plan().evaluate("10.0.0.1", geo, None, lambda names: dict.fromkeys(names, 0))
+
+    def test_cold_start_failure_uses_default_rules_and_retries(self):
+        with mock.patch.object(engine, "get_version", side_effect=DatabaseError("down")), \
+                self.assertLogs(level="ERROR"):
+            self.assertEqual(self.evaluate("RU")[0], FraudRuleOutcomes.REJECT)
+        self.assertIsNone(engine._checked_at)
+        FraudRule.objects.filter(message="Forced 3DS 1").update(values="US")
+        self.assertEqual(self.evaluate("US")[0], FraudRuleOutcomes.FORCE_3DS)
+
+    def test_reload_failure_keeps_loaded_rules(self):
+        FraudRule.objects.filter(message="Forced 3DS 1").update(values="US")
+        self.assertEqual(self.evaluate("US")[0], FraudRuleOutcomes.FORCE_3DS)
+        engine.invalidate_fraud_rules()
+        with mock.patch.object(engine, "get_version", side_effect=DatabaseError("down")), \
+                self.assertLogs(level="ERROR"):
+            self.assertEqual(self.evaluate("US")[0], FraudRuleOutcomes.FORCE_3DS)
+
+    def test_no_active_rules_uses_default_rules(self):
+        FraudRule.objects.update(is_active=False)
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(self.evaluate("RU")[0], FraudRuleOutcomes.REJECT)
@@ -1,7 +1,6 @@
 import logging
 from typing import Any
 
-import requests
 from checkout_sdk.exception import (CheckoutApiException,
                                     CheckoutAuthorizationException)
 from checkout_sdk.workflows.workflows import (CreateWorkflowRequest,
@@ -12,6 +11,7 @@ from django.conf import settings
 from django.utils import timezone
 
 from payment_checkout.api import API as CheckoutAPI
+from shared.http_client import get_session
 from shared.relativedelta_tools import next_friday_as_datetime
 from subscription.models import Currency
 
@@ -54,7 +54,7 @@ def apple_pay_verification(appleUrl: str, domainName: str):
     }
     cert_file_path = "files/apple_pay/certificate_sandbox.pem"
     key_file_path = "files/apple_pay/certificate_sandbox.key"
-    return requests.post(appleUrl, json=data, cert=(cert_file_path, key_file_path))
+    return get_session("apple_pay").post(appleUrl, json=data, cert=(cert_file_path, key_file_path), timeout=settings.REQUESTS_TIMEOUT)
 
 
 # Deprecated!
@@ -14,6 +14,7 @@ from solidgate import ApiClient
 
 from account.models import CustomUser, GatewayChoices
 from payment_solidgate.models import SolidgateUserSubscription
+from shared.http_client import get_session
 from subscription.base_api import BaseAPI
 from subscription.models import SubStatusChoices, UserSubscription
 
@@ -106,7 +107,7 @@ class API(BaseAPI):
         }
         urn = "https://subscriptions.solidgate.com/api/v1"
         try:
-            return requests.post(urn + uri, headers=headers, timeout=settings.REQUESTS_TIMEOUT, json=data)
+            return get_session("solidgate").post(urn + uri, headers=headers, timeout=settings.REQUESTS_TIMEOUT, json=data)
         except (TimeoutError, requests.Timeout):
             return Response(status=status.HTTP_504_GATEWAY_TIMEOUT)
 
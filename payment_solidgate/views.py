@@ -6,7 +6,6 @@ import json
 import logging
 import uuid
 
-import requests
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
@@ -40,6 +39,9 @@ from payment_solidgate.utils import (COUNTRY_CODES_MAPPING,
                                      get_product_id_from_trial_type,
                                      get_solidgate_subscription_from_sg_sub_id,
                                      map_subscription_id)
+from payment_checkout.fraud_models import BinRuleActions
+from shared.bin_rules import lookup_bin
+from shared.http_client import get_session
 from shared.payments import post_purchase
 from subscription.models import SubStatusChoices, UserSubscription
 from subscription.utils import get_expires_from_subscription
@@ -146,7 +148,7 @@ class SolidgateViewSet(viewsets.GenericViewSet):
                    'Accept': 'application/json',
                    'Merchant': settings.SOLIDGATE_API_KEY,
                    'Signature': signature}
-        res = requests.post("https://gate.solidgate.com/api/v1/init-payment", headers=headers, json=init_data, timeout=5)
+        res = get_session("solidgate").post("https://gate.solidgate.com/api/v1/init-payment", headers=headers, json=init_data, timeout=5)
         res_data = res.json()
         logging.info("SOLIDGATE: %s", str(res_data))
         if res_data.get("error"):
@@ -168,7 +170,7 @@ class SolidgateViewSet(viewsets.GenericViewSet):
                    'Accept': 'application/json',
                    'Merchant': settings.SOLIDGATE_API_KEY,
                    'Signature': signature}
-        res = requests.post("https://gate.solidgate.com/api/v1/status", headers=headers, json={"order_id": ser.data['order_id']}, timeout=5)
+        res = get_session("solidgate").post("https://gate.solidgate.com/api/v1/status", headers=headers, json={"order_id": ser.data['order_id']}, timeout=5)
         data = res.json()
         if res.status_code != status.HTTP_200_OK:
             logging.warning("Solidgate responded with an invalid code on status. Data=%s",
@@ -313,6 +315,9 @@ class SolidgateWebhookViewSet(viewsets.GenericViewSet):
         card_country = card_data.get("country", None)
         if card_country is not None:
             card_country = COUNTRY_CODES_MAPPING.get(card_country, "NN")
+        bin_match = lookup_bin(card_data.get("bin", None))
+        if bin_match and bin_match.action == BinRuleActions.REJECT and order_status == "settled":
+            logging.warning("Solidgate: order_updated: Order %s was paid with BIN matching reject rule %s", order_data['order_id'], bin_match.prefix)
         publishPayment(settings.PUBSUB_PM_TOPIC_ID, {
             "order_id": order_data['order_id'],
             "status": order_status,
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SeoBlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'seo_blog'
+
+    def ready(self):
+        from seo_blog import signals  # noqa: F401 pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from seo_blog.snapshots import publish_blog_snapshots
+
+
+class Command(BaseCommand):
+    help = "Publishes the blog JSON snapshots to S3, e.g. after a deploy that changed the serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Upload all snapshots, not only the changed ones")
+
+    def handle(self, *args, **options):
+        if not settings.BLOG_SNAPSHOTS_ENABLED:
+            raise CommandError("BLOG_SNAPSHOTS_ENABLED is off or AWS storage is not configured")
+        result = publish_blog_snapshots(force=options["force"])
+        self.stdout.write(f"Uploaded {len(result['uploaded'])} and deleted {len(result['deleted'])} snapshots")
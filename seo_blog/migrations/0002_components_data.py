@@ -0,0 +1,56 @@
+# Generated by Django 4.2.4 on 2026-10-19 17:52
+
+from django.db import migrations, models
+
+# Component model -> fields of its serializer in seo_blog.serializers after `id` and `order`
+COMPONENT_FIELDS = {
+    'ImageComponent': ['image'],
+    'VideoComponent': ['video'],
+    'TextComponent': ['content'],
+    'ButtonComponent': ['text', 'url'],
+}
+FILE_FIELDS = {'image', 'video'}
+
+
+def fill_components_data(apps, schema_editor):
+    """Serialize the components of every blog into `Blog.components_data`, as seo_blog.signals.refresh_components does,
+    from the base table, its polymorphic content type and the child tables."""
+    Blog = apps.get_model('seo_blog', 'Blog')
+    BlogComponent = apps.get_model('seo_blog', 'BlogComponent')
+    children = {}
+    for model_name, fields in COMPONENT_FIELDS.items():
+        model = apps.get_model('seo_blog', model_name)
+        children[model_name.lower()] = (model, fields, {row['pk']: row for row in model.objects.values('pk', *fields)})
+
+    components = {}
+    rows = BlogComponent.objects.order_by('order', 'pk').values('pk', 'question_id', 'order', 'polymorphic_ctype__model')
+    for row in rows:
+        if row['polymorphic_ctype__model'] not in children:
+            continue
+        model, fields, values = children[row['polymorphic_ctype__model']]
+        data = {'id': row['pk'], 'order': row['order']}
+        for field in fields:
+            value = values[row['pk']][field]
+            if field in FILE_FIELDS:
+                value = model._meta.get_field(field).storage.url(value) if value else None
+            data[field] = value
+        data['component_type'] = model._meta.object_name
+        components.setdefault(row['question_id'], []).append(data)
+    for pk, data in components.items():
+        Blog.objects.filter(pk=pk).update(components_data=data)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seo_blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='components_data',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Serialized components'),
+        ),
+        migrations.RunPython(fill_components_data, migrations.RunPython.noop),
+    ]
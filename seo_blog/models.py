@@ -26,6 +26,8 @@ class Blog(models.Model):
     keywords = models.CharField(verbose_name="Keywords", max_length=1000, null=True, blank=True)
     duration = models.IntegerField(default=5, verbose_name="Reading duration")
     image = models.ImageField(verbose_name="Image", upload_to='blog/images/', max_length=100, null=True, blank=True)
+    # Serialized components in order, kept in sync by seo_blog.signals so reads do not query the polymorphic tables
+    components_data = models.JSONField(verbose_name="Serialized components", default=list, blank=True, editable=False)
 
     class Meta:
         ordering = ['order']
@@ -1,4 +1,5 @@
 
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_polymorphic.serializers import PolymorphicSerializer
 
@@ -46,13 +47,18 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+@extend_schema_field(BlogComponentSerializer(many=True))
+class BlogComponentsField(serializers.JSONField):
+    """Components as serialized into `Blog.components_data`."""
+
+
 class BlogSerializer(serializers.ModelSerializer):
     category = BlogCategorySerializer(many=True, read_only=True)
-    components = BlogComponentSerializer(many=True, read_only=True)
+    components = BlogComponentsField(source='components_data', read_only=True)
 
     class Meta:
         model = Blog
-        fields = '__all__'
+        exclude = ['components_data']
 
 
 class BlogListSerializer(serializers.ModelSerializer):
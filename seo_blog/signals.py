@@ -0,0 +1,48 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from seo_blog.models import (Blog, BlogCategory, BlogComponent,
+                             ButtonComponent, ImageComponent, TextComponent,
+                             VideoComponent)
+from seo_blog.serializers import BlogComponentSerializer
+from seo_blog.snapshots import schedule_publish
+
+
+def refresh_components(blog_id):
+    """Serialize the components of the blog into `Blog.components_data`."""
+    components = BlogComponent.objects.filter(question_id=blog_id)
+    Blog.objects.filter(pk=blog_id).update(components_data=BlogComponentSerializer(components, many=True).data)
+
+
+# Signals of the polymorphic components are sent with the concrete class as sender
+@receiver(pre_save, sender=BlogComponent)
+@receiver(pre_save, sender=ImageComponent)
+@receiver(pre_save, sender=VideoComponent)
+@receiver(pre_save, sender=TextComponent)
+@receiver(pre_save, sender=ButtonComponent)
+def blog_component_saving(sender, instance: BlogComponent, **kwargs):
+    # A component moved to another blog must also be removed from the previous one
+    instance.previous_blog_id = None
+    if instance.pk:
+        instance.previous_blog_id = BlogComponent._base_manager.filter(pk=instance.pk).values_list("question_id", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=BlogComponent)
+@receiver([post_save, post_delete], sender=ImageComponent)
+@receiver([post_save, post_delete], sender=VideoComponent)
+@receiver([post_save, post_delete], sender=TextComponent)
+@receiver([post_save, post_delete], sender=ButtonComponent)
+def blog_component_changed(sender, instance: BlogComponent, **kwargs):
+    refresh_components(instance.question_id)
+    previous_blog_id = getattr(instance, "previous_blog_id", None)
+    if previous_blog_id not in (None, instance.question_id):
+        refresh_components(previous_blog_id)
+    schedule_publish()
+
+
+@receiver([post_save, post_delete], sender=Blog)
+@receiver([post_save, post_delete], sender=BlogCategory)
+@receiver(m2m_changed, sender=Blog.category.through)
+def blog_changed(sender, **kwargs):
+    schedule_publish()
@@ -0,0 +1,112 @@
+"""Static JSON snapshots of the blog, published to S3 (`BlogSnapshotStorage`) and served by CloudFront.
+
+The files have the bodies of the blog endpoints, so the landing can read them without calling the service:
+
+- index.json: all blogs, as `blog/`
+- categories.json: all categories, as `blog/category/`
+- categories/<category id>.json: the blogs of a category
+- posts/<link_name>.json: one blog with its components, as `blog/<link_name>/`
+
+manifest.json keeps the md5 of every published file. A publish uploads only the files whose content changed,
+deletes the files of renamed and deleted blogs, and invalidates the changed paths in CloudFront when
+`settings.AWS_CLOUDFRONT_DISTRIBUTION_ID` is set (otherwise they expire after `settings.BLOG_SNAPSHOTS_MAX_AGE`).
+"""
+import hashlib
+import json
+import logging
+import time
+from urllib.parse import quote
+
+import boto3
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from .models import Blog, BlogCategory
+from .serializers import (BlogCategorySerializer, BlogListSerializer,
+                          BlogSerializer)
+
+MANIFEST = "manifest.json"
+
+
+def get_storage():
+    from custom.custom_storage import \
+        BlogSnapshotStorage  # pylint: disable=import-outside-toplevel
+    return BlogSnapshotStorage()
+
+
+def render_snapshots() -> dict[str, bytes]:
+    """Return {file name: JSON body} of all snapshots."""
+    renderer = JSONRenderer()
+    blogs = list(Blog.objects.prefetch_related('category'))
+    files = {
+        "index.json": renderer.render(BlogListSerializer(blogs, many=True).data),
+        "categories.json": renderer.render(BlogCategorySerializer(BlogCategory.objects.all(), many=True).data),
+    }
+    for category in BlogCategory.objects.all():
+        category_blogs = [blog for blog in blogs if category in blog.category.all()]
+        files[f"categories/{category.pk}.json"] = renderer.render(BlogListSerializer(category_blogs, many=True).data)
+    for blog in blogs:
+        if blog.link_name and "/" not in blog.link_name:
+            files[f"posts/{blog.link_name}.json"] = renderer.render(BlogSerializer(blog).data)
+    return files
+
+
+def read_manifest(storage) -> dict[str, str]:
+    try:
+        with storage.open(MANIFEST) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning("Blog snapshots: failed to read the manifest due to exception %s, publishing all files", str(e))
+        return {}
+
+
+def invalidate_cdn(names: list[str]):
+    if not settings.AWS_CLOUDFRONT_DISTRIBUTION_ID or not names:
+        return
+    paths = [f"/{settings.BLOGFILES_LOCATION}/{quote(name)}" for name in names]
+    client = boto3.client("cloudfront", aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                          aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY)
+    client.create_invalidation(
+        DistributionId=settings.AWS_CLOUDFRONT_DISTRIBUTION_ID,
+        InvalidationBatch={"Paths": {"Quantity": len(paths), "Items": paths}, "CallerReference": f"blog-{time.time_ns()}"},
+    )
+
+
+def publish_blog_snapshots(force: bool = False) -> dict[str, list[str]]:
+    """Upload the changed snapshots (all of them with `force`) and delete the stale ones."""
+    storage = get_storage()
+    files = render_snapshots()
+    hashes = {name: hashlib.md5(body).hexdigest() for name, body in files.items()}
+    published = read_manifest(storage)
+
+    uploaded = [name for name, digest in hashes.items() if force or published.get(name) != digest]
+    deleted = [name for name in published if name not in files]
+    for name in uploaded:
+        storage.save(name, ContentFile(files[name]))
+    for name in deleted:
+        storage.delete(name)
+    if uploaded or deleted:
+        storage.save(MANIFEST, ContentFile(json.dumps(hashes).encode()))
+        invalidate_cdn(uploaded + deleted)
+    logging.info("Blog snapshots: uploaded=%d deleted=%d unchanged=%d", len(uploaded), len(deleted), len(files) - len(uploaded))
+    return {"uploaded": uploaded, "deleted": deleted}
+
+
+def publish_on_commit():
+    try:
+        publish_blog_snapshots()
+    except Exception as e:
+        logging.error("Blog snapshots: failed to publish due to exception %s", str(e))
+
+
+def schedule_publish():
+    """Publish once the current transaction commits, once however many blog objects it changed."""
+    if not settings.BLOG_SNAPSHOTS_ENABLED:
+        return
+    connection = transaction.get_connection()
+    if not any(func is publish_on_commit for _, func, *_ in connection.run_on_commit):
+        transaction.on_commit(publish_on_commit)
@@ -1,11 +1,18 @@
+from django.conf import settings
 from rest_framework import mixins, viewsets
 
+from custom.custom_viewsets import CachedResponseMixin, ReplicaReadMixin
+from shared.cache import TieredCache
+
 from .models import Blog, BlogCategory
 from .serializers import (BlogCategorySerializer, BlogEmptySerializer,
                           BlogListSerializer, BlogSerializer)
 
+blog_cache = TieredCache("blog", ttl=settings.CONTENT_CACHE_TTL,
+                         models=["seo_blog.Blog", "seo_blog.BlogComponent", "seo_blog.BlogCategory"])
+
 
-class BlogViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.RetrieveModelMixin):
+class BlogViewSet(CachedResponseMixin, ReplicaReadMixin, viewsets.GenericViewSet, mixins.ListModelMixin, mixins.RetrieveModelMixin):
     """
         The viewset for retrieving information related to Blogs.
     """
@@ -13,6 +20,7 @@ class BlogViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
     pagination_class = None
     queryset = Blog.objects.all().prefetch_related('category')
     lookup_field = 'link_name'
+    response_cache = blog_cache
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -22,10 +30,11 @@ class BlogViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.Retriev
         return BlogEmptySerializer
 
 
-class BlogCategoryViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
+class BlogCategoryViewSet(CachedResponseMixin, ReplicaReadMixin, viewsets.GenericViewSet, mixins.ListModelMixin):
     """
         The viewset for retrieving information related to BlogCaterogies.
     """
     serializer_class = BlogCategorySerializer
     pagination_class = None
     queryset = BlogCategory.objects.all()
+    response_cache = blog_cache
@@ -0,0 +1,107 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Max, Q
+
+from payment_checkout.fraud_models import BinRule, BinRuleActions
+
+ACTION = "action"
+BELOW = "below"
+
+
+class BinMatch:
+    """Result of a BIN lookup.
+
+    `exact` is `False` when no rule covers the BIN, but there are longer (8-digit) reject/force 3DS rules under it.
+    Such a BIN can not be confirmed with the 6 digits the gateway returns, so the flows should only force 3DS.
+    """
+    __slots__ = ("action", "prefix", "exact")
+
+    def __init__(self, action: str, prefix: str, exact: bool = True) -> None:
+        self.action = action
+        self.prefix = prefix
+        self.exact = exact
+
+
+class BinTrie:
+    """Digit trie of BIN rules. Lookups cost O(length of the BIN)."""
+
+    def __init__(self, rules: list[tuple[str, str]]) -> None:
+        self.root: dict = {}
+        for prefix, action in rules:
+            node = self.root
+            for digit in prefix:
+                node = node.setdefault(digit, {})
+            node[ACTION] = action
+        self._mark_below(self.root)
+
+    def _mark_below(self, node: dict) -> bool:
+        """Mark nodes that have blocking rules among their descendants. Returns whether the subtree has one."""
+        below = False
+        for key, child in node.items():
+            if key in (ACTION, BELOW):
+                continue
+            if self._mark_below(child) or child.get(ACTION) in (BinRuleActions.REJECT, BinRuleActions.FORCE_3DS):
+                below = True
+        if below:
+            node[BELOW] = True
+        return below
+
+    def lookup(self, card_bin: str) -> BinMatch | None:
+        node = self.root
+        match = None
+        for i, digit in enumerate(card_bin):
+            node = node.get(digit)
+            if node is None:
+                return match
+            if ACTION in node:
+                match = BinMatch(node[ACTION], card_bin[:i + 1])
+        if match is None and node.get(BELOW):
+            return BinMatch(BinRuleActions.FORCE_3DS, card_bin, exact=False)
+        return match
+
+
+_trie = BinTrie([])
+_version: tuple | None = None
+_checked_at: float | None = None
+_lock = threading.Lock()
+
+
+def get_version() -> tuple:
+    """Cheap version stamp of the rules table, changed by any saved, deleted or (de)activated rule."""
+    stats = BinRule.objects.aggregate(count=Count("id"), active=Count("id", filter=Q(is_active=True)), updated=Max("date_updated"))
+    return stats["count"], stats["active"], stats["updated"]
+
+
+def get_trie() -> BinTrie:
+    """Return the in-process trie. Every `settings.BIN_RULES_TTL` seconds the table version is checked and the trie is rebuilt if it changed."""
+    global _trie, _version, _checked_at
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at <= settings.BIN_RULES_TTL:
+        return _trie
+    with _lock:
+        if _checked_at is None or now - _checked_at > settings.BIN_RULES_TTL:
+            try:
+                version = get_version()
+                if version != _version:
+                    _trie = BinTrie(list(BinRule.objects.filter(is_active=True).values_list("prefix", "action")))
+                    _version = version
+            except DatabaseError as e:
+                logging.warning("BIN rules: failed to load rules from the database due to exception %s", str(e))
+            _checked_at = now
+    return _trie
+
+
+def lookup_bin(card_bin: str | None) -> BinMatch | None:
+    if not card_bin:
+        return None
+    return get_trie().lookup(card_bin)
+
+
+def invalidate_bin_rules():
+    """Force a version check on the next lookup."""
+    global _checked_at
+    _checked_at = None
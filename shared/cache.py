@@ -0,0 +1,254 @@
+"""Two-tier application cache: an in-process LRU in front of a shared Django cache (`settings.APP_CACHE`).
+
+A module builds one `TieredCache` per namespace and reads through it with `get(key, loader)`:
+
+    blog_cache = TieredCache("blog", ttl=3600, models=["seo_blog.Blog", "seo_blog.BlogComponent"])
+    data = blog_cache.get(f"list:{page}", lambda: serialize_page(page))
+
+Keys are stamped with the version of their namespace. Saving or deleting one of the `models` (or of their
+subclasses, e.g. polymorphic components) bumps the version once the transaction commits, which invalidates every
+key of the namespace at once. Other processes see a new version of the shared tier within
+`settings.APP_CACHE_VERSION_TTL` seconds. That needs `settings.APP_CACHE` to be shared between processes (see
+`CACHE_URL`): with a per-process cache (the default LocMem one) an invalidation only reaches the process that made
+it, so entries are then kept at most `settings.APP_CACHE_LOCAL_TTL` seconds. Concurrent misses of one key in a
+process share one load. Values are stored by reference in the local tier and must not be modified by callers.
+The shared tier fails open: if it is unavailable, values are loaded and kept in the local tier only.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import class_prepared, post_delete, post_save
+
+LOAD_SAMPLES = 1000  # latest load times kept per namespace for percentiles
+LOG_EVERY = 10000  # reads of a namespace between stats log lines
+
+
+class CacheStats:
+    """In-process counters of a namespace. Not synchronised, so counts are approximate under threads."""
+    __slots__ = ("local_hits", "shared_hits", "misses", "errors", "invalidations", "load_seconds", "load_times")
+
+    def __init__(self) -> None:
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        self.load_seconds = 0.0
+        self.load_times: deque[float] = deque(maxlen=LOAD_SAMPLES)
+
+    @property
+    def reads(self) -> int:
+        return self.local_hits + self.shared_hits + self.misses
+
+    def add_load(self, seconds: float):
+        self.load_seconds += seconds
+        self.load_times.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        if not self.load_times:
+            return None
+        ordered = sorted(self.load_times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class TieredCache:
+    """Cache of one namespace. `ttl` is the lifetime of shared entries (at most `settings.APP_CACHE_LOCAL_TTL` if
+    `settings.APP_CACHE` is not shared), `local_ttl` (at most `ttl`) the one of local entries, `local_size` the max
+    entries kept in process. `models` are model classes or "app_label.Model" labels whose changes invalidate the
+    namespace."""
+
+    def __init__(self, namespace: str, ttl: int, local_ttl: int | None = None, local_size: int | None = None,
+                 models: tuple | list = ()) -> None:
+        self.namespace = namespace
+        self.ttl = ttl if settings.APP_CACHE in settings.SHARED_CACHES else min(ttl, settings.APP_CACHE_LOCAL_TTL)
+        self.local_ttl = min(self.ttl, local_ttl if local_ttl is not None else settings.APP_CACHE_LOCAL_TTL)
+        self.local_size = local_size or settings.APP_CACHE_LOCAL_SIZE
+        self.stats = CacheStats()
+        self._local: OrderedDict[str, tuple] = OrderedDict()  # key -> (version, expires at, value)
+        self._inflight: dict[str, Future] = {}
+        self._version: int | None = None
+        self._version_checked_at = 0.0
+        self._lock = threading.Lock()
+        self.model_labels = {model if isinstance(model, str) else model._meta.label for model in models}
+        if self.model_labels:
+            # Signals of a child model are sent with the child as sender only, so the receivers are connected to
+            # the models and their subclasses, the ones already loaded and the ones loaded later
+            for app_models in list(apps.all_models.values()):
+                for model in list(app_models.values()):
+                    self._watch(model)
+            class_prepared.connect(self._on_class_prepared, weak=False, dispatch_uid=f"app-cache:{namespace}:prepared")
+        with _registry_lock:
+            _registry[namespace] = self
+
+    @property
+    def shared(self):
+        return caches[settings.APP_CACHE]
+
+    @property
+    def version_key(self) -> str:
+        return f"app-cache:{self.namespace}:version"
+
+    def shared_key(self, key: str, version: int) -> str:
+        return f"app-cache:{self.namespace}:{version}:{key}"
+
+    def get_version(self) -> int:
+        """Current version of the namespace, read from the shared tier every `settings.APP_CACHE_VERSION_TTL` seconds."""
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked_at <= settings.APP_CACHE_VERSION_TTL:
+            return self._version
+        try:
+            version = self.shared.get(self.version_key)
+            if version is None:
+                # seeded with the clock, so that a version evicted from the shared tier is never reused and the
+                # entries stored under it are not served again
+                seed = time.time_ns()
+                version = seed if self.shared.add(self.version_key, seed, timeout=None) else self.shared.get(self.version_key, seed)
+        except Exception as e:
+            self.stats.errors += 1
+            logging.warning("App cache: failed to read the version of %s due to exception %s", self.namespace, str(e))
+            version = self._version or time.time_ns()
+        self._version, self._version_checked_at = version, now
+        return version
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value of the key, or the value of `loader()` which is then cached in both tiers.
+        Exceptions of the loader are raised and not cached."""
+        version = self.get_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                self._local.move_to_end(key)
+                self.stats.local_hits += 1
+                self._log_stats()
+                return entry[2]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._load(key, version, loader)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def _load(self, key: str, version: int, loader: Callable[[], Any]) -> Any:
+        shared_key = self.shared_key(key, version)
+        try:
+            cached = self.shared.get(shared_key)
+        except Exception as e:
+            self.stats.errors += 1
+            logging.warning("App cache: failed to read %s due to exception %s", shared_key, str(e))
+            cached = None
+        if cached is not None:
+            self.stats.shared_hits += 1
+            value = cached[0]  # wrapped, so cached None values are hits
+        else:
+            self.stats.misses += 1
+            start = time.perf_counter()
+            value = loader()
+            self.stats.add_load(time.perf_counter() - start)
+            try:
+                self.shared.set(shared_key, (value,), timeout=self.ttl)
+            except Exception as e:
+                self.stats.errors += 1
+                logging.warning("App cache: failed to write %s due to exception %s", shared_key, str(e))
+        with self._lock:
+            self._local[key] = (version, time.monotonic() + self.local_ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+            self._log_stats()
+        return value
+
+    def delete(self, key: str):
+        """Drop one key from both tiers. Other processes keep their local copy for up to `local_ttl` seconds."""
+        with self._lock:
+            self._local.pop(key, None)
+        try:
+            self.shared.delete(self.shared_key(key, self.get_version()))
+        except Exception as e:
+            self.stats.errors += 1
+            logging.warning("App cache: failed to delete %s of %s due to exception %s", key, self.namespace, str(e))
+
+    def invalidate(self):
+        """Bump the version of the namespace, which invalidates all of its keys in both tiers."""
+        self.stats.invalidations += 1
+        try:
+            try:
+                version = self.shared.incr(self.version_key)
+            except ValueError:  # no version yet, or it was evicted
+                version = time.time_ns()
+                self.shared.set(self.version_key, version, timeout=None)
+        except Exception as e:
+            self.stats.errors += 1
+            logging.warning("App cache: failed to invalidate %s due to exception %s", self.namespace, str(e))
+            version = time.time_ns()
+        with self._lock:
+            self._local.clear()
+        self._version, self._version_checked_at = version, time.monotonic()
+
+    def _watch(self, model):
+        opts = model._meta
+        if {opts.label, opts.concrete_model._meta.label, *(parent._meta.label for parent in opts.get_parent_list())} & self.model_labels:
+            post_save.connect(self._on_change, sender=model, weak=False, dispatch_uid=f"app-cache:{self.namespace}:save:{opts.label}")
+            post_delete.connect(self._on_change, sender=model, weak=False, dispatch_uid=f"app-cache:{self.namespace}:delete:{opts.label}")
+
+    def _on_class_prepared(self, sender, **kwargs):
+        self._watch(sender)
+
+    def _on_change(self, sender, **kwargs):
+        transaction.on_commit(self.invalidate)
+
+    def _log_stats(self):
+        stats = self.stats
+        if stats.reads % LOG_EVERY == 0:
+            logging.info("App cache: namespace=%s local_hits=%d shared_hits=%d misses=%d errors=%d invalidations=%d size=%d",
+                         self.namespace, stats.local_hits, stats.shared_hits, stats.misses, stats.errors,
+                         stats.invalidations, len(self._local))
+
+
+_registry: dict[str, TieredCache] = {}
+_registry_lock = threading.Lock()
+
+
+def cache_stats() -> list[dict]:
+    """Hit, miss and load time counters per namespace since the process started."""
+    return [
+        {
+            "namespace": namespace,
+            "size": len(cache._local),
+            "local_hits": cache.stats.local_hits,
+            "shared_hits": cache.stats.shared_hits,
+            "misses": cache.stats.misses,
+            "hit_ratio": (cache.stats.local_hits + cache.stats.shared_hits) / cache.stats.reads if cache.stats.reads else None,
+            "errors": cache.stats.errors,
+            "invalidations": cache.stats.invalidations,
+            "load_avg_ms": cache.stats.load_seconds / cache.stats.misses * 1000 if cache.stats.misses else None,
+            "load_p99_ms": cache.stats.percentile(0.99) * 1000 if cache.stats.load_times else None,
+        }
+        for namespace, cache in list(_registry.items())
+    ]
+
+
+def invalidate_all():
+    """Invalidate every namespace, e.g. after a bulk update that sent no model signals."""
+    for cache in list(_registry.values()):
+        cache.invalidate()
@@ -8,13 +8,16 @@ import requests
 from django.conf import settings
 from django.utils import timezone
 
-from account.models import CustomUser
+from account.models import (AddressbookActions, AddressbookOperation,
+                            CustomUser)
+from shared.http_client import get_session
 # from users.celery import app
 from web_analytics.event_manager import EventManager
 
 mailerlite_client = MailerLite.Client({
     'api_key': settings.MAILERLITE_API_KEY
 })
+CASCADE_GROUP_ID = "124733726756177359"  # "confirm email" cascade
 # return send_mail(
 #     "Subject here",
 #     "Here is the message.",
@@ -42,7 +45,7 @@ def send_template_email(email: str, template_id: int, full_name: str | None, ema
         "To": email,
         "Tag": email_theme,
     }
-    res: requests.Response = requests.post(
+    res: requests.Response = get_session("postmark").post(
         "https://api.postmarkapp.com/email/withTemplate",
         json=data,
         headers=headers,
@@ -272,47 +275,25 @@ def funnel_info_mailerlite(funnel_info):
         return {}
 
 
-def add_to_addressbook(email, funnel_info):
-    data = funnel_info_mailerlite(funnel_info)
+def queue_addressbook_operation(email: str, action: AddressbookActions, group_id: int | str, fields: dict | None = None):
+    """Queue a MailerLite change for `tasks.sync_addressbook`, so the request does not wait on MailerLite."""
     try:
-        res: dict = mailerlite_client.subscribers.create(email, fields=data, groups=["124733726756177359"])
-        if "errors" in res:
-            logging.warning("emailer: failed to add %s to addressbook: %s\n", email, res)
-            return
-        logging.info("emailer: successfully added to addressbook. email=%s", email)
+        AddressbookOperation.objects.create(email=email, action=action, group_id=str(group_id), fields=fields or {})
     except Exception as e:
-        logging.warning("emailer: failed to add %s to addressbook due to exception %s", email, str(e))
+        logging.warning("emailer: failed to queue addressbook %s of %s due to exception %s", action, email, str(e))
+
+
+def add_to_addressbook(email, funnel_info):
+    queue_addressbook_operation(email, AddressbookActions.UPSERT, CASCADE_GROUP_ID, funnel_info_mailerlite(funnel_info))
 
 
 def update_addressbook(email, data):
-    try:
-        res: dict = mailerlite_client.subscribers.update(email, groups=["124733726756177359"], fields=data)
-        if "errors" in res:
-            logging.warning("emailer: failed to update user %s in addressbook: %s\n", email, res)
-            return
-        logging.info("emailer: successfully updated to addressbook. email=%s", email)
-    except Exception as e:
-        logging.warning("emailer: failed to update user %s in addressbook due to exception %s", email, str(e))
+    queue_addressbook_operation(email, AddressbookActions.UPSERT, CASCADE_GROUP_ID, data)
 
 
 def remove_from_addressbook(email: str):
-    try:
-        res: dict = mailerlite_client.subscribers.get(email)
-        if "data" in res:
-            sub_id = res['data']['id']
-            result = mailerlite_client.subscribers.unassign_subscriber_from_group(int(sub_id), 124733726756177359)
-            if not result:
-                logging.warning("emailer: failed to delete from addressbook. email=%s", email)
-    except Exception as e:
-        logging.warning("emailer: failed to delete from addressbook due to exception %s. email=%s", str(e), email)
+    queue_addressbook_operation(email, AddressbookActions.UNASSIGN, CASCADE_GROUP_ID)
 
 
 def assign_to_group(email, group_id: int | str, data: dict):
-    try:
-        res: dict = mailerlite_client.subscribers.update(email, groups=[group_id], fields=data)
-        if "errors" in res:
-            logging.warning("emailer: failed to assign user %s to a group: %s\n", email, json.dumps(res, indent=2))
-            return
-        logging.info("emailer: successfully assigned user to a group. email=%s", email)
-    except Exception as e:
-        logging.warning("emailer: failed to assign user to a group due to exception %s. email=%s", str(e), email)
+    queue_addressbook_operation(email, AddressbookActions.UPSERT, group_id, data)
@@ -0,0 +1,119 @@
+"""Pooled HTTP sessions of outbound vendor calls.
+
+`get_session(vendor)` returns one `requests.Session` per vendor and process, so connections (and their TLS
+handshakes) are reused between calls. Every host of a vendor keeps up to `settings.HTTP_POOL_SIZE` connections,
+which should match the gunicorn threads of a worker. Connection errors are retried for all methods (the request
+was not sent), read errors and 502/503/504 responses only for idempotent methods, with exponential backoff.
+Sessions do not store cookies, as they are shared by all requests of the process.
+"""
+import http.cookiejar
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LATENCY_SAMPLES = 1000  # latest latencies kept per vendor for percentiles
+LOG_INTERVAL = 60  # min seconds between stats log lines of a vendor
+
+
+class VendorStats:
+    """In-process counters of a vendor. Not synchronised, so counts are approximate under threads."""
+    __slots__ = ("requests", "errors", "seconds", "latencies", "logged_at")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.logged_at = time.monotonic()
+
+    def add(self, seconds: float, error: bool):
+        self.requests += 1
+        self.errors += error
+        self.seconds += seconds
+        self.latencies.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+class VendorSession(requests.Session):
+    """Session that records the latency of every request (retries included) in the stats of its vendor.
+    Responses with a 5xx status and exceptions count as errors."""
+
+    def __init__(self, vendor: str) -> None:
+        super().__init__()
+        self.vendor = vendor
+        self.stats = VendorStats()
+        self.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        retry = Retry(
+            total=settings.HTTP_RETRIES,
+            backoff_factor=settings.HTTP_RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=settings.HTTP_POOL_SIZE, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        start = time.perf_counter()
+        error = True
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            self.stats.add(time.perf_counter() - start, error)
+            now = time.monotonic()
+            if now - self.stats.logged_at >= LOG_INTERVAL:
+                self.stats.logged_at = now
+                logging.info("HTTP: vendor=%s requests=%d errors=%d p50=%.1fms p99=%.1fms", self.vendor, self.stats.requests,
+                             self.stats.errors, self.stats.percentile(0.5) * 1000, self.stats.percentile(0.99) * 1000)
+
+
+_sessions: dict[str, VendorSession] = {}
+_lock = threading.Lock()
+
+
+def get_session(vendor: str) -> VendorSession:
+    """Return the pooled session of the vendor (e.g. "postmark", "solidgate"), created on first use."""
+    session = _sessions.get(vendor)
+    if session is None:
+        with _lock:
+            session = _sessions.get(vendor)
+            if session is None:
+                session = _sessions[vendor] = VendorSession(vendor)
+    return session
+
+
+def http_stats() -> list[dict]:
+    """Request, error and latency counters per vendor since the process started."""
+    return [
+        {
+            "vendor": vendor,
+            "requests": session.stats.requests,
+            "errors": session.stats.errors,
+            "avg_ms": session.stats.seconds / session.stats.requests * 1000 if session.stats.requests else None,
+            "p50_ms": session.stats.percentile(0.5) * 1000 if session.stats.latencies else None,
+            "p99_ms": session.stats.percentile(0.99) * 1000 if session.stats.latencies else None,
+        }
+        for vendor, session in list(_sessions.items())
+    ]
+
+
+def close_sessions():
+    """Close all pooled connections, the sessions are recreated on next use."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
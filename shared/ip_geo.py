@@ -0,0 +1,122 @@
+"""Offline IP to country resolver.
+
+The database is a file of sorted, non-overlapping IP ranges built by the `build_ip_geo_db` command. It is
+memory-mapped once per worker and searched with a binary search, so a lookup costs a few microseconds and
+no network call. IPv4 addresses are stored as IPv4-mapped IPv6 addresses, so both families share one table.
+
+File layout: `MAGIC`, the number of ranges (uint32, little endian), then one `RECORD_SIZE` record per range:
+first address (16 bytes, big endian), last address (16 bytes, big endian), ISO country code (2 ASCII bytes).
+"""
+import bisect
+import ipaddress
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+
+MAGIC = b"IPGEO\x01"
+HEADER = struct.Struct("<6sI")
+ADDRESS_SIZE = 16
+RECORD_SIZE = 2 * ADDRESS_SIZE + 2
+
+
+def address_key(ip: str) -> bytes | None:
+    """16-byte big endian key of the address, `None` if it is not a valid IP."""
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except (AttributeError, ValueError):
+        return None
+    if address.version == 4:
+        return b"\x00" * 10 + b"\xff\xff" + address.packed
+    return address.packed
+
+
+class IpGeoDatabase:
+    """Read-only view of a database file. The file may be replaced on disk, an open view keeps the old contents."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or len(self._mmap) != HEADER.size + self.size * RECORD_SIZE:
+            self._mmap.close()
+            raise ValueError(f"{path} is not an IP geo database")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> bytes:
+        """First address of the range, so `bisect` can search the file directly."""
+        offset = HEADER.size + index * RECORD_SIZE
+        return self._mmap[offset:offset + ADDRESS_SIZE]
+
+    def lookup(self, ip: str | None) -> str | None:
+        key = address_key(ip) if ip else None
+        if key is None:
+            return None
+        index = bisect.bisect_right(self, key) - 1
+        if index < 0:
+            return None
+        offset = HEADER.size + index * RECORD_SIZE
+        if key > self._mmap[offset + ADDRESS_SIZE:offset + 2 * ADDRESS_SIZE]:
+            return None
+        return self._mmap[offset + 2 * ADDRESS_SIZE:offset + RECORD_SIZE].decode("ascii")
+
+
+def write_database(ranges: list[tuple[bytes, bytes, str]], path: str):
+    """Write (first key, last key, country) ranges to `path`. The file is replaced atomically, so running workers can reload it."""
+    ranges = sorted(ranges)
+    for (_, last, _), (first, _, _) in zip(ranges, ranges[1:]):
+        if first <= last:
+            raise ValueError(f"Overlapping IP ranges at {ipaddress.ip_address(first)}")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(ranges)))
+        for first, last, country in ranges:
+            file.write(first + last + country.encode("ascii"))
+    os.replace(tmp_path, path)
+
+
+_database: IpGeoDatabase | None = None
+_version: tuple | None = None
+_checked_at: float | None = None
+_lock = threading.Lock()
+
+
+def get_database() -> IpGeoDatabase | None:
+    """Return the database of `settings.IP_GEO_DATABASE`, `None` if it is not configured or can not be loaded.
+    Every `settings.IP_GEO_TTL` seconds the file is checked and reloaded if it changed."""
+    global _database, _version, _checked_at
+    if not settings.IP_GEO_DATABASE:
+        return None
+    now = time.monotonic()
+    if _checked_at is not None and now - _checked_at <= settings.IP_GEO_TTL:
+        return _database
+    with _lock:
+        if _checked_at is None or now - _checked_at > settings.IP_GEO_TTL:
+            try:
+                stat = os.stat(settings.IP_GEO_DATABASE)
+                version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                if version != _version:
+                    _database = IpGeoDatabase(settings.IP_GEO_DATABASE)
+                    _version = version
+            except (OSError, ValueError) as e:
+                logging.warning("IP geo: failed to load %s due to exception %s", settings.IP_GEO_DATABASE, str(e))
+            _checked_at = now
+    return _database
+
+
+def ip_country(ip: str | None) -> str | None:
+    """ISO country code of the IP, `None` if it is unknown."""
+    database = get_database()
+    return database.lookup(ip) if database else None
+
+
+def reload_ip_geo():
+    """Force a file check on the next lookup."""
+    global _checked_at
+    _checked_at = None
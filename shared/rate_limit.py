@@ -0,0 +1,171 @@
+"""Sliding window rate limits of API actions.
+
+Every action has limits per key type (`ip`, `email`, `user`) in `settings.RATE_LIMITS`. A limit counts the requests
+of the current fixed window and weights the previous window by the part of it still inside the sliding window,
+which needs two counters per key instead of a log of timestamps. Counters live in the backend configured by
+`settings.RATE_LIMIT_BACKEND`. A blocked key is also remembered in process until its window frees up, so a burst
+of a blocked client is rejected without a backend round trip.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.cache import caches
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+RATE_RE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+LOCAL_PRUNE_INTERVAL = 60  # seconds between drops of expired in-process counters and blocks
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """Parse "<count>/<period>", e.g. "5/m" or "3/15m", into (count, period in seconds)."""
+    match = RATE_RE.match(rate.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Invalid rate '{rate}', expected e.g. '5/m' or '3/15m'")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * PERIODS[unit]
+
+
+class RateLimitBackend(ABC):
+    """Storage of window counters. A counter is identified by the limit key, period and window number."""
+
+    @abstractmethod
+    def hit(self, requests: list[tuple[str, int, int]]) -> list[tuple[int, int]]:
+        """Increment the counter of each (key, period, window) request.
+        Return the (previous window, current window) counts of each request after the increment."""
+        raise NotImplementedError()
+
+
+class LocalRateLimitBackend(RateLimitBackend):
+    """In-process counters, for tests and single-process deployments. Every worker counts separately."""
+
+    def __init__(self) -> None:
+        self._counters: dict[tuple[str, int, int], int] = {}
+        self._lock = threading.Lock()
+        self._pruned_at = time.monotonic()
+
+    def hit(self, requests):
+        with self._lock:
+            result = []
+            for key, period, window in requests:
+                current = self._counters.get((key, period, window), 0) + 1
+                self._counters[(key, period, window)] = current
+                result.append((self._counters.get((key, period, window - 1), 0), current))
+            if time.monotonic() - self._pruned_at > LOCAL_PRUNE_INTERVAL:
+                self._prune()
+            return result
+
+    def _prune(self):
+        now = time.time()
+        for key, period, window in [k for k in self._counters if k[2] < int(now // k[1]) - 1]:
+            del self._counters[(key, period, window)]
+        self._pruned_at = time.monotonic()
+
+
+class CacheRateLimitBackend(RateLimitBackend):
+    """Counters in a Django cache shared by all workers, e.g. `django.core.cache.backends.redis.RedisCache`
+    (atomic increments) or `django.core.cache.backends.db.DatabaseCache`. Counters expire with the cache timeout."""
+
+    def __init__(self, alias: str) -> None:
+        self.cache = caches[alias]
+
+    @staticmethod
+    def cache_key(key: str, period: int, window: int) -> str:
+        return f"rate-limit:{hashlib.md5(key.encode('utf-8')).hexdigest()}:{period}:{window}"
+
+    def hit(self, requests):
+        previous = self.cache.get_many([self.cache_key(key, period, window - 1) for key, period, window in requests])
+        result = []
+        for key, period, window in requests:
+            cache_key = self.cache_key(key, period, window)
+            self.cache.add(cache_key, 0, timeout=2 * period)
+            try:
+                current = self.cache.incr(cache_key)
+            except ValueError:  # expired between add and incr
+                self.cache.set(cache_key, 1, timeout=2 * period)
+                current = 1
+            result.append((previous.get(self.cache_key(key, period, window - 1), 0), current))
+        return result
+
+
+_backend: RateLimitBackend | None = None
+_limits: dict[str, list[tuple[str, int, int]]] | None = None
+_blocked: dict[str, float] = {}  # limit key -> time.time() until which it is blocked
+_blocked_pruned_at = time.monotonic()
+
+
+def get_backend() -> RateLimitBackend | None:
+    """Return the backend configured by `settings.RATE_LIMIT_BACKEND`, or `None` if rate limiting is disabled."""
+    global _backend
+    if _backend is None:
+        match settings.RATE_LIMIT_BACKEND:
+            case "local":
+                _backend = LocalRateLimitBackend()
+            case "cache":
+                _backend = CacheRateLimitBackend(settings.RATE_LIMIT_CACHE)
+    return _backend
+
+
+def get_limits(action: str) -> list[tuple[str, int, int]]:
+    """(key type, count, period) limits of the action, parsed once per process."""
+    global _limits
+    if _limits is None:
+        _limits = {
+            name: [(key_type, *parse_rate(rate)) for key_type, rate in rates.items()]
+            for name, rates in settings.RATE_LIMITS.items()
+        }
+    return _limits.get(action, [])
+
+
+def limit_key(action: str, key_type: str, value: str) -> str:
+    if key_type == "email":
+        value = hashlib.md5(value.strip().lower().encode("utf-8")).hexdigest()
+    return f"{action}:{key_type}:{value}"
+
+
+def check_rate_limit(action: str, keys: dict[str, str | None]) -> float | None:
+    """Count a request of the action made by the given keys ({key type: value}, missing or empty values are skipped).
+    Return `None` if it is allowed, otherwise the seconds to wait before the next one."""
+    global _blocked_pruned_at
+    backend = get_backend()
+    limits = [(limit_key(action, key_type, keys[key_type]), count, period)
+              for key_type, count, period in get_limits(action) if keys.get(key_type)]
+    if backend is None or not limits:
+        return None
+    now = time.time()
+    if time.monotonic() - _blocked_pruned_at > LOCAL_PRUNE_INTERVAL:
+        for key in [key for key, until in list(_blocked.items()) if until <= now]:
+            _blocked.pop(key, None)
+        _blocked_pruned_at = time.monotonic()
+    waits = [_blocked[key] - now for key, _, _ in limits if _blocked.get(key, 0) > now]
+    if waits:
+        return max(waits)
+
+    try:
+        counts = backend.hit([(key, period, int(now // period)) for key, _, period in limits])
+    except Exception as e:
+        logging.warning("Rate limit: failed to count %s request due to exception %s", action, str(e))
+        return None
+    for (key, count, period), (previous, current) in zip(limits, counts):
+        elapsed = now % period
+        if previous * (1 - elapsed / period) + current > count:
+            # Blocked until the previous window weighs little enough for one more request, at the latest until the current window ends
+            if current >= count:
+                until = now + period - elapsed
+            else:
+                until = now + (1 - (count - current - 1) / previous) * period - elapsed
+            _blocked[key] = max(_blocked.get(key, 0), until)
+            waits.append(until - now)
+    return max(waits) if waits else None
+
+
+def reset_rate_limits():
+    """Forget in-process counters, blocks and parsed limits."""
+    global _backend, _limits
+    _backend = None
+    _limits = None
+    _blocked.clear()
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import Token
+
+from account.models import CustomUser
+from custom.custom_backend import invalidate_auth_user
+from subscription.models import UserSubscription
+
+
+def get_entitlement(user_id: int) -> tuple[timezone.datetime | None, str | None]:
+    """Expiration and status of the latest expiring subscription of the user."""
+    latest = UserSubscription.objects.filter(user_id=user_id).order_by("-expires").values_list("expires", "status").first()
+    return latest or (None, None)
+
+
+def refresh_entitlement(user_id: int | None) -> bool:
+    """Store the entitlement of the user on the `CustomUser` row without triggering its save signals.
+    A changed entitlement bumps the version, so services holding tokens with older claims can detect it."""
+    if user_id is None:
+        return False
+    expires, status = get_entitlement(user_id)
+    changed = bool(
+        CustomUser.objects.filter(pk=user_id)
+        .exclude(Q(entitlement_expires=expires) & Q(entitlement_status=status))
+        .update(entitlement_expires=expires, entitlement_status=status,
+                entitlement_version=F("entitlement_version") + 1, entitlement_updated=timezone.now())
+    )
+    if changed:
+        invalidate_auth_user(user_id)
+    return changed
+
+
+def has_unexpired_subscription(user: CustomUser) -> bool:
+    """Same as checking for any subscription with `expires >= now`, without a query."""
+    return user.entitlement_expires is not None and user.entitlement_expires >= timezone.now()
+
+
+def add_entitlement_claims(token: Token, user: CustomUser):
+    """Add the entitlement of the user to the token if `settings.JWT_ENTITLEMENT_CLAIMS` is enabled.
+
+    `ent_exp` (unix timestamp) and `ent_status` describe the latest expiring subscription, `ent_type` is its subscription type
+    and `ent_ver` is the entitlement version, compared by other services against `EntitlementViewSet.changes`.
+    """
+    if not settings.JWT_ENTITLEMENT_CLAIMS:
+        return
+    latest = UserSubscription.objects.filter(user=user).order_by("-expires").values_list("subscription__subscription_type", flat=True)
+    token["ent_exp"] = int(user.entitlement_expires.timestamp()) if user.entitlement_expires else None
+    token["ent_status"] = user.entitlement_status
+    token["ent_type"] = latest.first()
+    token["ent_ver"] = user.entitlement_version
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from account.models import ENTITLEMENT_FIELDS
+from subscription.entitlements import refresh_entitlement
+from subscription.models import UserSubscription
+
+
+@receiver(post_init, sender=UserSubscription)
+def user_subscription_loaded(sender, instance: UserSubscription, **kwargs):
+    instance._entitled_user_id = instance.user_id  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=UserSubscription)
+def user_subscription_saved(sender, instance: UserSubscription, **kwargs):
+    """Covers the checkout flows and the charge engine, which all save the subscription instance."""
+    changed = refresh_entitlement(instance.user_id)
+    if instance._entitled_user_id != instance.user_id:  # pylint: disable=protected-access
+        refresh_entitlement(instance._entitled_user_id)  # pylint: disable=protected-access
+        instance._entitled_user_id = instance.user_id  # pylint: disable=protected-access
+    # Keep the related user instance in sync for the rest of the request
+    user = instance._state.fields_cache.get("user")  # pylint: disable=protected-access
+    if user is not None and changed:
+        user.refresh_from_db(fields=ENTITLEMENT_FIELDS)
+
+
+@receiver(post_delete, sender=UserSubscription)
+def user_subscription_deleted(sender, instance: UserSubscription, **kwargs):
+    refresh_entitlement(instance.user_id)
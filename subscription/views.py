@@ -2,11 +2,13 @@ import calendar
 import logging
 import uuid
 import time
+from datetime import timezone as dt_timezone
 from django.conf import settings
 from django.db.models import Q
 from django.shortcuts import get_list_or_404
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema, inline_serializer
+from drf_spectacular.utils import (OpenApiParameter, extend_schema,
+                                   inline_serializer)
 from rest_framework import mixins, serializers, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import NotFound
@@ -17,6 +19,8 @@ from payment_solidgate.api import SOLID_CLIENT
 
 from account.models import CustomUser, GatewayChoices
 from custom.custom_exceptions import BadRequest
+from custom.custom_permissions import HasInternalSecret
+from custom.custom_viewsets import ReplicaReadMixin
 from payment_checkout.api import API as CheckoutAPI
 from payment_checkout.models import CheckoutCustomer, CheckoutUserSubscription
 from payment_solidgate.models import SolidgateUserSubscription
@@ -76,6 +80,56 @@ class UserSubscriptionViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
     #     return Response(data, status_)
 
 
+class EntitlementViewSet(viewsets.GenericViewSet):
+    """Entitlement changes for other JobEscape services that authorise with the entitlement claims of access tokens."""
+    authentication_classes = []
+    permission_classes = [HasInternalSecret]
+    max_changes = 10000
+    # `now` is moved back by this margin, so that changes committed after the read by transactions that started
+    # before it are listed again by the next call
+    safety_margin = timezone.timedelta(seconds=30)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("since", float, description="Unix timestamp (inclusive), usually `now` of the previous call"),
+            OpenApiParameter("after", int, description="Only users with a greater ID at `since`, `next_after` of a truncated result"),
+        ],
+        responses=inline_serializer("entitlement_changes_serializer", fields={
+            "now": serializers.FloatField(),
+            "changes": serializers.ListField(child=serializers.ListField(), help_text="[user_id, ent_ver, ent_exp, ent_status]"),
+            "next": serializers.FloatField(allow_null=True, help_text="`since` of the next page if the result was truncated"),
+            "next_after": serializers.IntegerField(allow_null=True, help_text="`after` of the next page if the result was truncated"),
+        })
+    )
+    @action(detail=False)
+    def changes(self, request: Request):
+        """Users whose entitlement changed since `since`. A token is outdated if its `ent_ver` is lower than the listed version.
+
+        Changes of the last `safety_margin` are listed again by the next call.
+        """
+        try:
+            since = timezone.datetime.fromtimestamp(float(request.query_params.get("since", 0)), tz=dt_timezone.utc)
+            after = int(request.query_params["after"]) if "after" in request.query_params else None
+        except (OverflowError, ValueError):
+            raise BadRequest("Invalid since or after.")
+        now = timezone.now()
+        queryset = CustomUser.objects.filter(entitlement_updated__gte=since, entitlement_updated__lte=now)
+        if after is not None:
+            queryset = queryset.exclude(entitlement_updated=since, pk__lte=after)
+        rows = list(
+            queryset.order_by("entitlement_updated", "pk")
+            .values_list("pk", "entitlement_version", "entitlement_expires", "entitlement_status", "entitlement_updated")[:self.max_changes + 1]
+        )
+        truncated = len(rows) > self.max_changes
+        rows = rows[:self.max_changes]
+        return Response({
+            "now": max(now - self.safety_margin, since).timestamp(),
+            "changes": [[pk, version, int(expires.timestamp()) if expires else None, status_] for pk, version, expires, status_, _ in rows],
+            "next": rows[-1][4].timestamp() if truncated else None,
+            "next_after": rows[-1][0] if truncated else None,
+        })
+
+
 class SubscriptionFeedbackViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
     """
         Used by Product Team. Subscription feedbacks.
@@ -85,7 +139,7 @@ class SubscriptionFeedbackViewSet(viewsets.GenericViewSet, mixins.ListModelMixin
     serializer_class = SubscriptionFeedbackSerializer
 
 
-class SubscriptionViewSet(viewsets.GenericViewSet, mixins.ListModelMixin):
+class SubscriptionViewSet(ReplicaReadMixin, viewsets.GenericViewSet, mixins.ListModelMixin):
     permission_classes = [AllowAny]
     queryset = Subscription.objects.all()
     serializer_class = SubscriptionSerializer
@@ -229,9 +283,10 @@ class UpsellViewSet(viewsets.GenericViewSet):
         if response.status == 'Authorized':
             if upsell.name == "mentor":
                 user.mentor_upsell = True
+                user.save(update_fields=["mentor_upsell"])
             else:
                 user.prompt_upsell = True
-            user.save()
+                user.save(update_fields=["prompt_upsell"])
             if upsell.email_bool: 
                 send_upsell(user_id=user.pk, email=user.email, template=upsell.template_id)
             EVENT_MANAGER.sendEvent("pr_funnel_upsell_success", user.pk, {'upsell': upsell.name, 'chase': chase}, topic="funnel")
@@ -333,9 +388,10 @@ class UpsellViewSet(viewsets.GenericViewSet):
         if order_status == 'settled':
             if upsell.name == "mentor":
                 user.mentor_upsell = True
+                user.save(update_fields=["mentor_upsell"])
             else:
                 user.prompt_upsell = True
-            user.save()
+                user.save(update_fields=["prompt_upsell"])
             UserUpsell.objects.create(
                 user=user,
                 upsell=upsell,
@@ -0,0 +1,144 @@
+"""Sends the queued MailerLite addressbook operations (see `shared.emailer.queue_addressbook_operation`).
+
+Operations are sent in queue order through the MailerLite batch API, up to `BATCH_SIZE` per call. Group removals
+need the subscriber id, which is cached in `AddressbookSubscriber` from the responses and looked up in one batch
+of GET requests when missing. Rejected operations (4xx) are closed with their error, failed ones (429, 5xx,
+network errors) are retried by the next runs up to `MAX_ATTEMPTS` times.
+
+Operations of one email are applied in order: an operation is only sent once the earlier operations of its email
+are closed (or gave up after `MAX_ATTEMPTS`), so a batch has at most one operation per email.
+"""
+import logging
+from urllib.parse import quote
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from account.models import (AddressbookActions, AddressbookOperation,
+                            AddressbookSubscriber)
+from shared.emailer import mailerlite_client
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50  # requests per MailerLite batch call
+MAX_ATTEMPTS = 5
+MAX_BATCHES = 100  # batch calls per run, the rest is sent by the next run
+
+
+def send_batch(requests: list[dict]) -> list[dict]:
+    """Send the requests in one batch call, return their {"code", "body"} responses in order."""
+    res: dict = mailerlite_client.batches.request(requests)
+    if "responses" not in res:
+        raise ValueError(f"unexpected batch response {res}")
+    return res["responses"]
+
+
+def cache_subscribers(subscribers: dict[str, str]):
+    if subscribers:
+        AddressbookSubscriber.objects.bulk_create(
+            [AddressbookSubscriber(email=email, subscriber_id=subscriber_id) for email, subscriber_id in subscribers.items()],
+            update_conflicts=True, unique_fields=["email"], update_fields=["subscriber_id"],
+        )
+
+
+def get_subscriber_ids(emails: set[str]) -> tuple[dict[str, str], dict[str, str]]:
+    """Return {email: subscriber id} of the emails, looking up the ones not cached, and {email: error} of the
+    failed lookups. Unknown emails (404) are in neither."""
+    subscribers = dict(AddressbookSubscriber.objects.filter(email__in=emails).values_list("email", "subscriber_id"))
+    missing = sorted(emails - subscribers.keys())
+    errors = {}
+    if missing:
+        responses = send_batch([{"method": "GET", "path": f"api/subscribers/{quote(email)}"} for email in missing])
+        found = {}
+        for email, response in zip(missing, responses):
+            if response["code"] == 200:
+                found[email] = str(response["body"]["data"]["id"])
+            elif response["code"] != 404:
+                errors[email] = f"subscriber lookup failed with {response['code']}: {response.get('body')}"
+        cache_subscribers(found)
+        subscribers.update(found)
+    return subscribers, errors
+
+
+def build_request(operation: AddressbookOperation, subscriber_id: str | None) -> dict:
+    if operation.action == AddressbookActions.UPSERT:
+        return {
+            "method": "POST",
+            "path": "api/subscribers",
+            "body": {"email": operation.email, "fields": operation.fields, "groups": [operation.group_id]},
+        }
+    return {"method": "DELETE", "path": f"api/subscribers/{subscriber_id}/groups/{operation.group_id}"}
+
+
+def sync_batch() -> tuple[int, int]:
+    """Send the next pending operations, return how many were closed and how many failed and will be retried."""
+    pending = AddressbookOperation.objects.filter(date_processed__isnull=True, attempts__lt=MAX_ATTEMPTS)
+    with transaction.atomic():
+        # The first pending operation of each email, including the ones locked by a concurrent run
+        earlier = pending.filter(email=OuterRef("email"), pk__lt=OuterRef("pk"))
+        operations = list(
+            pending.select_for_update(skip_locked=True)
+            .exclude(Exists(earlier))
+            .order_by("pk")[:BATCH_SIZE]
+        )
+        if not operations:
+            return 0, 0
+        now = timezone.now()
+        emails = {op.email for op in operations if op.action == AddressbookActions.UNASSIGN}
+        try:
+            subscribers, lookup_errors = get_subscriber_ids(emails)
+        except Exception as e:
+            logger.warning("Addressbook sync: subscriber lookup failed due to exception %s", e)
+            subscribers, lookup_errors = {}, dict.fromkeys(emails, f"subscriber lookup failed due to exception {e}")
+
+        requests, sent = [], []
+        for op in operations:
+            if op.action == AddressbookActions.UNASSIGN and op.email not in subscribers:
+                if op.email in lookup_errors:
+                    op.attempts += 1
+                    op.error = lookup_errors[op.email]
+                else:
+                    op.date_processed = now  # never subscribed, nothing to remove
+                continue
+            requests.append(build_request(op, subscribers.get(op.email)))
+            sent.append(op)
+
+        try:
+            responses = send_batch(requests) if requests else []
+        except Exception as e:
+            logger.warning("Addressbook sync: batch of %d requests failed due to exception %s", len(requests), e)
+            responses = [{"code": None, "body": f"batch failed due to exception {e}"}] * len(requests)
+
+        found = {}
+        for op, response in zip(sent, responses):
+            code, body = response["code"], response.get("body")
+            if code is not None and (code < 400 or (code == 404 and op.action == AddressbookActions.UNASSIGN)):
+                op.date_processed = now
+                op.error = ""
+                if op.action == AddressbookActions.UPSERT and isinstance(body, dict) and "data" in body:
+                    found[op.email] = str(body["data"]["id"])
+            elif code is not None and code < 500 and code != 429:
+                op.date_processed = now  # rejected, retrying would not help
+                op.error = str(body)
+                logger.warning("Addressbook sync: %s of %s rejected with %s: %s", op.action, op.email, code, body)
+            else:
+                op.attempts += 1
+                op.error = str(body)
+        cache_subscribers(found)
+        AddressbookOperation.objects.bulk_update(operations, ["attempts", "error", "date_processed"])
+        failed = sum(op.date_processed is None for op in operations)
+        return len(operations) - failed, failed
+
+
+def run_sync_addressbook(max_batches: int = MAX_BATCHES) -> dict:
+    """Send pending operations until the queue is empty, a batch fails or `max_batches` batches were sent."""
+    processed = failed = 0
+    for _ in range(max_batches):
+        done, failed = sync_batch()
+        processed += done
+        if not done or failed:
+            break
+    pending = AddressbookOperation.objects.filter(date_processed__isnull=True, attempts__lt=MAX_ATTEMPTS).count()
+    logger.info("Addressbook sync: processed=%d failed=%d pending=%d", processed, failed, pending)
+    return {"processed": processed, "failed": failed, "pending": pending}
@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Production runs the WSGI application on gunicorn gthread workers (see Dockerfile). DRF has no async views and
+the vendor clients are sync, so under this handler every request would still hold a thread while it waits on a
+vendor, and ASGI would add no concurrency over gthread workers. This entry point is not used there.
 """
 
 import os
@@ -232,6 +232,36 @@ DATABASES = {
     },
 }
 DATABASES["default"].update(DATABASES[env("DATABASE_SELECTOR")])
+# Request threads of a gunicorn worker (GUNICORN_THREADS in the Dockerfile), the connection pools are sized by it
+GUNICORN_THREADS = env.int("GUNICORN_THREADS", default=16)
+# Connections are pooled per worker process by the custom.db_pool engine, see custom/db_pool/base.py
+if env.bool("DB_POOL_ENABLED", default=True):
+    DATABASES["default"]["ENGINE"] = 'custom.db_pool'
+    DATABASES["default"]["POOL"] = {
+        'MAX_SIZE': env.int("DB_POOL_MAX_SIZE", default=GUNICORN_THREADS),  # a request thread holds at most one connection
+        'TIMEOUT': 10,
+        'MAX_IDLE': 300,
+        'MAX_LIFETIME': 3600,
+        'HEALTH_CHECK_AFTER': 30,
+    }
+# PgBouncer in transaction mode: no cursors may outlive a transaction. Session settings (time zone) must be server defaults.
+if env.bool("DB_PGBOUNCER", default=False):
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+# Read replica of the default database for safe reads of ReplicaReadMixin views, "" disables it (see custom.db_router)
+DATABASE_REPLICA_HOST = env("DATABASE_REPLICA_HOST", default="")
+if DATABASE_REPLICA_HOST:
+    DATABASES["replica"] = {**DATABASES["default"], 'HOST': DATABASE_REPLICA_HOST, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_ROUTERS = ['custom.db_router.ReplicaRouter']
+    MIDDLEWARE.append('custom.custom_middleware.replica_stickiness_middleware')
+REPLICA_STICKY_SECONDS = 5  # seconds a client reads from the primary after its last write
+# Shared cache of all processes, e.g. "redis://host:6379/0" or "dbcache://app_cache" (run createcachetable).
+# The per-process default only shares entries between the threads of a worker.
+CACHES = {
+    'default': env.cache("CACHE_URL", default="locmemcache://"),
+}
+# Aliases whose entries and invalidations are seen by all workers and instances
+SHARED_CACHES = {alias for alias, config in CACHES.items()
+                 if config['BACKEND'].rsplit('.', 2)[-2] not in ('locmem', 'dummy', 'filebased')}
 
 
 
@@ -278,6 +308,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 100,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': ('custom.custom_backend.PrefetchedJWTAuthentication',),
+    # Proxies appending to X-Forwarded-For in front of the app (1 for the Cloud Run front end, 2 behind a load balancer).
+    # Throttles key on the client IP added by the outermost of them, earlier entries are set by the client
+    'NUM_PROXIES': env.int("NUM_PROXIES", default=1),
     # 'DEFAULT_PERMISSION_CLASSES': ('rest_framework.permissions.IsAuthenticated',), # TODO: change
     # 'EXCEPTION_HANDLER': 'custom.custom_exception_handler.handler',
 }
@@ -291,6 +324,7 @@ AWS_SECRET_ACCESS_KEY = aws_secrets.get('AWS_SECRET_ACCESS_KEY')
 AWS_STORAGE_BUCKET_NAME = aws_secrets.get('AWS_STORAGE_BUCKET_NAME')
 AWS_CLOUDFRONT_DOMAIN = aws_secrets.get('AWS_CLOUDFRONT_DOMAIN')
 AWS_S3_CUSTOM_DOMAIN = aws_secrets.get('AWS_S3_CUSTOM_DOMAIN')
+AWS_CLOUDFRONT_DISTRIBUTION_ID = aws_secrets.get('AWS_CLOUDFRONT_DISTRIBUTION_ID')  # invalidations of blog snapshots
 AWS_S3_OBJECT_PARAMETERS = {
     'CacheControl': 'max-age=86400',
 }
@@ -306,3 +340,10 @@ if AWS_ACCESS_KEY_ID:
     # STATIC_URL = '//%s/%s/' % (AWS_CLOUDFRONT_DOMAIN, STATICFILES_LOCATION)
     STATIC_URL = 'https://%s/%s/' % (AWS_CLOUDFRONT_DOMAIN, STATICFILES_LOCATION)
     STATICFILES_STORAGE = 'custom.custom_storage.StaticStorage'
+
+    ARCHIVEFILES_LOCATION = 'archive'
+
+    BLOGFILES_LOCATION = 'blog'
+# Blog JSON snapshots published to S3 on every change (seo_blog.snapshots), served by CloudFront
+BLOG_SNAPSHOTS_ENABLED = bool(AWS_ACCESS_KEY_ID) and env.bool("BLOG_SNAPSHOTS_ENABLED", default=True)
+BLOG_SNAPSHOTS_MAX_AGE = 300  # Cache-Control max-age of the snapshots, bounds staleness without a distribution id
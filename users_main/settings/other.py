@@ -3,7 +3,7 @@ import os
 from django.utils import timezone
 
 from .core import (
-    BASE_DIR, DEBUG, STAGE, env, 
+    BASE_DIR, DEBUG, GUNICORN_THREADS, SHARED_CACHES, STAGE, env, 
     stage_solidgate_config, 
     prod_solidgate_config, 
     stage_posthog_config, 
@@ -30,6 +30,9 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
 
 # APP SETTINGS
 REQUESTS_TIMEOUT = 10  # seconds
+HTTP_POOL_SIZE = env.int("HTTP_POOL_SIZE", default=GUNICORN_THREADS)  # pooled connections per vendor host
+HTTP_RETRIES = 2  # retries of connection errors, and of read errors and 502/503/504 of idempotent calls
+HTTP_RETRY_BACKOFF = 0.3  # seconds, doubled on every retry
 PASSWORD_TOKEN_EXPIRATION_DELTA = timezone.timedelta(hours=1)  # Timedelta before which password reset code set on user is considered valid
 REGISTRATION_TOKEN_EXPIRATION_DELTA = timezone.timedelta(days=30)  # Timedelta before which registration token is considered valid
 if DEBUG and not STAGE:
@@ -49,6 +52,13 @@ AMPLITUDE_API_KEY = env('AMPLITUDE_API_KEY')
 # AMPLITUDE_API_SECRET = env('AMPLITUDE_API_SECRET')
 
 
+# EVENT ROUTING
+# Default per-event destinations and sampling, overridden by web_analytics.EventRoute rows.
+# Example: {"pr_funnel_middleware": {"amplitude": False, "sample_rate": 0.1}}
+EVENT_ROUTES: dict[str, dict] = {}
+EVENT_ROUTES_TTL = 60  # seconds the routing table is cached in process
+
+
 # META CONVERSIONS API
 CONVERSIONS_PIXEL_ID = stage_conversions_config.get("CONVERSIONS_PIXEL_ID") if STAGE else prod_conversions_config.get("CONVERSIONS_PIXEL_ID")
 CONVERSIONS_SECRET = stage_conversions_config.get("CONVERSIONS_SECRET") if STAGE else prod_conversions_config.get("CONVERSIONS_SECRET")
@@ -75,6 +85,33 @@ CHECKOUT_WEBHOOK_SECRET = stage_checkout_config.get("CHECKOUT_WEBHOOK_SECRET") i
 CHECKOUT_WEBHOOK_AUTH = stage_checkout_config.get("CHECKOUT_WEBHOOK_AUTH") if STAGE else prod_checkout_config.get("CHECKOUT_WEBHOOK_AUTH")
 APPLE_PAY_MERCHANT_ID = stage_checkout_config.get("APPLE_PAY_MERCHANT_ID") if STAGE else prod_checkout_config.get("APPLE_PAY_MERCHANT_ID")
 
+# FRAUD DETECTION
+# Velocity counters backend: "" (disabled), "local" (in-process), "db" (FraudVelocityBucket table) or "cache" (Django cache alias below)
+FRAUD_VELOCITY_BACKEND = env("FRAUD_VELOCITY_BACKEND", default="")
+FRAUD_VELOCITY_CACHE = env("FRAUD_VELOCITY_CACHE", default="default")
+# Read fraud features from the velocity counters instead of FraudPayment (enable once counters cover 30 days)
+FRAUD_VELOCITY_READ = env.bool("FRAUD_VELOCITY_READ", default=False)
+BIN_RULES_TTL = 30  # seconds between version checks of the BinRule table
+FRAUD_RULES_TTL = 30  # seconds between version checks of the FraudRule table
+
+# IP GEO
+# Offline IP to country database built by the build_ip_geo_db command, "" disables IP geo lookups
+IP_GEO_DATABASE = env("IP_GEO_DATABASE", default="")
+IP_GEO_TTL = 60  # seconds between checks of the database file for changes
+
+# RATE LIMITING
+# Counters backend: "" (disabled), "local" (in-process, per worker) or "cache" (Django cache alias below, e.g. Redis or database cache).
+# Defaults to the cache when it is shared (see CACHE_URL), "local" multiplies every limit by the number of workers
+RATE_LIMIT_CACHE = env("RATE_LIMIT_CACHE", default="default")
+RATE_LIMIT_BACKEND = env("RATE_LIMIT_BACKEND", default="cache" if RATE_LIMIT_CACHE in SHARED_CACHES else "local")
+# Sliding window limits per view action and key type (ip, email, user): "<count>/<period>", period s, m, h or d with an optional multiplier
+RATE_LIMITS = {
+    "register": {"ip": "20/h", "user": "5/15m"},
+    "reset_password": {"ip": "10/h", "email": "3/15m"},
+    "verify_code": {"ip": "30/h", "email": "10/15m"},
+    "set_password": {"ip": "20/h", "email": "5/15m"},
+}
+
 # TELEGRAM BOT
 TELEGRAM_BOT_TOKEN = env('TELEGRAM_BOT_TOKEN')
 
@@ -90,6 +127,9 @@ PUBSUB_APP_TOPIC_ID = stage_pubsub_config.get("PUBSUB_APP_TOPIC_ID") if STAGE el
 PUBSUB_FUNNEL_TOPIC_ID = stage_pubsub_config.get("PUBSUB_FUNNEL_TOPIC_ID") if STAGE else prod_pubsub_config.get("PUBSUB_FUNNEL_TOPIC_ID")
 PUBSUB_UDID_TOPIC_ID = stage_pubsub_config.get("PUBSUB_UDID_TOPIC_ID") if STAGE else prod_pubsub_config.get("PUBSUB_UDID_TOPIC_ID")
 PUBSUB_PM_TOPIC_ID = stage_pubsub_config.get("PUBSUB_PM_TOPIC_ID") if STAGE else prod_pubsub_config.get("PUBSUB_PM_TOPIC_ID")
+# Message encoding per topic: "json" or "avro" (the topic must have the matching schema from web_analytics/schemas)
+PUBSUB_PM_ENCODING = env("PUBSUB_PM_ENCODING", default="json")
+PUBSUB_EVENTS_ENCODING = env("PUBSUB_EVENTS_ENCODING", default="json")  # app and funnel topics
 
 
 # GCP INFOS
@@ -108,8 +148,26 @@ STAGE_QUEUE_CLOUD_EVENT=stage_users_tasks.get('STAGE_QUEUE_CLOUD_EVENT') if STAG
 STAGE_QUEUE_PUBLISH_PAYMENT=stage_users_tasks.get('STAGE_QUEUE_PUBLISH_PAYMENT') if STAGE else prod_users_tasks.get("PROD_QUEUE_PUBLISH_PAYMENT")
 STAGE_QUEUE_PUBLISH_EVENT=stage_users_tasks.get('STAGE_QUEUE_PUBLISH_EVENT') if STAGE else prod_users_tasks.get("PROD_QUEUE_PUBLISH_EVENT")
 STAGE_QUEUE_BIND_DEVICE=stage_users_tasks.get('STAGE_QUEUE_BIND_DEVICE') if STAGE else prod_users_tasks.get("PROD_QUEUE_BIND_DEVICE")
+BIND_DEVICE_COALESCE_WINDOW = 300  # seconds during which repeat bindings of the same (device_id, user_id) pair are skipped
+BIND_DEVICE_CACHE_SIZE = 10000  # max (device_id, user_id) pairs remembered per process
 
 
 # MICROSERVICE URLS
 ACADEMY_SERVICE_URL=env("ACADEMY_SERVICE_URL")
-AI_SERVICE_URL=env("AI_SERVICE_URL")
\ No newline at end of file
+AI_SERVICE_URL=env("AI_SERVICE_URL")
+# Progress counts of the streak endpoint, see account.progress
+PROGRESS_COUNTS_DEADLINE = 5  # seconds to wait for the academy and AI services together
+PROGRESS_COUNTS_TTL = 60  # seconds a fetched response is served without a new fetch
+PROGRESS_COUNTS_STALE_TTL = 86400  # seconds a response is kept as a fallback for failed fetches
+PROGRESS_COUNTS_CACHE = env("PROGRESS_COUNTS_CACHE", default="default")
+# Shared secret of internal service endpoints (X-Internal-Secret header), "" disables them
+INTERNAL_API_SECRET = env("INTERNAL_API_SECRET", default="")
+# APP CACHE
+# Tiered caches of shared.cache: in-process LRU in front of the APP_CACHE alias (see CACHE_URL)
+APP_CACHE = env("APP_CACHE", default="default")
+APP_CACHE_LOCAL_SIZE = 1000  # max entries per namespace and process
+APP_CACHE_LOCAL_TTL = 60  # max seconds an entry is served from the process without reading the shared tier
+APP_CACHE_VERSION_TTL = 5  # seconds between checks of a namespace version, i.e. max staleness after an invalidation
+# FAQ and blog responses (custom.custom_viewsets.CachedResponseMixin), invalidated when an editor saves
+CONTENT_CACHE_TTL = 86400  # seconds a serialized response is kept in the shared tier, APP_CACHE_LOCAL_TTL if APP_CACHE is not shared
+CONTENT_CACHE_MAX_AGE = 0  # Cache-Control max-age of the responses, 0 makes browsers and CDNs revalidate with the ETag
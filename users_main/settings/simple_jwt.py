@@ -1,6 +1,7 @@
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.timezone import timedelta
 
-from .core import DEBUG, env, STAGE, stage_jwt_secrets, prod_jwt_secrets
+from .core import DEBUG, SHARED_CACHES, env, STAGE, stage_jwt_secrets, prod_jwt_secrets
 
 lifetime = timedelta(minutes=1440) if not DEBUG else timedelta(days=30)
 SIMPLE_JWT = {
@@ -14,4 +15,14 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 
     "TOKEN_OBTAIN_SERIALIZER": "custom.custom_serializers.CustomTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "custom.custom_serializers.CustomTokenRefreshSerializer",
 }
+# Add entitlement claims (ent_exp, ent_status, ent_type, ent_ver) to issued tokens, see subscription.entitlements
+JWT_ENTITLEMENT_CLAIMS = env.bool("JWT_ENTITLEMENT_CLAIMS", default=False)
+# Authenticated users are cached for AUTH_USER_CACHE_TTL seconds (0 disables) in the AUTH_USER_CACHE alias.
+# The alias must be shared (see CACHE_URL): with a per-process cache a password change, deactivation or payment
+# would only invalidate the worker that saved the user.
+AUTH_USER_CACHE = env("AUTH_USER_CACHE", default="default")
+AUTH_USER_CACHE_TTL = env.int("AUTH_USER_CACHE_TTL", default=0)
+if AUTH_USER_CACHE_TTL and AUTH_USER_CACHE not in SHARED_CACHES:
+    raise ImproperlyConfigured(f"AUTH_USER_CACHE_TTL needs a shared AUTH_USER_CACHE, '{AUTH_USER_CACHE}' is per process")
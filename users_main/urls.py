@@ -35,10 +35,11 @@ from payment_checkout.views import CheckoutViewSet, CheckoutWebhookViewSet
 from payment_solidgate.views import SolidgateViewSet, SolidgateWebhookViewSet
 # from progress.views import CourseProgressViewSet
 from seo_blog.views import BlogCategoryViewSet, BlogViewSet
-from subscription.views import (SubscriptionFeedbackViewSet,
+from subscription.views import (EntitlementViewSet,
+                                SubscriptionFeedbackViewSet,
                                 SubscriptionViewSet, UserSubscriptionViewSet,
                                 UpsellViewSet)
-from web_analytics.views import HealthcheckViewSet
+from web_analytics.views import HealthcheckViewSet, ProcessStatsViewSet
 from webinars.views import WebinarViewSet
 
 from google_tasks.tasks import (
@@ -51,7 +52,8 @@ from google_tasks.tasks import (
     send_welcome_task_view,
 )
 from google_tasks.cron_job import (
-    charge_users_scheduler_view
+    charge_users_scheduler_view,
+    sync_addressbook_scheduler_view,
 )
 
 urlpatterns = [
@@ -88,7 +90,8 @@ urlpatterns += [
     path('cloud_tasks/publish_payment/', publish_payment_task_view, name='google_cloud_tasks_publish_payment'),
     path('cloud_tasks/send_welcome/', send_welcome_task_view, name='google_cloud_tasks_send_welcome'),
 
-    path('google_crons/run_charge_users/', charge_users_scheduler_view, name='charge_users_scheduler')
+    path('google_crons/run_charge_users/', charge_users_scheduler_view, name='charge_users_scheduler'),
+    path('google_crons/sync_addressbook/', sync_addressbook_scheduler_view, name='sync_addressbook_scheduler'),
 ]
 
 if settings.DEBUG:
@@ -98,6 +101,8 @@ if settings.DEBUG:
 router = routers.SimpleRouter()
 # Healthcheck
 router.register(r'healthcheck', HealthcheckViewSet, 'healthcheck')
+# In-process stats of the serving worker for internal services
+router.register(r'process_stats', ProcessStatsViewSet, 'process_stats')
 # Unregistered User API
 router.register(r'new_users', UnregisteredUserViewSet)
 # Account API
@@ -106,6 +111,8 @@ router.register(r'users', UserViewSet)
 router.register(r'subscriptions', SubscriptionViewSet, 'subscriptions')
 # User Subscription API
 router.register(r'user_subscriptions', UserSubscriptionViewSet, 'user_subscriptions')
+# Entitlement changes for internal services
+router.register(r'entitlements', EntitlementViewSet, 'entitlements')
 # Upsell API
 router.register(r'upsell', UpsellViewSet, 'upsell')
 # Subscription Feedback API
@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from web_analytics.models import EventRoute
+
+
+@admin.register(EventRoute)
+class EventRouteAdmin(admin.ModelAdmin):
+    list_display = ('event_name', 'posthog', 'amplitude', 'pubsub', 'sample_rate')
+    list_editable = ('posthog', 'amplitude', 'pubsub', 'sample_rate')
+    search_fields = ['event_name']
@@ -1,16 +1,23 @@
+import functools
 from typing import Any
 
 from amplitude import Amplitude, BaseEvent
 from django.conf import settings
 
 
+@functools.cache
+def get_amplitude() -> Amplitude:
+    """Process-wide client. Every client starts its own flush workers, so one is shared by all threads."""
+    amplitude = Amplitude(settings.AMPLITUDE_API_KEY)
+    amplitude.configuration.min_id_length = 1
+    return amplitude
+
+
 class AmplitudeApi:
     _a: Amplitude
 
     def __init__(self) -> None:
-        amplitude = Amplitude(settings.AMPLITUDE_API_KEY)
-        amplitude.configuration.min_id_length = 1
-        self._a = amplitude
+        self._a = get_amplitude()
 
     def trackBaseEvent(self, event_type: str, user_id: str, event_properties: dict[str, Any] | None = None):
         self._a.track(
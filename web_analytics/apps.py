@@ -10,3 +10,4 @@ class WebAnalyticsConfig(AppConfig):
     def ready(self):
         posthog.api_key = settings.POSTHOG_API_KEY
         posthog.host = settings.POSTHOG_HOST
+        from web_analytics import signals  # noqa: F401 pylint: disable=unused-import,import-outside-toplevel
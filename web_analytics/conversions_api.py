@@ -1,3 +1,4 @@
+import functools
 import logging
 import time
 
@@ -47,11 +48,17 @@ def get_ltv(geo, offer, pm):
     return 43.7
 
 
+@functools.cache
+def get_facebook_api() -> FacebookAdsApi:
+    """Process-wide API (and HTTP session), initialised once instead of for every EventManager."""
+    return FacebookAdsApi.init(access_token=settings.CONVERSIONS_SECRET)
+
+
 class FacebookApi:
     _a: FacebookAdsApi
 
     def __init__(self) -> None:
-        self._a = FacebookAdsApi.init(access_token=settings.CONVERSIONS_SECRET)
+        self._a = get_facebook_api()
 
     def sendEvent(self, **kwargs):
         logging.debug("ConversionsAPI: sendEvent: %s", str(kwargs))
@@ -0,0 +1,58 @@
+import functools
+import io
+import json
+from pathlib import Path
+from typing import Literal
+
+from django.conf import settings
+
+SCHEMAS_DIR = Path(__file__).resolve().parent / "schemas"
+PAYMENTS_SCHEMA = "payments.v1"
+EVENTS_SCHEMA = "events.v1"
+
+Encoding = Literal['json', 'avro']
+
+
+@functools.cache
+def load_schema(name: str):
+    """Load and parse a versioned Avro schema from `web_analytics/schemas/<name>.avsc`."""
+    import fastavro  # pylint: disable=import-outside-toplevel
+    with open(SCHEMAS_DIR / f"{name}.avsc", encoding="utf-8") as f:
+        return fastavro.parse_schema(json.load(f))
+
+
+def get_topic_encoding(topic_id: str) -> tuple[Encoding, str | None]:
+    """Return the configured encoding and Avro schema name for the topic. Unknown topics are always JSON."""
+    if topic_id == settings.PUBSUB_PM_TOPIC_ID:
+        return settings.PUBSUB_PM_ENCODING, PAYMENTS_SCHEMA
+    if topic_id in (settings.PUBSUB_APP_TOPIC_ID, settings.PUBSUB_FUNNEL_TOPIC_ID):
+        return settings.PUBSUB_EVENTS_ENCODING, EVENTS_SCHEMA
+    return "json", None
+
+
+def encode_json(data: dict) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+def encode_avro(data: dict, schema_name: str) -> bytes:
+    """Encode serialized data as a single schemaless Avro record, as expected by a topic with an Avro schema and BINARY encoding.
+    Dictionaries (metadata fields) are stored as JSON strings."""
+    import fastavro  # pylint: disable=import-outside-toplevel
+    schema = load_schema(schema_name)
+    record = {}
+    for field in schema["fields"]:
+        value = data.get(field["name"])
+        if isinstance(value, dict):
+            value = json.dumps(value) if value else None
+        record[field["name"]] = value
+    buffer = io.BytesIO()
+    fastavro.schemaless_writer(buffer, schema, record)
+    return buffer.getvalue()
+
+
+def encode_message(topic_id: str, data: dict) -> tuple[bytes, dict[str, str]]:
+    """Encode a message for the topic. Returns the message bytes and the message attributes."""
+    encoding, schema_name = get_topic_encoding(topic_id)
+    if encoding == "avro" and schema_name:
+        return encode_avro(data, schema_name), {"schema": schema_name}
+    return encode_json(data), {}
@@ -8,8 +8,10 @@ from django.utils import timezone
 from pandas import Period
 
 from account.models import CustomUser, GatewayChoices
+from shared.ip_geo import ip_country
 from web_analytics.amplitude import AmplitudeApi
 from web_analytics.conversions_api import FacebookApi
+from web_analytics.routing import get_route
 from web_analytics.tasks import publishEvent
 
 
@@ -82,7 +84,7 @@ class EventManager():
         return fb_event_id
     
     def sendEvent(self, event_name: str, user_id: int | str, props: dict[str, Any] | None = None, amplitude: bool = True, pubsub: bool = True, topic: Literal['app', 'funnel'] = "app"):
-        """Send an event to Amplitude and Posthog
+        """Send an event to Amplitude, Posthog and PubSub, as allowed by the event route (see `web_analytics.routing`)
 
         :param event_name: Event name
         :type event_name: str
@@ -93,7 +95,10 @@ class EventManager():
         :param amplitude: send events to Amplitude if true, defaults to True
         :type amplitude: bool, optional
         """
-        if pubsub:
+        route = get_route(event_name)
+        if not route.is_sampled(user_id):
+            return
+        if pubsub and route.pubsub:
             from google_tasks.tasks import create_send_cloud_event_task
             create_send_cloud_event_task(topic, event_name, user_id, event_metadata=props)
         if props is None:
@@ -102,8 +107,9 @@ class EventManager():
         if self.payment_system:
             props["payment_method"] = self.payment_system
 
-        self.p.capture(uid, event_name, props)
-        if amplitude:
+        if route.posthog:
+            self.p.capture(uid, event_name, props)
+        if amplitude and route.amplitude:
             props.pop("$set_once", None)
             self.a.trackBaseEvent(event_name, uid, props)
 
@@ -184,16 +190,17 @@ def sendCloudEventTask(topic: Literal['app', 'funnel'], event_name: str, user_id
     user = CustomUser.objects.get(id=user_id)
     fi = user.funnel_info or {}
     geo = fi.get("geolocation", {})
+    ip = fi.pop("ip", None)
     em = EventManager(user.payment_system)  # type: ignore
     return em.sendCloudEvent(
         topic_id,
         event_name,
         user.device_id,
         user.pk,
-        ip=fi.pop("ip", None),
+        ip=ip,
         referrer=fi.pop("referer", None),
         language=fi.pop("language", None),
-        country_code=geo.get("country_code", None),
+        country_code=geo.get("country_code", None) or ip_country(ip),
         country=geo.get("country_name", None),
         city=geo.get("city", None),
         region=geo.get("region", None),
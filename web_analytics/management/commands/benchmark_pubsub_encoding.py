@@ -0,0 +1,94 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from web_analytics.encoding import (EVENTS_SCHEMA, PAYMENTS_SCHEMA,
+                                    encode_avro, encode_json)
+from web_analytics.pubsub import EventRawSerializer, PaymentsSerializer
+
+
+def sample_payment() -> dict:
+    now = timezone.now()
+    ts = int(now.timestamp() * 1e6)
+    serializer = PaymentsSerializer(data={
+        "order_id": "pay_" + uuid.uuid4().hex[:26],
+        "status": "declined",
+        "amount": 2999,
+        "currency": "USD",
+        "order_description": "jobescape_subscription",
+        "customer_account_id": 123456,
+        "geo_country": "US",
+        "created_at": ts,
+        "payment_type": "recurring",
+        "settle_datetime": ts,
+        "payment_method": "card",
+        "subscription_id": 3,
+        "started_at": ts,
+        "subscription_status": "past_due",
+        "card_country": "US",
+        "card_brand": "Visa",
+        "gross_amount": 29.99,
+        "week_day": now.strftime("%A"),
+        "months": ts,
+        "week_date": now.date(),
+        "date": now.date(),
+        "subscription_cohort_date": now.date(),
+        "mid": "checkout",
+        "channel": "checkout",
+        "paid_count": 2,
+        "retry_count": 1,
+        "decline_message": "Insufficient Funds",
+        "is_3ds": False,
+        "bin": "424242",
+    })
+    serializer.is_valid(raise_exception=True)
+    return serializer.data  # type: ignore
+
+
+def sample_event() -> dict:
+    serializer = EventRawSerializer(data={
+        "event_id": uuid.uuid4(),
+        "event_name": "pr_funnel_middleware",
+        "user_id": 123456,
+        "device_id": str(uuid.uuid4()),
+        "path": "",
+        "timestamp": round(timezone.now().timestamp() * 1e6),
+        "ip": "203.0.113.10",
+        "language": "en-US",
+        "country_code": "US",
+        "country": "United States",
+        "city": "Boston",
+        "region": "Massachusetts",
+        "event_metadata": {"result": "OK", "fingerprint": "fp_" + uuid.uuid4().hex, "ip": "203.0.113.10", "geo": "US"},
+    })
+    serializer.is_valid(raise_exception=True)
+    return serializer.data  # type: ignore
+
+
+class Command(BaseCommand):
+    help = "Compares bytes/message and encode time of JSON and Avro encodings of Pub/Sub payment and event messages"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--iterations", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        n = options["iterations"]
+        samples = (
+            ("payments", sample_payment(), PAYMENTS_SCHEMA),
+            ("events", sample_event(), EVENTS_SCHEMA),
+        )
+        self.stdout.write(f"{'topic':<10}{'encoding':<10}{'bytes/msg':>12}{'us/msg':>10}")
+        for topic, data, schema_name in samples:
+            encoders = (
+                ("json", encode_json),
+                ("avro", lambda d, s=schema_name: encode_avro(d, s)),
+            )
+            for encoding, encoder in encoders:
+                size = len(encoder(data))  # also warms up schema cache
+                start = time.perf_counter()
+                for _ in range(n):
+                    encoder(data)
+                elapsed = (time.perf_counter() - start) / n * 1e6
+                self.stdout.write(f"{topic:<10}{encoding:<10}{size:>12}{elapsed:>10.1f}")
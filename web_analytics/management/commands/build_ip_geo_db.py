@@ -0,0 +1,63 @@
+import csv
+import ipaddress
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from shared.ip_geo import address_key, reload_ip_geo, write_database
+
+UNKNOWN_COUNTRIES = ("", "-", "ZZ")
+
+
+def parse_address(value: str) -> bytes:
+    """Address as text, or as an integer (IPv4 below 2**32, IPv6 otherwise) like in the IP2Location CSV files."""
+    value = value.strip()
+    if value.isdigit():
+        number = int(value)
+        value = str(ipaddress.IPv4Address(number) if number < 2**32 else ipaddress.IPv6Address(number))
+    key = address_key(value)
+    if key is None:
+        raise ValueError(f"Invalid IP address '{value}'")
+    return key
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the offline IP geo database from a CSV of IP ranges with first address, last address and country code "
+        "columns (DB-IP and IP2Location country CSV files work as is). Running workers pick up the new file within IP_GEO_TTL seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--output", default=None, help="Database file, defaults to IP_GEO_DATABASE")
+
+    def handle(self, *args, **options):
+        output = options["output"] or settings.IP_GEO_DATABASE
+        if not output:
+            raise CommandError("No output file, set IP_GEO_DATABASE or pass --output")
+        ranges = []
+        skipped = 0
+        with open(options["csv_path"], newline="", encoding="utf-8") as file:
+            for line, row in enumerate(csv.reader(file), start=1):
+                if len(row) < 3:
+                    skipped += 1
+                    continue
+                country = row[2].strip().upper()
+                if country in UNKNOWN_COUNTRIES:
+                    skipped += 1
+                    continue
+                try:
+                    first, last = parse_address(row[0]), parse_address(row[1])
+                except ValueError as e:
+                    if line == 1:  # header
+                        continue
+                    raise CommandError(f"Line {line}: {e}") from e
+                if len(country) != 2 or first > last:
+                    raise CommandError(f"Line {line}: invalid range {row[:3]}")
+                ranges.append((first, last, country))
+        try:
+            write_database(ranges, output)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        reload_ip_geo()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(ranges)} ranges to {output} ({skipped} rows without a country skipped)"))
@@ -0,0 +1,212 @@
+import calendar
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from account.models import CustomUser
+from payment_checkout.models import (CheckoutPaymentAttempt,
+                                     CheckoutTransaction,
+                                     ChPaymentMethodTypes)
+from payment_checkout.utils import billing_retry_calculation
+from payment_solidgate.models import SolidgateUserSubscription
+from subscription.models import UserSubscription
+from web_analytics.pubsub import PaymentsSerializer
+from web_analytics.tasks import BatchPublisher
+
+SOURCES = ("checkout_transactions", "checkout_attempts", "solidgate")
+
+WALLET_TYPES = {
+    ChPaymentMethodTypes.APPLE_PAY: "applepay",
+    ChPaymentMethodTypes.GOOGLE_PAY: "googlepay",
+    ChPaymentMethodTypes.CARD: "card",
+}
+
+
+def base_record(dt: timezone.datetime, user: CustomUser | None, user_sub: UserSubscription) -> dict:
+    """Fields shared by all payment records. They follow the live `publishPayment` calls, except:
+
+    - `created_at`, `settle_datetime` and the date fields come from the local row (`dt`), not from the gateway
+      `requested_on`/`processed_on` of the charge, which is not stored.
+    - `subscription_status` is the current status of the subscription, its status at payment time is not stored.
+    """
+    created_at = int(dt.timestamp() * 1e6)
+    months = int(dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp() * 1e6)
+    week_date = (dt - timezone.timedelta(days=dt.weekday())).date()
+    funnel_info = user.funnel_info if user else None
+    return {
+        "order_description": "jobescape_subscription",
+        "customer_account_id": user.pk if user else None,
+        "geo_country": funnel_info.get("geolocation", {}).get("country_code", None) if funnel_info else None,
+        "created_at": created_at,
+        "settle_datetime": created_at,
+        "subscription_id": user_sub.subscription_id,  # type: ignore
+        "started_at": calendar.timegm(user_sub.date_started.timetuple()) * 1e6,
+        "subscription_status": user_sub.status,
+        "week_day": dt.strftime("%A"),
+        "months": months,
+        "week_date": week_date,
+        "date": dt.date(),
+        "subscription_cohort_date": dt.date(),  # the payment date, as for live Checkout charges (Solidgate rows use the start date)
+    }
+
+
+def transaction_record(transaction: CheckoutTransaction) -> dict:
+    """Settled recurring Checkout charge. The charge ID is not stored, so `order_id` is derived from the transaction."""
+    user_sub = transaction.user_subscription
+    pay_method = transaction.payment_method
+    record = base_record(transaction.date_created, user_sub.user, user_sub)
+    record.update({
+        "order_id": f"{transaction.payment_id}:{transaction.pk}",
+        "status": "settled",
+        "amount": round(transaction.amount * 100),
+        "currency": transaction.currency,
+        "payment_type": "recurring",
+        "payment_method": WALLET_TYPES.get(pay_method.type, "card"),  # type: ignore
+        "card_brand": pay_method.card_scheme or None,
+        "gross_amount": transaction.amount,
+        "mid": "checkout",
+        "channel": "checkout",
+        "is_3ds": pay_method.three_ds and pay_method.card_scheme == "Mastercard",
+    })
+    return record
+
+
+def attempt_record(attempt: CheckoutPaymentAttempt) -> dict:
+    """Declined recurring Checkout charge. Authorized attempts are replayed from `CheckoutTransaction`."""
+    user_sub = attempt.user_subscription
+    sub = user_sub.subscription
+    record = base_record(attempt.date_updated, user_sub.user, user_sub)
+    record.update({
+        "order_id": f"attempt:{attempt.pk}",
+        "status": "declined",
+        "payment_type": "recurring",
+        "payment_method": "card",
+        "mid": "checkout",
+        "channel": "checkout",
+        "paid_count": user_sub.paid_counter,
+        "retry_count": attempt.retry,
+        "decline_message": attempt.response_summary or None,
+    })
+    if sub:
+        _, amount = billing_retry_calculation(attempt.retry, sub.price_amount)
+        record.update({
+            "amount": round(amount * 100),
+            "currency": sub.price_currency,
+            "gross_amount": amount,
+        })
+    return record
+
+
+def solidgate_record(sg_user_sub: SolidgateUserSubscription) -> dict:
+    """First payment of a Solidgate subscription. Solidgate orders are not stored locally, so only the subscription start is known."""
+    user_sub = sg_user_sub.user_subscription
+    dt = timezone.make_aware(timezone.datetime.combine(user_sub.date_started, timezone.datetime.min.time()))
+    record = base_record(dt, user_sub.user, user_sub)
+    record.update({
+        "order_id": f"solidgate:{sg_user_sub.subscription_id}",
+        "status": "settled",
+        "payment_type": "first",
+        "mid": "solidgate",
+        "channel": "solidgate",
+    })
+    return record
+
+
+def make_aware(dt: timezone.datetime) -> timezone.datetime:
+    return dt if timezone.is_aware(dt) else timezone.make_aware(dt)
+
+
+class Command(BaseCommand):
+    help = "Rebuilds payment records from Checkout and Solidgate tables and republishes them to the payments Pub/Sub topic"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=timezone.datetime.fromisoformat, help="Start date (inclusive), e.g. 2024-01-31")
+        parser.add_argument("--until", type=timezone.datetime.fromisoformat, help="End date (exclusive)")
+        parser.add_argument("--sources", nargs="+", choices=SOURCES, default=list(SOURCES))
+        parser.add_argument("--resume", help="Resume token printed by a previous run, e.g. checkout_attempts:1234")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--topic", default=None, help="Topic ID, defaults to PUBSUB_PM_TOPIC_ID")
+        parser.add_argument("--dry-run", action="store_true", help="Build and validate records without publishing")
+
+    def handle(self, *args, **options):
+        sources: list[str] = [s for s in SOURCES if s in options["sources"]]
+        last_pk = 0
+        if options["resume"]:
+            source, _, pk = options["resume"].partition(":")
+            if source not in sources or not pk.isdigit():
+                raise CommandError(f"Invalid resume token '{options['resume']}'")
+            sources = sources[sources.index(source):]
+            last_pk = int(pk)
+        publisher = None if options["dry_run"] else BatchPublisher(options["topic"] or settings.PUBSUB_PM_TOPIC_ID)
+        since = make_aware(options["since"]) if options["since"] else None
+        until = make_aware(options["until"]) if options["until"] else None
+
+        start = time.perf_counter()
+        total = 0
+        for source in sources:
+            queryset, builder = self.get_source(source, since, until)
+            total += self.replay(source, queryset, builder, publisher, last_pk, options["chunk_size"], start)
+            last_pk = 0
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Done: {total} records in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rec/s)"))
+
+    def get_source(self, source: str, since, until):
+        match source:
+            case "checkout_transactions":
+                queryset = CheckoutTransaction.objects.select_related("user_subscription__user", "payment_method")
+                date_field = "date_created"
+                builder = transaction_record
+            case "checkout_attempts":
+                queryset = CheckoutPaymentAttempt.objects.filter(executed=True, response="Declined")\
+                    .select_related("user_subscription__user", "user_subscription__subscription")
+                date_field = "date_updated"
+                builder = attempt_record
+            case _:
+                queryset = SolidgateUserSubscription.objects.select_related("user_subscription__user")
+                date_field = "user_subscription__date_started"
+                builder = solidgate_record
+                since = since.date() if since else None
+                until = until.date() if until else None
+        if since:
+            queryset = queryset.filter(**{f"{date_field}__gte": since})
+        if until:
+            queryset = queryset.filter(**{f"{date_field}__lt": until})
+        return queryset, builder
+
+    def replay(self, source: str, queryset, builder, publisher: BatchPublisher | None, last_pk: int, chunk_size: int, start: float) -> int:
+        """Walk the queryset in primary key order, one chunk per query (works with server-side cursors disabled), and publish each chunk."""
+        count = 0
+        while True:
+            chunk = list(queryset.filter(pk__gt=last_pk).order_by("pk")[:chunk_size])
+            if not chunk:
+                return count
+            chunk_start = last_pk
+            valid = failed = 0
+            for obj in chunk:
+                try:
+                    serializer = PaymentsSerializer(data=builder(obj))
+                    serializer.is_valid(raise_exception=True)
+                except Exception as e:
+                    self.stderr.write(f"{source}: skipping pk={obj.pk}: {e}")
+                    failed += 1
+                    continue
+                valid += 1
+                if publisher:
+                    publisher.publish(serializer.data)  # type: ignore
+            published = valid
+            if publisher:
+                published, publish_failed = publisher.flush()
+                if publish_failed:
+                    raise CommandError(
+                        f"{source}: {publish_failed} records of the chunk after pk={chunk_start} failed to publish, "
+                        f"resume with --resume {source}:{chunk_start} (its published records are sent again)"
+                    )
+            count += len(chunk)
+            last_pk = chunk[-1].pk
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{source}: rows={count} published={published} failed={failed} "
+                f"rate={count / max(elapsed, 1e-9):.0f} rows/s resume={source}:{last_pk}"
+            )
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.4 on 2026-10-19 16:55
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRoute',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_name', models.CharField(max_length=100, unique=True, verbose_name='Event name')),
+                ('posthog', models.BooleanField(default=True, verbose_name='Send to PostHog?')),
+                ('amplitude', models.BooleanField(default=True, verbose_name='Send to Amplitude?')),
+                ('pubsub', models.BooleanField(default=True, verbose_name='Send to Pub/Sub?')),
+                ('sample_rate', models.FloatField(default=1, help_text='Share of users (0..1) whose events are sent to the enabled destinations', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(1)], verbose_name='Sample rate')),
+            ],
+        ),
+    ]
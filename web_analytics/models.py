@@ -1,3 +1,16 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+class EventRoute(models.Model):
+    """Per-event routing and sampling rule used by `EventManager.sendEvent`. Events without a route go everywhere."""
+    event_name = models.CharField(_("Event name"), max_length=100, unique=True)
+    posthog = models.BooleanField(_("Send to PostHog?"), default=True)
+    amplitude = models.BooleanField(_("Send to Amplitude?"), default=True)
+    pubsub = models.BooleanField(_("Send to Pub/Sub?"), default=True)
+    sample_rate = models.FloatField(_("Sample rate"), default=1, validators=[MinValueValidator(0), MaxValueValidator(1)],
+                                    help_text="Share of users (0..1) whose events are sent to the enabled destinations")
+
+    def __str__(self):
+        return f"EventRoute[{self.pk}] {self.event_name}"
@@ -0,0 +1,62 @@
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from web_analytics.models import EventRoute
+
+
+class Route:
+    """Destinations and sampling rate of a single event."""
+    __slots__ = ("posthog", "amplitude", "pubsub", "sample_rate")
+
+    def __init__(self, posthog: bool = True, amplitude: bool = True, pubsub: bool = True, sample_rate: float = 1) -> None:
+        self.posthog = posthog
+        self.amplitude = amplitude
+        self.pubsub = pubsub
+        self.sample_rate = sample_rate
+
+    def is_sampled(self, user_id: int | str) -> bool:
+        """Sampling is deterministic per user and does not depend on the event, so a sampled user keeps all of their
+        events of every sampled route (a user in a 10% sample is also in every larger one), and funnels stay complete."""
+        if self.sample_rate >= 1:
+            return True
+        if self.sample_rate <= 0:
+            return False
+        digest = hashlib.md5(str(user_id).encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2**64 < self.sample_rate
+
+
+DEFAULT_ROUTE = Route()
+
+_routes: dict[str, Route] = {}
+_loaded_at: float | None = None
+
+
+def load_routes() -> dict[str, Route]:
+    """Build the routing table from `settings.EVENT_ROUTES` overridden by `EventRoute` rows."""
+    routes = {name: Route(**params) for name, params in settings.EVENT_ROUTES.items()}
+    try:
+        for route in EventRoute.objects.all():
+            routes[route.event_name] = Route(route.posthog, route.amplitude, route.pubsub, route.sample_rate)
+    except DatabaseError as e:
+        logging.warning("Web analytics: failed to load event routes from the database due to exception %s", str(e))
+    return routes
+
+
+def get_route(event_name: str) -> Route:
+    """Return the cached route of the event. The table is reloaded every `settings.EVENT_ROUTES_TTL` seconds."""
+    global _routes, _loaded_at
+    now = time.monotonic()
+    if _loaded_at is None or now - _loaded_at > settings.EVENT_ROUTES_TTL:
+        _routes = load_routes()
+        _loaded_at = now
+    return _routes.get(event_name, DEFAULT_ROUTE)
+
+
+def invalidate_routes():
+    """Force reload of the routing table on the next `get_route` call."""
+    global _loaded_at
+    _loaded_at = None
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from web_analytics.models import EventRoute
+from web_analytics.routing import invalidate_routes
+
+
+@receiver([post_save, post_delete], sender=EventRoute)
+def event_route_changed(sender, **kwargs):
+    invalidate_routes()
@@ -1,21 +1,57 @@
-import json
+import functools
 import logging
 
 from django.conf import settings
 from django.utils import timezone
 from google.cloud.pubsub import PublisherClient
+from google.cloud.pubsub_v1.types import BatchSettings
 
+from web_analytics.encoding import encode_message
 from web_analytics.pubsub import EventRawSerializer, PaymentsSerializer
 
 
+@functools.cache
+def get_publisher() -> PublisherClient:
+    """Process-wide publisher, its gRPC channel and batching thread are reused by all threads."""
+    return PublisherClient()
+
+
 def publishMessage(topic_id: str, data):
-    client = PublisherClient()
+    client = get_publisher()
     topic_path = client.topic_path(settings.PUBSUB_PROJECT_ID, topic_id)
-    b_data = json.dumps(data).encode("utf-8")
-    future = client.publish(topic_path, b_data)
+    b_data, attributes = encode_message(topic_id, data)
+    future = client.publish(topic_path, b_data, **attributes)
     return future.result()
 
 
+class BatchPublisher:
+    """Publishes many messages to one topic without waiting for each of them; the client groups them into batches.
+    Call `flush` to wait for the pending messages."""
+
+    def __init__(self, topic_id: str, max_messages: int = 1000, max_latency: float = 0.05) -> None:
+        self.client = PublisherClient(batch_settings=BatchSettings(max_messages=max_messages, max_latency=max_latency))
+        self.topic_id = topic_id
+        self.topic_path = self.client.topic_path(settings.PUBSUB_PROJECT_ID, topic_id)
+        self._futures = []
+
+    def publish(self, data: dict):
+        b_data, attributes = encode_message(self.topic_id, data)
+        self._futures.append(self.client.publish(self.topic_path, b_data, **attributes))
+
+    def flush(self) -> tuple[int, int]:
+        """Wait for the pending messages. Returns the number of published and failed messages."""
+        published = failed = 0
+        for future in self._futures:
+            try:
+                future.result()
+                published += 1
+            except Exception as e:
+                failed += 1
+                logging.error("Web analytics: BatchPublisher: Failed to publish to topic %s: %s", self.topic_id, str(e))
+        self._futures = []
+        return published, failed
+
+
 # @app.task
 def publishPayment(topic_id: str, data: dict):
     serializer = PaymentsSerializer(data=data)
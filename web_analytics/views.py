@@ -1,8 +1,14 @@
+import os
+
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from custom.custom_permissions import HasInternalSecret
+from custom.db_pool.base import pool_stats
+from shared.http_client import http_stats
+
 
 class HealthcheckViewSet(viewsets.GenericViewSet):
     """The viewset for the healthcheck pinging."""
@@ -12,3 +18,13 @@ class HealthcheckViewSet(viewsets.GenericViewSet):
     def list(self, request):
         assert request.user
         return Response({"status": "OK"})
+
+
+class ProcessStatsViewSet(viewsets.GenericViewSet):
+    """In-process counters of the worker process that serves the request, for other JobEscape services."""
+    authentication_classes = []
+    permission_classes = [HasInternalSecret]
+
+    @extend_schema(request=None, responses={200: None})
+    def list(self, request):
+        return Response({"pid": os.getpid(), "db_pools": pool_stats(), "http": http_stats()})
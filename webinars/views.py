@@ -7,12 +7,13 @@ from rest_framework.response import Response
 
 from custom.custom_exceptions import BadRequest
 from custom.custom_permissions import HasUnexpiredSubscription
+from custom.custom_viewsets import ReplicaReadMixin
 from webinars.models import Webinar
 from webinars.serializers import (WebinarListSerializer,
                                   WebinarRequestSerializer, WebinarSerializer)
 
 
-class WebinarViewSet(mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+class WebinarViewSet(ReplicaReadMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
     """The viewset for retrieving Webinars information."""
     queryset = Webinar.objects.all()
     permission_classes = [HasUnexpiredSubscription]